@@ -0,0 +1,98 @@
+"""
+批量生成 / 销毁 actor
+
+逐个调用 world.spawn_actor() / actor.destroy() 时每个 actor 一次 RPC 往返，启动和停止耗时随传感器数量线性增长。
+这里改用 client.apply_batch_sync() 的 carla.command 批量命令，往返次数与传感器数量无关:
+
+    生成: 1. SpawnActor(车辆).then(ApplyVehicleControl(FutureActor, ...))
+          2. 所有传感器的 SpawnActor(蓝图, 安装位置, parent_id=车辆 ID)
+          3. world.get_actors([车辆, 传感器...]) 取得可调用 listen() 的 actor 对象
+    销毁: 1. 所有 actor 的 DestroyActor
+
+服务器只为 then() 中带 actor 字段的命令代入 FutureActor，SpawnActor 的 parent_id 不会被代入，
+因此传感器只能在车辆生成之后的第二个批次中挂载。
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import carla
+
+SpawnActor = carla.command.SpawnActor
+DestroyActor = carla.command.DestroyActor
+ApplyVehicleControl = carla.command.ApplyVehicleControl
+FutureActor = carla.command.FutureActor
+
+
+def spawn_vehicle_with_sensors(client: carla.Client,
+                               world: carla.World,
+                               vehicle_blueprint: carla.ActorBlueprint,
+                               spawn_point: carla.Transform,
+                               sensors: Sequence[Tuple[carla.ActorBlueprint, carla.Transform]],
+                               initial_control: Optional[carla.VehicleControl] = None
+                               ) -> Tuple[carla.Vehicle, List[carla.Sensor]]:
+    """生成车辆并把传感器挂载到车辆上（3 次往返）
+
+    任一 actor 生成失败时销毁本次已生成的所有 actor 并抛出 RuntimeError。
+
+    Returns:
+        (车辆, 与 sensors 顺序相同的传感器列表)
+    """
+    command = SpawnActor(vehicle_blueprint, spawn_point)
+    if initial_control is not None:
+        command = command.then(ApplyVehicleControl(FutureActor, initial_control))
+    response = client.apply_batch_sync([command], False)[0]
+    if response.has_error:
+        raise RuntimeError(f"Failed to spawn vehicle: {response.error}")
+    vehicle_id = response.actor_id
+
+    responses = client.apply_batch_sync(
+        [SpawnActor(blueprint, transform, vehicle_id) for blueprint, transform in sensors], False
+    )
+    sensor_ids = [r.actor_id for r in responses if not r.has_error]
+    errors = [r.error for r in responses if r.has_error]
+    if errors:
+        destroy_actor_ids(client, sensor_ids + [vehicle_id])
+        raise RuntimeError(f"Failed to spawn sensors: {'; '.join(errors)}")
+
+    actors = {actor.id: actor for actor in world.get_actors([vehicle_id, *sensor_ids])}
+    return actors[vehicle_id], [actors[actor_id] for actor_id in sensor_ids]
+
+
+def spawn_batch(client: carla.Client, commands: Sequence[carla.command.SpawnActor]
+                ) -> Tuple[List[Optional[int]], List[str]]:
+    """一个批次执行所有 SpawnActor 命令（1 次往返），失败的命令不影响其余命令
+
+    Returns:
+        (与 commands 顺序相同的 actor ID 列表（失败为 None）, 错误信息列表)
+    """
+    if not commands:
+        return [], []
+    actor_ids = []
+    errors = []
+    for response in client.apply_batch_sync(list(commands), False):
+        if response.has_error:
+            actor_ids.append(None)
+            errors.append(response.error)
+        else:
+            actor_ids.append(response.actor_id)
+    return actor_ids, errors
+
+
+def destroy_actor_ids(client: carla.Client, actor_ids: Sequence[int]) -> int:
+    """一个批次销毁所有 actor（1 次往返）
+
+    Returns:
+        int: 销毁失败的 actor 数量（错误已打印）
+    """
+    if not actor_ids:
+        return 0
+    failures = 0
+    for response in client.apply_batch_sync([DestroyActor(actor_id) for actor_id in actor_ids], False):
+        if response.has_error:
+            failures += 1
+            print(f"Error destroying actor {response.actor_id}: {response.error}")
+    return failures
+
+
+def destroy_actors(client: carla.Client, actors: Sequence[carla.Actor]) -> int:
+    """一个批次销毁所有 actor，见 destroy_actor_ids()"""
+    return destroy_actor_ids(client, [actor.id for actor in actors])
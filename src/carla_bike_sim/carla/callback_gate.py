@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class SensorCallbackGate:
+    """传感器回调的会话闸门：按会话代数 (generation) 放行回调，并统计进行中的回调数量
+
+    每次挂载传感器调用 open() 开始一个新会话，listen() 的回调用 wrap() 包装并绑定会话代数。
+    close() 之后旧会话的回调（包括 stop() 之后才迟到的回调）在进入时即被拒绝，
+    drain() 只等待 close() 之前已经进入的回调执行完，没有进行中的回调时立即返回。
+
+    线程安全：wrap() 返回的回调在 CARLA 回调线程中执行，open/close/drain 在控制线程中调用。
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._active_generation: Optional[int] = None
+        self._in_flight = 0
+        self._stats = {'rejected': 0, 'drains': 0, 'drain_timeouts': 0, 'last_drain_ms': 0.0}
+
+    @property
+    def generation(self) -> int:
+        """最近一次 open() 的会话代数"""
+        return self._generation
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def open(self) -> int:
+        """开始新会话，返回其代数"""
+        with self._cond:
+            self._generation += 1
+            self._active_generation = self._generation
+            return self._generation
+
+    def close(self) -> None:
+        """结束当前会话，此后进入的旧会话回调都会被拒绝"""
+        with self._cond:
+            self._active_generation = None
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """等待进行中的回调全部结束
+
+        Returns:
+            bool: 超时仍有回调在执行时返回 False
+        """
+        started = time.perf_counter()
+        with self._cond:
+            drained = self._cond.wait_for(lambda: self._in_flight == 0, timeout)
+            self._stats['drains'] += 1
+            if not drained:
+                self._stats['drain_timeouts'] += 1
+            self._stats['last_drain_ms'] = (time.perf_counter() - started) * 1000.0
+        return drained
+
+    def wrap(self, generation: int, callback: Callable, *args) -> Callable:
+        """返回绑定到 generation 会话的回调: data -> callback(data, *args)"""
+        def guarded(data):
+            if not self._enter(generation):
+                return
+            try:
+                callback(data, *args)
+            finally:
+                self._leave()
+        return guarded
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回会话代数、进行中/被拒绝的回调数量和 drain 耗时"""
+        with self._cond:
+            return {'generation': self._generation, 'in_flight': self._in_flight, **self._stats}
+
+    def _enter(self, generation: int) -> bool:
+        with self._cond:
+            if generation != self._active_generation:
+                self._stats['rejected'] += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def _leave(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._cond.notify_all()
@@ -1,37 +1,109 @@
 import carla
+import threading
+import time
 import numpy as np
 import cv2 as cv
-from typing import Optional
+from typing import Callable, Dict, Optional, Sequence
 from PySide6.QtCore import QObject, Signal
+from carla_bike_sim.carla import actor_batch
+from carla_bike_sim.carla.control_sender import ControlCommandSender
+from carla_bike_sim.carla.metadata_cache import MetadataCache
+from carla_bike_sim.carla.rig import SensorSpec
 from carla_bike_sim.carla.sensors import SensorManager
+from carla_bike_sim.carla.telemetry import VehicleTelemetry, VehicleTelemetryService
+from carla_bike_sim.carla.tick_driver import SimulationTickThread
+from carla_bike_sim.carla.traffic import TrafficPopulation
+from carla_bike_sim.config import (
+    ACTOR_BATCH_COMMANDS,
+    CONTROL_CHANGE_TOLERANCE,
+    CONTROL_SEND_INTERVAL_MS,
+    DEFAULT_THROTTLE,
+    SYNC_FIXED_DELTA_SECONDS,
+    SYNC_MODE_ENABLED,
+    SYNC_REALTIME,
+    TRAFFIC_ENABLED,
+    TRAFFIC_MANAGER_PORT,
+    TRAFFIC_SEED,
+    TRAFFIC_VEHICLE_DENSITY,
+    TRAFFIC_WALKER_DENSITY,
+)
+from carla_bike_sim.control.vehicle_control_signal import VehicleControlSignal
+
+
+class OperationCancelled(Exception):
+    """连接或启动仿真在两个步骤之间被取消"""
+
 
 class CarlaClientManager(QObject):
     """CARLA 客户端管理器
 
+    connect() 和 start_simulation() 可能阻塞数秒（load_world 常超过 10 秒），
+    GUI 应通过 LifecycleWorker 在工作线程中调用，并用 cancel_pending_operation() 取消。
+    单个 RPC 无法中断，取消在当前步骤完成后生效，已创建的车辆和传感器会被清理。
+
     Signals:
         connection_status_changed(bool, str): 连接状态变化 (已连接, 消息)
         simulation_error(str): 仿真错误信息
+        real_time_factor_updated(float): 同步模式下的实际实时因子
+        lifecycle_progress(str, int): 连接 / 启动仿真的进度 (当前步骤, 百分比)，在调用线程中发出
     """
 
     connection_status_changed = Signal(bool, str)
     simulation_error = Signal(str)
-
-    def __init__(self, host: str = 'localhost', port: int = 2000, timeout: float = 5.0):
+    real_time_factor_updated = Signal(float)
+    lifecycle_progress = Signal(str, int)
+
+    def __init__(self, host: str = 'localhost', port: int = 2000, timeout: float = 5.0,
+                 metadata_cache: Optional[MetadataCache] = None,
+                 client_factory: Callable[[str, int], carla.Client] = carla.Client,
+                 batch_actor_commands: bool = ACTOR_BATCH_COMMANDS,
+                 traffic_manager_port: int = TRAFFIC_MANAGER_PORT):
+        """
+        Args:
+            metadata_cache: 地图列表、蓝图库和出生点缓存，多个管理器共享同一实例时重新连接也能命中内存缓存；
+                None 表示创建一个新实例（仍会使用磁盘缓存）
+            client_factory: 创建客户端的函数 (host, port) -> carla.Client，
+                可替换为接口相同的本地替身（如测量启动到首帧耗时）
+            batch_actor_commands: 是否用 client.apply_batch_sync 批量生成 / 销毁车辆和传感器，
+                False 时逐个调用 spawn_actor / destroy（替身客户端不支持 carla.command）
+            traffic_manager_port: NPC 车辆使用的 Traffic Manager 端口，同一台机器上的多个服务器需各不相同
+        """
         super().__init__()
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.metadata_cache = metadata_cache if metadata_cache is not None else MetadataCache()
+        self.client_factory = client_factory
+        self.batch_actor_commands = batch_actor_commands
+        self.traffic_manager_port = traffic_manager_port
+        self._cancel_requested = threading.Event()
+        # 'spawn' / 'destroy' -> 最近一次的耗时、RPC 往返次数和 actor 数量
+        self._actor_timings: Dict[str, Dict[str, float]] = {}
 
         self.client: Optional[carla.Client] = None
+        self.server_version: Optional[str] = None
         self.world: Optional[carla.World] = None
         self.vehicle: Optional[carla.Vehicle] = None
         self.spectator: Optional[carla.Actor] = None
+        # 最近一次仿真的 NPC 车辆和行人（停止后保留生成 / 清理统计）
+        self.traffic: Optional[TrafficPopulation] = None
         
         self.sensor_manager = SensorManager()
+        # 每个仿真步从 WorldSnapshot 采集一次车辆状态，GUI 只读取最新记录
+        self.telemetry = VehicleTelemetryService()
 
         self._is_connected = False
         self._is_running = False
 
+        # 同步模式
+        self._synchronous = False
+        self._tick_thread: Optional[SimulationTickThread] = None
+
+        # 控制指令合并、去重后由专用线程（同步模式下由 tick 线程每步一次）下发
+        self.control_sender = ControlCommandSender(
+            self._send_vehicle_control, CONTROL_SEND_INTERVAL_MS, CONTROL_CHANGE_TOLERANCE
+        )
+
     @property
     def is_connected(self) -> bool:
         return self._is_connected
@@ -40,18 +112,47 @@ class CarlaClientManager(QObject):
     def is_running(self) -> bool:
         return self._is_running
 
+    @property
+    def is_synchronous(self) -> bool:
+        return self._synchronous
+
+    @property
+    def real_time_factor(self) -> float:
+        """同步模式下最近的实时因子，异步模式返回 0.0"""
+        if self._tick_thread is None:
+            return 0.0
+        return self._tick_thread.real_time_factor
+
+    @property
+    def cancel_requested(self) -> bool:
+        """当前（或最近一次）连接 / 启动操作是否被取消"""
+        return self._cancel_requested.is_set()
+
+    def cancel_pending_operation(self):
+        """取消正在进行的连接或启动仿真（可在任意线程调用）"""
+        self._cancel_requested.set()
+
     def connect(self) -> bool:
+        self._cancel_requested.clear()
         try:
-            self.client = carla.Client(self.host, self.port)
+            self._report_progress(f"Connecting to {self.host}:{self.port}...", 0)
+            self.client = self.client_factory(self.host, self.port)
             self.client.set_timeout(self.timeout)
 
             version = self.client.get_server_version()
+            self._report_progress("Connected", 100)
+            self.server_version = version
             self._is_connected = True
 
             message = f"Connected to CARLA server version: {version}"
             self.connection_status_changed.emit(True, message)
             return True
 
+        except OperationCancelled:
+            self.client = None
+            self.connection_status_changed.emit(False, "Connection cancelled")
+            return False
+
         except Exception as e:
             error_msg = f"Failed to connect to CARLA server: {str(e)}"
             self.connection_status_changed.emit(False, error_msg)
@@ -60,16 +161,11 @@ class CarlaClientManager(QObject):
 
     def disconnect(self):
         self.stop_simulation()
-
-        if self.sensor_manager is not None:
-            self.sensor_manager.destroy_cameras()
-
-        if self.vehicle is not None:
-            self.vehicle.destroy()
-            self.vehicle = None
+        self._destroy_actors()
 
         self.world = None
         self.client = None
+        self.server_version = None
         self.spectator = None
         self._is_connected = False
 
@@ -77,7 +173,28 @@ class CarlaClientManager(QObject):
 
     def start_simulation(self,
                         map_name: Optional[str] = None,
-                        vehicle_blueprint: str = "vehicle.audi.a2") -> bool:
+                        vehicle_blueprint: str = "vehicle.audi.a2",
+                        synchronous: bool = SYNC_MODE_ENABLED,
+                        fixed_delta_seconds: float = SYNC_FIXED_DELTA_SECONDS,
+                        realtime: bool = SYNC_REALTIME,
+                        rig: Optional[Sequence[SensorSpec]] = None,
+                        traffic: bool = TRAFFIC_ENABLED,
+                        traffic_vehicle_density: float = TRAFFIC_VEHICLE_DENSITY,
+                        traffic_walker_density: float = TRAFFIC_WALKER_DENSITY,
+                        traffic_seed: Optional[int] = TRAFFIC_SEED) -> bool:
+        """
+        Args:
+            map_name: 地图名称，None 表示使用服务器的第一个可用地图
+            vehicle_blueprint: 车辆蓝图 ID
+            synchronous: 是否以同步模式运行（由专用线程调用 world.tick() 步进）
+            fixed_delta_seconds: 同步模式下每步的仿真时间（秒）
+            realtime: 同步模式下是否按墙钟节奏步进，False 表示尽可能快
+            rig: 传感器描述列表，None 表示使用 SensorManager 当前的 rig
+            traffic: 是否生成 NPC 车辆和行人，见 carla_bike_sim.carla.traffic
+            traffic_vehicle_density: NPC 车辆占用地图出生点（不含自车的出生点）的比例
+            traffic_walker_density: 行人数量与地图出生点数之比
+            traffic_seed: NPC 的随机种子，None 表示每次不同
+        """
         if not self._is_connected:
             self.simulation_error.emit("Not connected to CARLA server")
             return False
@@ -86,50 +203,228 @@ class CarlaClientManager(QObject):
             self.simulation_error.emit("Simulation is already running")
             return False
 
+        self._cancel_requested.clear()
         try:
+            cache = self.metadata_cache
             if map_name is None:
-                map_name = self.client.get_available_maps()[0]
+                map_name = cache.get_available_maps(self.server_version, self.client.get_available_maps)[0]
+            self._report_progress(f"Loading map {map_name}...", 10)
             self.world = self.client.load_world(map_name)
 
-            bp = self.world.get_blueprint_library().find(vehicle_blueprint)
-            spawn_point = self.world.get_map().get_spawn_points()[0]
-            self.vehicle = self.world.spawn_actor(bp, spawn_point)
-            
+            if synchronous:
+                self._report_progress("Enabling synchronous mode...", 50)
+                self._enable_synchronous_mode(fixed_delta_seconds)
+
+            self._report_progress("Spawning vehicle and sensors...", 60)
+            blueprint_library = cache.get_blueprint_library(self.server_version, self.world.get_blueprint_library)
+            bp = blueprint_library.find(vehicle_blueprint)
+            spawn_points = cache.get_spawn_points(
+                self.server_version, map_name, lambda: self.world.get_map().get_spawn_points()
+            )
+            spawn_point = spawn_points[0]
+            self._spawn_actors(bp, spawn_point, blueprint_library, rig)
+            self.telemetry.start(self.world, self.vehicle)
+            self.control_sender.reset(last_sent=VehicleControlSignal(throttle=DEFAULT_THROTTLE))
+
+            self.traffic = None
+            if traffic:
+                self._report_progress("Spawning traffic...", 75)
+                self.traffic = TrafficPopulation(self.client, self.world, self.traffic_manager_port, traffic_seed)
+                self.traffic.spawn(blueprint_library, spawn_points[1:],
+                                   traffic_vehicle_density, traffic_walker_density, synchronous)
+
             self.spectator = self.world.get_spectator()
             self.spectator.set_transform(carla.Transform(
                 carla.Location(x=spawn_point.location.x , y=spawn_point.location.y-5, z=spawn_point.location.z + 2),
                 carla.Rotation(pitch=-15.0, yaw=spawn_point.rotation.yaw)
             ))
 
-            vehicle_control = carla.VehicleControl()
-            vehicle_control.throttle = 0.5
-            self.vehicle.apply_control(vehicle_control)
-
-            self.sensor_manager.setup_cameras(self.vehicle, self.world)
+            if synchronous:
+                self._report_progress("Starting simulation clock...", 90)
+                self._start_tick_thread(fixed_delta_seconds, realtime)
+            else:
+                self.control_sender.start()
 
+            self._report_progress("Simulation started", 100)
             self._is_running = True
             return True
 
+        except OperationCancelled:
+            self._abort_start()
+            return False
+
         except Exception as e:
             error_msg = f"Failed to start simulation: {str(e)}"
             self.simulation_error.emit(error_msg)
+            self._abort_start()
             return False
 
+    def _report_progress(self, message: str, percent: int):
+        """发出进度；已请求取消时抛出 OperationCancelled"""
+        if self._cancel_requested.is_set():
+            raise OperationCancelled()
+        self.lifecycle_progress.emit(message, percent)
+
+    def _spawn_actors(self, vehicle_bp: carla.ActorBlueprint, spawn_point: carla.Transform,
+                      blueprint_library: carla.BlueprintLibrary, rig: Optional[Sequence[SensorSpec]]):
+        """生成车辆和 rig 中的所有传感器，记录耗时和 RPC 往返次数"""
+        initial_control = carla.VehicleControl(throttle=DEFAULT_THROTTLE)
+        start = time.perf_counter()
+        if self.batch_actor_commands:
+            blueprints = self.sensor_manager.prepare_rig(blueprint_library, rig)
+            self.vehicle, sensors = actor_batch.spawn_vehicle_with_sensors(
+                self.client, self.world, vehicle_bp, spawn_point,
+                [(bp, spec.transform()) for spec, bp in blueprints],
+                initial_control=initial_control,
+            )
+            self.sensor_manager.attach_sensors([spec for spec, _ in blueprints], sensors)
+            round_trips = 3
+        else:
+            self.vehicle = self.world.spawn_actor(vehicle_bp, spawn_point)
+            self.vehicle.apply_control(initial_control)
+            self.sensor_manager.setup_cameras(self.vehicle, self.world, rig, blueprint_library)
+            round_trips = 2 + len(self.sensor_manager.sensors)
+        self._record_actor_timing('spawn', start, round_trips, 1 + len(self.sensor_manager.sensors))
+
+    def _destroy_actors(self):
+        """停止并销毁所有传感器和车辆，记录耗时和 RPC 往返次数"""
+        if self.vehicle is None and not self.sensor_manager.sensors:
+            return
+        start = time.perf_counter()
+        actors = list(self.sensor_manager.detach_sensors().values())
+        if self.vehicle is not None:
+            actors.append(self.vehicle)
+            self.vehicle = None
+
+        if self.batch_actor_commands and self.client is not None:
+            try:
+                actor_batch.destroy_actors(self.client, actors)
+            except Exception as e:
+                print(f"Error destroying actors: {e}")
+            round_trips = 1
+        else:
+            for actor in actors:
+                try:
+                    actor.destroy()
+                except Exception as e:
+                    print(f"Error destroying actor {actor.id}: {e}")
+            round_trips = len(actors)
+        self._record_actor_timing('destroy', start, round_trips, len(actors))
+
+    def _record_actor_timing(self, operation: str, start: float, round_trips: int, actors: int):
+        self._actor_timings[operation] = {
+            'ms': (time.perf_counter() - start) * 1000.0,
+            'round_trips': round_trips,
+            'actors': actors,
+        }
+
+    def get_actor_timings(self) -> Dict[str, Dict[str, float]]:
+        """返回最近一次生成 / 销毁车辆和传感器的耗时
+
+        Returns:
+            dict: 'spawn' / 'destroy' -> {'ms', 'round_trips', 'actors'}
+        """
+        return {operation: dict(timing) for operation, timing in self._actor_timings.items()}
+
+    def _abort_start(self):
+        """清理启动失败或被取消时已创建的 tick 线程、传感器和车辆"""
+        self._stop_tick_thread()
+        self.control_sender.stop()
+        self.telemetry.stop()
+        self._destroy_traffic()
+        self._destroy_actors()
+        self._disable_synchronous_mode()
+        self.world = None
+        self.spectator = None
+
     def stop_simulation(self):
         if not self._is_running:
             return
 
-        if self.sensor_manager is not None:
-            self.sensor_manager.destroy_cameras()
-
-        if self.vehicle is not None:
-            self.vehicle.destroy()
-            self.vehicle = None
+        self._stop_tick_thread()
+        self.control_sender.stop()
+        self.telemetry.stop()
+        self._destroy_traffic()
+        self._destroy_actors()
+        self._disable_synchronous_mode()
 
         self.world = None
         self.spectator = None
         self._is_running = False
 
+    def _destroy_traffic(self):
+        if self.traffic is not None and self.traffic.actor_count:
+            self.traffic.destroy()
+
+    def get_traffic_stats(self) -> Dict[str, float]:
+        """返回最近一次 NPC 生成的数量、吞吐量和清理耗时，见 TrafficPopulation.get_stats()"""
+        return self.traffic.get_stats() if self.traffic is not None else {}
+
+    def get_metadata_cache_stats(self) -> dict:
+        """返回元数据缓存的命中统计，见 MetadataCache.get_stats()"""
+        return self.metadata_cache.get_stats()
+
+    def _enable_synchronous_mode(self, fixed_delta_seconds: float):
+        settings = self.world.get_settings()
+        settings.synchronous_mode = True
+        settings.fixed_delta_seconds = fixed_delta_seconds
+        self.world.apply_settings(settings)
+        self._synchronous = True
+
+    def _disable_synchronous_mode(self):
+        """恢复异步模式，否则服务器会一直等待客户端 tick"""
+        if not self._synchronous:
+            return
+
+        self._synchronous = False
+        if self.traffic is not None:
+            try:
+                self.traffic.set_synchronous_mode(False)
+            except Exception as e:
+                print(f"Error restoring Traffic Manager asynchronous mode: {e}")
+
+        if self.world is None:
+            return
+        try:
+            settings = self.world.get_settings()
+            settings.synchronous_mode = False
+            settings.fixed_delta_seconds = None
+            self.world.apply_settings(settings)
+        except Exception as e:
+            print(f"Error restoring asynchronous mode: {e}")
+
+    def _start_tick_thread(self, fixed_delta_seconds: float, realtime: bool):
+        self._tick_thread = SimulationTickThread(
+            self.world,
+            fixed_delta_seconds,
+            realtime=realtime,
+            before_tick=self.control_sender.flush,
+        )
+        # 可能在 LifecycleWorker 的线程中创建，移到管理器所在线程，与之后的 stop/wait 一致
+        self._tick_thread.moveToThread(self.thread())
+        self._tick_thread.real_time_factor_updated.connect(self.real_time_factor_updated)
+        self._tick_thread.tick_error.connect(self.simulation_error)
+        self._tick_thread.start()
+
+    def _stop_tick_thread(self):
+        if self._tick_thread is None:
+            return
+
+        self._tick_thread.stop()
+        self._tick_thread.wait()
+        self._tick_thread.real_time_factor_updated.disconnect()
+        self._tick_thread.tick_error.disconnect()
+        self._tick_thread = None
+
+    def _send_vehicle_control(self, signal: VehicleControlSignal):
+        """在发送线程（同步模式下为 tick 线程）中执行"""
+        vehicle = self.vehicle
+        if vehicle is not None:
+            vehicle.apply_control(carla.VehicleControl(
+                throttle=signal.throttle, steer=signal.steer,
+                brake=signal.brake, hand_brake=signal.hand_brake
+            ))
+
     def set_vehicle_control(self, throttle: float = 0.0, steer: float = 0.0,
                            brake: float = 0.0, hand_brake: bool = False):
         """
@@ -139,13 +434,24 @@ class CarlaClientManager(QObject):
             brake: (0.0 to 1.0)
             hand_brake: bool
         """
+        self.submit_vehicle_control(VehicleControlSignal(throttle, steer, brake, hand_brake).clamp())
+
+    def submit_vehicle_control(self, control: VehicleControlSignal):
+        """提交控制指令（已限幅，调用后不应再修改），由 control_sender 合并、去重后下发"""
         if self.vehicle is not None:
-            control = carla.VehicleControl()
-            control.throttle = max(0.0, min(1.0, throttle))
-            control.steer = max(-1.0, min(1.0, steer))
-            control.brake = max(0.0, min(1.0, brake))
-            control.hand_brake = hand_brake
-            self.vehicle.apply_control(control)
+            self.control_sender.submit(control)
+
+    def get_control_stats(self) -> Dict[str, int]:
+        """返回控制指令的提交、合并、去重和实际发送次数，见 ControlCommandSender"""
+        return self.control_sender.get_stats()
+
+    def get_vehicle_telemetry(self) -> Optional[VehicleTelemetry]:
+        """最近一个仿真步的车辆状态（不发起查询，可在 GUI 线程中调用），尚未收到快照时为 None"""
+        return self.telemetry.latest()
+
+    def get_telemetry_stats(self) -> Dict[str, float]:
+        """返回遥测更新频率、RPC 数和陈旧度，见 VehicleTelemetryService.get_stats()"""
+        return self.telemetry.get_stats()
 
     def get_vehicle_transform(self) -> Optional[carla.Transform]:
         if self.vehicle is not None:
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from carla_bike_sim.config import CONTROL_CHANGE_TOLERANCE, CONTROL_SEND_INTERVAL_MS
+from carla_bike_sim.control.vehicle_control_signal import VehicleControlSignal
+
+
+class ControlCommandSender:
+    """合并、去重后下发车辆控制指令的专用阶段
+
+    submit() 可在任意线程调用，只记录最新指令（突发的多条指令合并为最后一条）。
+    指令由以下两种方式之一下发:
+        - 异步模式: start() 启动专用线程，新指令到达时立即发送，两次发送之间至少间隔 send_interval_ms
+        - 同步模式: 不启动线程，由 tick 线程在每个仿真步之前调用 flush()，每步最多发送一次
+    与上一次发送的指令在 tolerance 内相同的指令不会发送（计为 suppressed）。
+
+    统计:
+        submitted   submit() 调用次数
+        coalesced   发送前就被更新指令覆盖的次数
+        suppressed  因与上次发送的指令相同而未发送的次数
+        sent        实际发送（即 apply_control RPC）次数
+        errors      发送失败次数
+    """
+
+    def __init__(self,
+                 send: Callable[[VehicleControlSignal], None],
+                 send_interval_ms: float = CONTROL_SEND_INTERVAL_MS,
+                 tolerance: float = CONTROL_CHANGE_TOLERANCE):
+        """
+        Args:
+            send: 实际下发指令的函数（如构造 carla.VehicleControl 并调用 vehicle.apply_control）
+            send_interval_ms: 异步模式下两次发送之间的最短间隔（毫秒），0 表示不限速
+            tolerance: 各控制量的变化都不超过该值（且手刹不变）时视为未变化
+        """
+        self.send = send
+        self.send_interval = send_interval_ms / 1000.0
+        self.tolerance = tolerance
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: Optional[VehicleControlSignal] = None
+        self._last_sent: Optional[VehicleControlSignal] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats = {'submitted': 0, 'coalesced': 0, 'suppressed': 0, 'sent': 0, 'errors': 0}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def reset(self, last_sent: Optional[VehicleControlSignal] = None) -> None:
+        """丢弃待发送的指令，并把 last_sent（如生成车辆时施加的初始控制）作为去重的基准"""
+        with self._lock:
+            self._pending = None
+            self._last_sent = last_sent.copy() if last_sent is not None else None
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def submit(self, control: VehicleControlSignal) -> None:
+        """记录最新指令（调用后不应再修改 control）"""
+        with self._lock:
+            self._stats['submitted'] += 1
+            if self._pending is not None:
+                self._stats['coalesced'] += 1
+            self._pending = control
+        self._wakeup.set()
+
+    def flush(self) -> bool:
+        """发送待发送的指令（同步模式下由 tick 线程在每步之前调用）
+
+        Returns:
+            bool: 是否实际发送了指令
+        """
+        with self._lock:
+            control = self._pending
+            self._pending = None
+            if control is None:
+                return False
+            if self._last_sent is not None and control.is_close(self._last_sent, self.tolerance):
+                self._stats['suppressed'] += 1
+                return False
+
+        try:
+            self.send(control)
+        except Exception as e:
+            print(f"Error sending vehicle control: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+
+        with self._lock:
+            self._last_sent = control
+            self._stats['sent'] += 1
+        return True
+
+    def start(self) -> None:
+        """启动专用发送线程（异步模式）"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="carla-control-sender", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止发送线程，未发送的指令被丢弃"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._running = False
+        self._wakeup.set()
+        thread.join()
+        self._thread = None
+        with self._lock:
+            self._pending = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(self):
+        next_send = 0.0
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._running:
+                break
+
+            # 限速: 等待期间到达的指令合并为最新的一条
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if self.flush():
+                next_send = time.perf_counter() + self.send_interval
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """单个传感器的预分配帧缓冲区池（固定容量的环）
+
+    回调线程通过 acquire() 取得一块空闲缓冲区并写入图像，消费者用完后调用 release() 归还。
+    池中没有空闲缓冲区时临时分配一块（计为 miss），临时缓冲区归还时直接丢弃，
+    因此池的内存占用始终固定为 capacity 块。
+
+    线程安全：acquire() 与 release() 可在不同线程中调用。
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.uint8, capacity: int = 4):
+        if capacity < 1:
+            raise ValueError("Frame pool capacity must be at least 1")
+
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+
+        self._lock = threading.Lock()
+        self._buffers = [np.empty(self.shape, dtype=self.dtype) for _ in range(capacity)]
+        self._owned = {id(buffer) for buffer in self._buffers}
+        self._free = deque(self._buffers)
+        self._free_ids = set(self._owned)
+
+        self._hits = 0
+        self._misses = 0
+        self._released = 0
+
+    def acquire(self) -> np.ndarray:
+        """取得一块可写缓冲区，优先复用池中的空闲缓冲区"""
+        with self._lock:
+            if self._free:
+                buffer = self._free.popleft()
+                self._free_ids.discard(id(buffer))
+                self._hits += 1
+                return buffer
+            self._misses += 1
+
+        return np.empty(self.shape, dtype=self.dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """归还缓冲区；非本池分配的缓冲区或重复归还将被忽略"""
+        buffer_id = id(buffer)
+        with self._lock:
+            if buffer_id not in self._owned or buffer_id in self._free_ids:
+                return
+            self._free.append(buffer)
+            self._free_ids.add(buffer_id)
+            self._released += 1
+
+    def matches(self, shape: Tuple[int, ...], dtype=np.uint8) -> bool:
+        return self.shape == tuple(shape) and self.dtype == np.dtype(dtype)
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回池的统计信息
+
+        Returns:
+            dict: capacity, free, in_use, hits, misses, released, hit_rate
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'capacity': self.capacity,
+                'free': len(self._free),
+                'in_use': self.capacity - len(self._free),
+                'hits': self._hits,
+                'misses': self._misses,
+                'released': self._released,
+                'hit_rate': self._hits / total if total > 0 else 0.0,
+            }
@@ -0,0 +1,158 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class CameraFrame:
+    """一帧摄像头图像及其元数据
+
+    Attributes:
+        name: 摄像头名称（如 'front'）
+        image: 图像数据 (numpy array)
+        frame_id: CARLA 仿真帧号 (image.frame)
+        timestamp: CARLA 仿真时间戳，单位秒 (image.timestamp)
+        received_at: 回调收到该帧时的 time.perf_counter()
+        converted_at: 图像转换完成时的 time.perf_counter()，0 表示未记录
+        gui_received_at: GUI 线程取到该帧时的 time.perf_counter()，0 表示未记录
+        data: 解码后的测量数据（语义分割为标签 (H, W) uint8，深度为 24 位整数深度 (H, W) uint32，
+            用 depth_units_to_meters() 换算为米），
+            RGB 摄像头为 None；image 始终是可显示的图像
+        source: 产生该帧的 CARLA 传感器数据 (carla.Image 等)。image / data 是其 raw_data 的零拷贝视图，
+            而 raw_data 不持有底层缓冲区，回调返回后缓冲区随 source 一起释放并被复用；
+            只要帧对象还被引用，source 就保持存活，视图始终有效。拷贝到自有内存的帧为 None
+    """
+    name: str
+    image: np.ndarray
+    frame_id: int = 0
+    timestamp: float = 0.0
+    received_at: float = field(default_factory=time.perf_counter)
+    converted_at: float = 0.0
+    gui_received_at: float = 0.0
+    data: Optional[np.ndarray] = None
+    source: Optional[object] = None
+
+
+@dataclass(slots=True)
+class CameraBundle:
+    """同一仿真帧的多路摄像头图像
+
+    Attributes:
+        frame_id: CARLA 仿真帧号
+        timestamp: CARLA 仿真时间戳，单位秒
+        frames: 摄像头名称 -> CameraFrame
+        missing: 超时仍未到达的摄像头名称（完整 bundle 为空）
+    """
+    frame_id: int
+    timestamp: float
+    frames: Dict[str, CameraFrame]
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing
+
+
+class FrameMailbox:
+    """最新帧信箱：每个摄像头一个槽位，新帧覆盖尚未被取走的旧帧
+
+    CARLA 回调线程调用 put() 写入，GUI 线程按自己的节奏调用 take()/take_all() 取走。
+    无论 GUI 停顿多久，每个摄像头最多只保留一帧，内存和显示延迟都是有界的。
+
+    统计（按摄像头）:
+        received: 写入的帧数
+        delivered: 被取走的帧数
+        overwritten: 未被取走就被新帧覆盖的帧数
+        dropped: 因信箱关闭或清空而丢弃的帧数
+    """
+
+    def __init__(self, on_discard: Optional[Callable[[CameraFrame], None]] = None):
+        """
+        Args:
+            on_discard: 帧被覆盖或丢弃（未交付）时调用，在锁外执行
+        """
+        self._lock = threading.Lock()
+        self._slots: Dict[str, CameraFrame] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._closed = False
+        self._on_discard = on_discard
+
+    def _stats_for(self, name: str) -> Dict[str, int]:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = {'received': 0, 'delivered': 0, 'overwritten': 0, 'dropped': 0}
+            self._stats[name] = stats
+        return stats
+
+    def put(self, frame: CameraFrame) -> bool:
+        """写入一帧，覆盖同一摄像头尚未取走的帧
+
+        Returns:
+            bool: 信箱关闭时返回 False（帧被丢弃）
+        """
+        with self._lock:
+            stats = self._stats_for(frame.name)
+            stats['received'] += 1
+            if self._closed:
+                stats['dropped'] += 1
+                discarded = frame
+            else:
+                discarded = self._slots.get(frame.name)
+                self._slots[frame.name] = frame
+                if discarded is not None:
+                    stats['overwritten'] += 1
+
+        if discarded is not None and self._on_discard is not None:
+            self._on_discard(discarded)
+        return discarded is not frame
+
+    def take(self, name: str) -> Optional[CameraFrame]:
+        """取走指定摄像头的最新帧，没有新帧时返回 None"""
+        with self._lock:
+            frame = self._slots.pop(name, None)
+            if frame is not None:
+                self._stats_for(name)['delivered'] += 1
+            return frame
+
+    def take_all(self) -> Dict[str, CameraFrame]:
+        """取走所有摄像头的最新帧"""
+        with self._lock:
+            frames = self._slots
+            self._slots = {}
+            for name in frames:
+                self._stats_for(name)['delivered'] += 1
+            return frames
+
+    def open(self) -> None:
+        with self._lock:
+            self._closed = False
+
+    def close(self) -> None:
+        """关闭信箱并丢弃所有未取走的帧，之后写入的帧都计为 dropped"""
+        with self._lock:
+            self._closed = True
+        self.clear()
+
+    def clear(self) -> None:
+        """丢弃所有未取走的帧"""
+        with self._lock:
+            frames = self._slots
+            self._slots = {}
+            for name in frames:
+                self._stats_for(name)['dropped'] += 1
+
+        if self._on_discard is not None:
+            for frame in frames.values():
+                self._on_discard(frame)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """返回按摄像头划分的统计副本"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
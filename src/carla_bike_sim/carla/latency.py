@@ -0,0 +1,135 @@
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from carla_bike_sim.config import LATENCY_WINDOW_SIZE
+
+# 延迟阶段（毫秒）:
+#   capture  CARLA 采集 -> 回调入口（估计值，见 LatencyTracker.record_capture）
+#   convert  回调入口 -> 图像转换完成
+#   queue    转换完成 -> GUI 线程取到该帧
+#   display  GUI 线程取到 -> 绘制到屏幕（含缩放）
+#   total    回调入口 -> 绘制到屏幕
+LATENCY_STAGES = ('capture', 'convert', 'queue', 'display', 'total')
+
+PERCENTILES = (50, 95, 99)
+
+
+class _RollingWindow:
+    """固定长度的环形样本窗口"""
+
+    def __init__(self, size: int):
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.count = 0
+        self.index = 0
+
+    def add(self, value: float):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def values(self) -> np.ndarray:
+        return self.samples[:self.count]
+
+
+class LatencyTracker:
+    """按摄像头和阶段统计帧延迟的滚动分位数 (p50/p95/p99)
+
+    每个 (摄像头, 阶段) 保存最近 window_size 个样本；线程安全。
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        self.window_size = window_size
+        self._windows: Dict[str, Dict[str, _RollingWindow]] = {}
+        # 摄像头名称 -> 最近的 (回调时刻 - 仿真时间戳) 偏移
+        self._capture_offsets: Dict[str, _RollingWindow] = {}
+        self._lock = threading.Lock()
+
+    def record(self, camera_name: str, stage: str, latency_ms: float) -> None:
+        with self._lock:
+            self._window(camera_name, stage).add(latency_ms)
+
+    def record_capture(self, camera_name: str, sim_timestamp: float, received_at: float) -> None:
+        """记录 CARLA 采集 -> 回调入口的延迟
+
+        仿真时间戳与本机 perf_counter 没有公共时钟，这里以窗口内最小的
+        (回调时刻 - 仿真时间戳) 作为基准，记录每帧相对该基准多出的延迟，
+        反映的是服务器渲染、网络和回调排队带来的额外延迟及其抖动，而非绝对延迟。
+        仿真速度与墙钟不一致（如非实时的同步模式）时该值没有意义。
+        """
+        offset = received_at - sim_timestamp
+        with self._lock:
+            offsets = self._capture_offsets.get(camera_name)
+            if offsets is None:
+                offsets = _RollingWindow(self.window_size)
+                self._capture_offsets[camera_name] = offsets
+            offsets.add(offset)
+            baseline = offsets.values().min()
+            self._window(camera_name, 'capture').add((offset - baseline) * 1000.0)
+
+    def record_frame(self, camera_name: str, sim_timestamp: float, received_at: float,
+                     converted_at: float, gui_received_at: float, painted_at: float) -> None:
+        """按一帧在各节点的时刻 (time.perf_counter()) 记录所有阶段，值为 0 的节点跳过"""
+        self.record_capture(camera_name, sim_timestamp, received_at)
+        marks = (
+            ('convert', received_at, converted_at),
+            ('queue', converted_at, gui_received_at),
+            ('display', gui_received_at, painted_at),
+            ('total', received_at, painted_at),
+        )
+        with self._lock:
+            for stage, start, end in marks:
+                if start > 0 and end > 0:
+                    self._window(camera_name, stage).add((end - start) * 1000.0)
+
+    def get_percentiles(self, camera_name: Optional[str] = None,
+                        stages: Sequence[str] = LATENCY_STAGES) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """返回延迟分位数
+
+        Args:
+            camera_name: 只返回该摄像头，None 表示所有摄像头
+            stages: 要返回的阶段
+
+        Returns:
+            dict: 摄像头名称 -> 阶段 -> {'p50', 'p95', 'p99', 'max', 'count'}（毫秒）
+        """
+        with self._lock:
+            names = [camera_name] if camera_name is not None else list(self._windows)
+            samples = {
+                name: {
+                    stage: self._windows[name][stage].values().copy()
+                    for stage in stages
+                    if name in self._windows and stage in self._windows[name]
+                }
+                for name in names
+            }
+
+        result = {}
+        for name, stage_samples in samples.items():
+            result[name] = {}
+            for stage, values in stage_samples.items():
+                if len(values) == 0:
+                    continue
+                p50, p95, p99 = np.percentile(values, PERCENTILES)
+                result[name][stage] = {
+                    'p50': float(p50),
+                    'p95': float(p95),
+                    'p99': float(p99),
+                    'max': float(values.max()),
+                    'count': len(values),
+                }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+            self._capture_offsets.clear()
+
+    def _window(self, camera_name: str, stage: str) -> _RollingWindow:
+        stages = self._windows.setdefault(camera_name, {})
+        window = stages.get(stage)
+        if window is None:
+            window = _RollingWindow(self.window_size)
+            stages[stage] = window
+        return window
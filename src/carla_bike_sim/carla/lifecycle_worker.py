@@ -0,0 +1,94 @@
+import threading
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from carla_bike_sim.carla.carla_client_manager import CarlaClientManager
+
+
+class LifecycleWorker(QObject):
+    """在专用线程中执行 CarlaClientManager 的连接、启动仿真等耗时操作，使 GUI 线程保持响应
+
+    同一时刻只执行一个操作；进度通过 CarlaClientManager.lifecycle_progress 发出。
+    所有信号都在工作线程中发出，跨线程连接时请使用 QueuedConnection。
+
+    Signals:
+        finished(str, bool): 操作完成 (操作名称 'connect' / 'start', 是否成功)，被取消时不发出
+        cancelled(str): 操作被取消（已创建的资源已清理）
+    """
+
+    finished = Signal(str, bool)
+    cancelled = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._thread: Optional[threading.Thread] = None
+        self._manager: Optional[CarlaClientManager] = None
+        self._operation: Optional[str] = None
+
+    @property
+    def is_busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def operation(self) -> Optional[str]:
+        """正在执行的操作名称，空闲时为 None"""
+        return self._operation if self.is_busy else None
+
+    def connect_to_server(self, manager: CarlaClientManager) -> bool:
+        """在工作线程中执行 manager.connect()
+
+        Returns:
+            bool: 已有操作在执行时返回 False
+        """
+        return self._run('connect', manager, manager.connect)
+
+    def start_simulation(self, manager: CarlaClientManager, **kwargs) -> bool:
+        """在工作线程中执行 manager.start_simulation(**kwargs)
+
+        Returns:
+            bool: 已有操作在执行时返回 False
+        """
+        return self._run('start', manager, lambda: manager.start_simulation(**kwargs))
+
+    def cancel(self) -> None:
+        """请求取消正在执行的操作，在当前步骤（单个 RPC）完成后生效"""
+        if self.is_busy:
+            self._manager.cancel_pending_operation()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待当前操作结束
+
+        Returns:
+            bool: 超时仍未结束时返回 False
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run(self, operation: str, manager: CarlaClientManager, task: Callable[[], bool]) -> bool:
+        if self.is_busy:
+            return False
+        self._manager = manager
+        self._operation = operation
+        self._thread = threading.Thread(
+            target=self._execute, args=(operation, manager, task),
+            name=f"carla-{operation}", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _execute(self, operation: str, manager: CarlaClientManager, task: Callable[[], bool]):
+        try:
+            success = task()
+        except Exception as e:
+            print(f"Error in {operation} operation: {e}")
+            success = False
+
+        # 最后一个步骤之后才请求的取消不再生效，按成功处理
+        if not success and manager.cancel_requested:
+            self.cancelled.emit(operation)
+        else:
+            self.finished.emit(operation, success)
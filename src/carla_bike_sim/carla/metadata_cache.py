@@ -0,0 +1,180 @@
+"""
+CARLA 元数据缓存
+
+地图列表、蓝图库和出生点在同一服务器版本、同一地图下不会变化，但每次启动仿真都要通过 RPC 获取，
+其中 get_map()（下载并解析 OpenDRIVE）尤其慢。MetadataCache 按服务器版本和地图名称缓存这些数据:
+
+    地图列表   内存 + 磁盘，键为服务器版本
+    出生点     内存 + 磁盘，键为 (服务器版本, 地图名称)
+    蓝图库     仅内存，键为服务器版本（carla.BlueprintLibrary 无法序列化，每个进程首次使用时获取一次）
+
+磁盘缓存每个服务器版本一个 JSON 文件。服务器加载了新的地图包但版本未变时，调用 invalidate() 清除。
+"""
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import carla
+
+from carla_bike_sim.config import METADATA_CACHE_DIR
+
+CACHE_KINDS = ('maps', 'blueprints', 'spawn_points')
+
+
+def map_basename(map_name: str) -> str:
+    """'/Game/Carla/Maps/Town10HD_Opt' 与 'Town10HD_Opt' 视为同一地图"""
+    return map_name.rstrip('/').rsplit('/', 1)[-1]
+
+
+def _transform_to_list(transform: carla.Transform) -> List[float]:
+    location = transform.location
+    rotation = transform.rotation
+    return [location.x, location.y, location.z, rotation.pitch, rotation.yaw, rotation.roll]
+
+
+def _transform_from_list(values: List[float]) -> carla.Transform:
+    x, y, z, pitch, yaw, roll = values
+    return carla.Transform(carla.Location(x=x, y=y, z=z), carla.Rotation(pitch=pitch, yaw=yaw, roll=roll))
+
+
+class MetadataCache:
+    """按服务器版本和地图缓存地图列表、蓝图库和出生点（内存 + 磁盘 JSON）
+
+    可在多个 CarlaClientManager 之间共享，使重新连接同一版本的服务器时也能命中内存缓存。线程安全。
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = METADATA_CACHE_DIR):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        # 服务器版本 -> {'maps': [...], 'spawn_points': {地图: [[x, y, z, pitch, yaw, roll], ...]}}
+        self._entries: Dict[str, dict] = {}
+        self._blueprint_libraries: Dict[str, carla.BlueprintLibrary] = {}
+        # (服务器版本, 地图) -> 出生点，避免每次都重新构造 carla.Transform
+        self._spawn_points: Dict[tuple, List[carla.Transform]] = {}
+        self._lock = threading.Lock()
+        self._stats = {kind: {'hits': 0, 'misses': 0} for kind in CACHE_KINDS}
+
+    def get_available_maps(self, server_version: str, fetch: Callable[[], List[str]]) -> List[str]:
+        """返回地图列表，未缓存时调用 fetch()（如 client.get_available_maps）"""
+        with self._lock:
+            entry = self._entry(server_version)
+            maps = entry.get('maps')
+            if maps:
+                self._stats['maps']['hits'] += 1
+                return list(maps)
+            self._stats['maps']['misses'] += 1
+
+        maps = list(fetch())
+        with self._lock:
+            self._entry(server_version)['maps'] = maps
+            self._save(server_version)
+        return list(maps)
+
+    def get_blueprint_library(self, server_version: str,
+                              fetch: Callable[[], carla.BlueprintLibrary]) -> carla.BlueprintLibrary:
+        """返回蓝图库，未缓存时调用 fetch()（如 world.get_blueprint_library）
+
+        BlueprintLibrary.find() 返回蓝图的副本，修改属性不会影响缓存的蓝图库。
+        """
+        with self._lock:
+            library = self._blueprint_libraries.get(server_version)
+            if library is not None:
+                self._stats['blueprints']['hits'] += 1
+                return library
+            self._stats['blueprints']['misses'] += 1
+
+        library = fetch()
+        with self._lock:
+            self._blueprint_libraries[server_version] = library
+        return library
+
+    def get_spawn_points(self, server_version: str, map_name: str,
+                         fetch: Callable[[], List[carla.Transform]]) -> List[carla.Transform]:
+        """返回地图的出生点，未缓存时调用 fetch()（如 world.get_map().get_spawn_points）"""
+        map_name = map_basename(map_name)
+        key = (server_version, map_name)
+        with self._lock:
+            spawn_points = self._spawn_points.get(key)
+            if spawn_points is None:
+                stored = self._entry(server_version).get('spawn_points', {}).get(map_name)
+                if stored:
+                    spawn_points = [_transform_from_list(values) for values in stored]
+                    self._spawn_points[key] = spawn_points
+            if spawn_points is not None:
+                self._stats['spawn_points']['hits'] += 1
+                return list(spawn_points)
+            self._stats['spawn_points']['misses'] += 1
+
+        spawn_points = list(fetch())
+        with self._lock:
+            self._spawn_points[key] = spawn_points
+            entry = self._entry(server_version)
+            entry.setdefault('spawn_points', {})[map_name] = [
+                _transform_to_list(transform) for transform in spawn_points
+            ]
+            self._save(server_version)
+        return list(spawn_points)
+
+    def invalidate(self, server_version: Optional[str] = None) -> None:
+        """清除某个服务器版本（None 表示全部）的内存和磁盘缓存"""
+        with self._lock:
+            versions = [server_version] if server_version is not None else list(self._entries)
+            if server_version is None and self.cache_dir is not None and self.cache_dir.exists():
+                versions += [path.stem for path in self.cache_dir.glob('*.json')]
+            for version in set(versions):
+                self._entries.pop(version, None)
+                self._blueprint_libraries.pop(version, None)
+                for key in [key for key in self._spawn_points if key[0] == version]:
+                    del self._spawn_points[key]
+                path = self._path(version)
+                if path is not None and path.exists():
+                    path.unlink()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """返回每类数据的 hits, misses, hit_rate"""
+        with self._lock:
+            stats = {}
+            for kind, counts in self._stats.items():
+                total = counts['hits'] + counts['misses']
+                stats[kind] = {**counts, 'hit_rate': counts['hits'] / total if total else 0.0}
+            return stats
+
+    def _entry(self, server_version: str) -> dict:
+        """返回服务器版本的缓存条目，首次访问时从磁盘加载（调用方需持有锁）"""
+        entry = self._entries.get(server_version)
+        if entry is None:
+            entry = self._load(server_version)
+            self._entries[server_version] = entry
+        return entry
+
+    def _path(self, server_version: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{re.sub(r'[^A-Za-z0-9._-]', '_', server_version)}.json"
+
+    def _load(self, server_version: str) -> dict:
+        path = self._path(server_version)
+        if path is None or not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading metadata cache {path}: {e}")
+            return {}
+
+    def _save(self, server_version: str) -> None:
+        """写入磁盘（调用方需持有锁）"""
+        path = self._path(server_version)
+        if path is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免并发读到不完整的文件
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries[server_version], f)
+            tmp_path.replace(path)
+        except OSError as e:
+            print(f"Error saving metadata cache: {e}")
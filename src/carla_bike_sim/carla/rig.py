@@ -0,0 +1,187 @@
+"""
+传感器装配 (rig) 描述
+
+用声明式的 SensorSpec 列表描述挂载在车辆上的传感器，由 SensorManager 按描述生成。
+每个传感器可以独立设置类型、安装位置、分辨率、视野角度和 sensor_tick，
+例如侧向广角摄像头以低分辨率 10 Hz 运行、前摄像头全速运行，以降低服务器渲染负载。
+"""
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+import carla
+
+from carla_bike_sim.config import (
+    CAMERA_FOV,
+    CAMERA_IMAGE_HEIGHT,
+    CAMERA_IMAGE_WIDTH,
+    CAMERA_SENSOR_TICK,
+    FRONT_CAMERA_PITCH,
+    FRONT_CAMERA_ROLL,
+    FRONT_CAMERA_X,
+    FRONT_CAMERA_Y,
+    FRONT_CAMERA_YAW,
+    FRONT_CAMERA_Z,
+    IMU_X,
+    IMU_Y,
+    IMU_Z,
+    LEFT_CAMERA_PITCH,
+    LEFT_CAMERA_ROLL,
+    LEFT_CAMERA_X,
+    LEFT_CAMERA_Y,
+    LEFT_CAMERA_YAW,
+    LEFT_CAMERA_Z,
+    LIDAR_CHANNELS,
+    LIDAR_POINTS_PER_SECOND,
+    LIDAR_RANGE,
+    LIDAR_ROTATION_FREQUENCY,
+    LIDAR_X,
+    LIDAR_Y,
+    LIDAR_Z,
+    REAR_CAMERA_PITCH,
+    REAR_CAMERA_ROLL,
+    REAR_CAMERA_X,
+    REAR_CAMERA_Y,
+    REAR_CAMERA_YAW,
+    REAR_CAMERA_Z,
+    RIGHT_CAMERA_PITCH,
+    RIGHT_CAMERA_ROLL,
+    RIGHT_CAMERA_X,
+    RIGHT_CAMERA_Y,
+    RIGHT_CAMERA_YAW,
+    RIGHT_CAMERA_Z,
+    SIDE_CAMERA_FOV,
+)
+
+
+@dataclass(frozen=True)
+class SensorSpec:
+    """单个传感器的描述
+
+    Attributes:
+        name: 传感器名称，同时用作图像流名称（如 'front'）
+        blueprint: CARLA 蓝图 ID（如 'sensor.camera.rgb'）
+        x, y, z: 相对车辆中心的安装位置（米）
+        pitch, yaw, roll: 安装角度（度）
+        image_size_x, image_size_y: 摄像头分辨率
+        fov: 摄像头水平视野角度（度）
+        sensor_tick: 两次采集之间的仿真时间（秒），0 表示每个仿真帧都采集
+        attributes: 其他蓝图属性，原样写入蓝图
+    """
+    name: str
+    blueprint: str = 'sensor.camera.rgb'
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+    pitch: float = 0.0
+    yaw: float = 0.0
+    roll: float = 0.0
+    image_size_x: int = CAMERA_IMAGE_WIDTH
+    image_size_y: int = CAMERA_IMAGE_HEIGHT
+    fov: float = CAMERA_FOV
+    sensor_tick: float = CAMERA_SENSOR_TICK
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_camera(self) -> bool:
+        return self.blueprint.startswith('sensor.camera.')
+
+    @property
+    def is_rgb_camera(self) -> bool:
+        return self.blueprint == 'sensor.camera.rgb'
+
+    @property
+    def is_lidar(self) -> bool:
+        return self.blueprint == 'sensor.lidar.ray_cast'
+
+    def transform(self) -> carla.Transform:
+        return carla.Transform(
+            carla.Location(x=self.x, y=self.y, z=self.z),
+            carla.Rotation(pitch=self.pitch, yaw=self.yaw, roll=self.roll)
+        )
+
+    def blueprint_attributes(self) -> Dict[str, str]:
+        """返回要写入蓝图的属性（字符串形式）"""
+        attributes = {'sensor_tick': str(self.sensor_tick)}
+        if self.is_camera:
+            attributes['image_size_x'] = str(self.image_size_x)
+            attributes['image_size_y'] = str(self.image_size_y)
+            attributes['fov'] = str(self.fov)
+        attributes.update({key: str(value) for key, value in self.attributes.items()})
+        return attributes
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'SensorSpec':
+        """从字典（如 JSON 配置）创建，未知字段会引发 ValueError"""
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown sensor spec fields: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+def load_rig(sensors: Iterable[Mapping[str, Any]]) -> Tuple[SensorSpec, ...]:
+    """从声明式描述（字典列表）创建 rig，传感器名称必须唯一"""
+    rig = tuple(SensorSpec.from_dict(sensor) for sensor in sensors)
+    names = [spec.name for spec in rig]
+    if len(names) != len(set(names)):
+        raise ValueError("Sensor names in a rig must be unique")
+    return rig
+
+
+# 默认四摄像头 rig：前后为标准视野，左右为广角
+DEFAULT_CAMERA_RIG: Tuple[SensorSpec, ...] = (
+    SensorSpec('front', x=FRONT_CAMERA_X, y=FRONT_CAMERA_Y, z=FRONT_CAMERA_Z,
+               pitch=FRONT_CAMERA_PITCH, yaw=FRONT_CAMERA_YAW, roll=FRONT_CAMERA_ROLL),
+    SensorSpec('rear', x=REAR_CAMERA_X, y=REAR_CAMERA_Y, z=REAR_CAMERA_Z,
+               pitch=REAR_CAMERA_PITCH, yaw=REAR_CAMERA_YAW, roll=REAR_CAMERA_ROLL),
+    SensorSpec('left', x=LEFT_CAMERA_X, y=LEFT_CAMERA_Y, z=LEFT_CAMERA_Z,
+               pitch=LEFT_CAMERA_PITCH, yaw=LEFT_CAMERA_YAW, roll=LEFT_CAMERA_ROLL,
+               fov=SIDE_CAMERA_FOV),
+    SensorSpec('right', x=RIGHT_CAMERA_X, y=RIGHT_CAMERA_Y, z=RIGHT_CAMERA_Z,
+               pitch=RIGHT_CAMERA_PITCH, yaw=RIGHT_CAMERA_YAW, roll=RIGHT_CAMERA_ROLL,
+               fov=SIDE_CAMERA_FOV),
+)
+
+# 低渲染负载 rig：前摄像头全速全分辨率，其余摄像头 10 Hz 低分辨率
+LOW_LOAD_CAMERA_RIG: Tuple[SensorSpec, ...] = (
+    DEFAULT_CAMERA_RIG[0],
+    *(
+        SensorSpec(spec.name, x=spec.x, y=spec.y, z=spec.z,
+                   pitch=spec.pitch, yaw=spec.yaw, roll=spec.roll,
+                   image_size_x=400, image_size_y=300, fov=spec.fov, sensor_tick=0.1)
+        for spec in DEFAULT_CAMERA_RIG[1:]
+    ),
+)
+
+# 感知 rig：默认四摄像头 + 与前摄像头同位置的语义分割和深度摄像头
+PERCEPTION_CAMERA_RIG: Tuple[SensorSpec, ...] = (
+    *DEFAULT_CAMERA_RIG,
+    SensorSpec('front_semantic', blueprint='sensor.camera.semantic_segmentation',
+               x=FRONT_CAMERA_X, y=FRONT_CAMERA_Y, z=FRONT_CAMERA_Z,
+               pitch=FRONT_CAMERA_PITCH, yaw=FRONT_CAMERA_YAW, roll=FRONT_CAMERA_ROLL),
+    SensorSpec('front_depth', blueprint='sensor.camera.depth',
+               x=FRONT_CAMERA_X, y=FRONT_CAMERA_Y, z=FRONT_CAMERA_Z,
+               pitch=FRONT_CAMERA_PITCH, yaw=FRONT_CAMERA_YAW, roll=FRONT_CAMERA_ROLL),
+)
+
+# 激光雷达 rig：默认四摄像头 + 车顶激光雷达（显示为俯视栅格图）
+LIDAR_RIG: Tuple[SensorSpec, ...] = (
+    *DEFAULT_CAMERA_RIG,
+    SensorSpec('lidar', blueprint='sensor.lidar.ray_cast', x=LIDAR_X, y=LIDAR_Y, z=LIDAR_Z,
+               attributes={
+                   'range': LIDAR_RANGE,
+                   'channels': LIDAR_CHANNELS,
+                   'points_per_second': LIDAR_POINTS_PER_SECOND,
+                   'rotation_frequency': LIDAR_ROTATION_FREQUENCY,
+               }),
+)
+
+# IMU、GNSS 和碰撞传感器（样本写入 SensorManager.sensor_streams 的环形缓冲区）
+MEASUREMENT_SENSORS: Tuple[SensorSpec, ...] = (
+    SensorSpec('imu', blueprint='sensor.other.imu', x=IMU_X, y=IMU_Y, z=IMU_Z),
+    SensorSpec('gnss', blueprint='sensor.other.gnss', x=IMU_X, y=IMU_Y, z=IMU_Z),
+    SensorSpec('collision', blueprint='sensor.other.collision'),
+)
+
+# 研究用 rig：默认四摄像头 + IMU、GNSS 和碰撞传感器
+INSTRUMENTED_RIG: Tuple[SensorSpec, ...] = (*DEFAULT_CAMERA_RIG, *MEASUREMENT_SENSORS)
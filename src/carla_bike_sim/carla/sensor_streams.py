@@ -0,0 +1,230 @@
+"""
+非图像传感器数据流 (IMU / GNSS / 碰撞)
+
+每个传感器的样本写入预分配的结构化 numpy 环形缓冲区: 回调线程中每个样本只做一次结构化行赋值，
+不保留 Python 对象，也不为每个样本发 Qt 信号。消费者按样本序号增量读取 (since)、
+按仿真时间窗口查询 (window) 或取最近 n 个样本 (latest)，得到按时间排序的结构化数组拷贝。
+
+GUI 通过 SensorStreams.streams_updated 得到节流后的变更通知: 每个通知周期最多一次，
+只列出该周期内有新样本的数据流。
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import carla
+import numpy as np
+from PySide6.QtCore import QMetaObject, QObject, Qt, QTimer, Signal
+
+from carla_bike_sim.config import SENSOR_STREAM_CAPACITY, SENSOR_STREAM_NOTIFY_INTERVAL_MS
+
+# 所有样本共有的字段在前: 仿真帧号、仿真时间戳
+IMU_DTYPE = np.dtype([
+    ('frame_id', '<i8'),
+    ('timestamp', '<f8'),
+    ('accelerometer', '<f4', (3,)),  # m/s^2
+    ('gyroscope', '<f4', (3,)),      # rad/s
+    ('compass', '<f4'),              # 弧度，0 为正北
+])
+
+GNSS_DTYPE = np.dtype([
+    ('frame_id', '<i8'),
+    ('timestamp', '<f8'),
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('altitude', '<f8'),
+])
+
+COLLISION_DTYPE = np.dtype([
+    ('frame_id', '<i8'),
+    ('timestamp', '<f8'),
+    ('other_actor_id', '<i8'),
+    ('normal_impulse', '<f4', (3,)),  # N*s
+    ('intensity', '<f4'),             # 冲量大小
+])
+
+
+def _imu_record(data: carla.IMUMeasurement) -> tuple:
+    accel = data.accelerometer
+    gyro = data.gyroscope
+    return (data.frame, data.timestamp, (accel.x, accel.y, accel.z), (gyro.x, gyro.y, gyro.z), data.compass)
+
+
+def _gnss_record(data: carla.GnssMeasurement) -> tuple:
+    return (data.frame, data.timestamp, data.latitude, data.longitude, data.altitude)
+
+
+def _collision_record(data: carla.CollisionEvent) -> tuple:
+    impulse = data.normal_impulse
+    other = data.other_actor
+    return (data.frame, data.timestamp, other.id if other is not None else -1,
+            (impulse.x, impulse.y, impulse.z),
+            (impulse.x ** 2 + impulse.y ** 2 + impulse.z ** 2) ** 0.5)
+
+
+# 蓝图 ID -> (样本 dtype, 测量数据 -> 行元组)
+STREAM_TYPES: Dict[str, Tuple[np.dtype, Callable[[carla.SensorData], tuple]]] = {
+    'sensor.other.imu': (IMU_DTYPE, _imu_record),
+    'sensor.other.gnss': (GNSS_DTYPE, _gnss_record),
+    'sensor.other.collision': (COLLISION_DTYPE, _collision_record),
+}
+
+
+class SampleRingBuffer:
+    """预分配的结构化 numpy 环形缓冲区
+
+    样本按写入顺序编号（从 0 开始，单调递增），缓冲区只保留最近 capacity 个样本。
+    假设样本按时间戳递增写入（同一传感器的回调是串行的）。线程安全。
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int = SENSOR_STREAM_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """已写入的样本总数（即下一个样本的序号）"""
+        return self._total
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    def append(self, record: tuple) -> None:
+        with self._lock:
+            self._data[self._total % self.capacity] = record
+            self._total += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._total = 0
+
+    def latest(self, count: Optional[int] = None) -> np.ndarray:
+        """最近 count 个样本（None 表示缓冲区中的全部样本），按时间排序"""
+        with self._lock:
+            available = min(self._total, self.capacity)
+            count = available if count is None else min(count, available)
+            return self._copy_range(self._total - count, self._total)
+
+    def since(self, sequence: int) -> Tuple[np.ndarray, int]:
+        """序号 >= sequence 的样本，用于增量读取
+
+        已被覆盖的样本会被跳过（可用返回的第一个样本之前的序号差判断丢失数量）。
+
+        Returns:
+            (样本, 下一次调用应传入的序号)
+        """
+        with self._lock:
+            start = max(sequence, self._total - self.capacity, 0)
+            return self._copy_range(start, self._total), self._total
+
+    def window(self, start_time: float, end_time: Optional[float] = None) -> np.ndarray:
+        """仿真时间戳在 [start_time, end_time] 内的样本，end_time 为 None 表示到最新"""
+        with self._lock:
+            parts = []
+            for segment in self._segments():
+                timestamps = segment['timestamp']
+                lo = np.searchsorted(timestamps, start_time, side='left')
+                hi = len(segment) if end_time is None else np.searchsorted(timestamps, end_time, side='right')
+                if hi > lo:
+                    parts.append(segment[lo:hi])
+            if not parts:
+                return np.empty(0, dtype=self.dtype)
+            return np.concatenate(parts)
+
+    def _segments(self) -> List[np.ndarray]:
+        """缓冲区中按时间排序的连续视图（回绕时为两段，调用方需持有锁）"""
+        if self._total <= self.capacity:
+            return [self._data[:self._total]]
+        head = self._total % self.capacity
+        return [self._data[head:], self._data[:head]]
+
+    def _copy_range(self, start: int, end: int) -> np.ndarray:
+        """拷贝序号 [start, end) 的样本（调用方需持有锁且保证范围仍在缓冲区中）"""
+        if end <= start:
+            return np.empty(0, dtype=self.dtype)
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self._data[first:last].copy()
+        return np.concatenate((self._data[first:], self._data[:last - self.capacity]))
+
+
+class SensorStreams(QObject):
+    """按传感器名称管理 IMU / GNSS / 碰撞样本的环形缓冲区
+
+    record() 在 CARLA 回调线程中调用；变更通知由 GUI 线程中的定时器检查各缓冲区的样本总数后发出，
+    回调线程中不涉及任何 Qt 对象。
+
+    Signals:
+        streams_updated(list): 上个通知周期内有新样本的数据流名称
+    """
+
+    streams_updated = Signal(list)
+
+    def __init__(self, capacity: int = SENSOR_STREAM_CAPACITY,
+                 notify_interval_ms: int = SENSOR_STREAM_NOTIFY_INTERVAL_MS):
+        super().__init__()
+        self.capacity = capacity
+        self._buffers: Dict[str, SampleRingBuffer] = {}
+        self._recorders: Dict[str, Callable[[carla.SensorData], tuple]] = {}
+        self._notified_totals: Dict[str, int] = {}
+
+        self._notify_timer = QTimer(self)
+        self._notify_timer.setInterval(notify_interval_ms)
+        self._notify_timer.timeout.connect(self._check_updates)
+
+    @staticmethod
+    def supports(blueprint: str) -> bool:
+        return blueprint in STREAM_TYPES
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._buffers)
+
+    def add_stream(self, name: str, blueprint: str) -> SampleRingBuffer:
+        """为一个传感器创建（或清空已有的）环形缓冲区"""
+        dtype, recorder = STREAM_TYPES[blueprint]
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.dtype != dtype:
+            buffer = SampleRingBuffer(dtype, self.capacity)
+            self._buffers[name] = buffer
+        else:
+            buffer.clear()
+        self._recorders[name] = recorder
+        self._notified_totals[name] = 0
+        return buffer
+
+    def get(self, name: str) -> Optional[SampleRingBuffer]:
+        return self._buffers.get(name)
+
+    def record(self, name: str, data: carla.SensorData) -> None:
+        """写入一个测量样本（CARLA 回调线程）"""
+        self._buffers[name].append(self._recorders[name](data))
+
+    def start_notifications(self) -> None:
+        # 可能在工作线程中调用（如 LifecycleWorker 启动仿真），定时器只能在所属线程中启停
+        QMetaObject.invokeMethod(self._notify_timer, 'start', Qt.ConnectionType.AutoConnection)
+
+    def stop_notifications(self) -> None:
+        QMetaObject.invokeMethod(self._notify_timer, 'stop', Qt.ConnectionType.AutoConnection)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """返回每个数据流的样本总数和缓冲区中的样本数"""
+        return {
+            name: {'total': buffer.total, 'buffered': len(buffer)}
+            for name, buffer in self._buffers.items()
+        }
+
+    def _check_updates(self) -> None:
+        updated = []
+        for name, buffer in self._buffers.items():
+            total = buffer.total
+            if total != self._notified_totals.get(name, 0):
+                self._notified_totals[name] = total
+                updated.append(name)
+        if updated:
+            self.streams_updated.emit(updated)
@@ -1,8 +1,169 @@
 import carla
 import numpy as np
-from typing import Optional
-from PySide6.QtCore import QObject, Signal
-from carla_bike_sim.carla.utils import carla_image_to_bgr
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from PySide6.QtCore import QMetaObject, QObject, Qt, QTimer, Signal
+from carla_bike_sim.carla.callback_gate import SensorCallbackGate
+from carla_bike_sim.carla.frame_pool import FrameBufferPool
+from carla_bike_sim.carla.frames import CameraBundle, CameraFrame, FrameMailbox
+from carla_bike_sim.carla.rig import DEFAULT_CAMERA_RIG, SensorSpec
+from carla_bike_sim.carla.sensor_streams import SensorStreams
+from carla_bike_sim.carla.utils import (
+    borrows_raw_data,
+    carla_image_to_bgr,
+    carla_image_to_bgra,
+    decode_depth,
+    decode_semantic_segmentation,
+    lidar_points,
+)
+from carla_bike_sim.config import (
+    CAMERA_BUNDLE_PARTIAL_POLICY,
+    CAMERA_BUNDLE_TIMEOUT,
+    CAMERA_DELIVERY_MODE,
+    CAMERA_FRAME_POOL_SIZE,
+    CAMERA_IMAGE_FORMAT,
+    CAMERA_USE_FRAME_POOL,
+    SENSOR_CALLBACK_DRAIN_TIMEOUT,
+)
+from carla_bike_sim.processing.lidar_raster import LidarRasterizer
+
+class CameraBundleSynchronizer(QObject):
+    """按仿真帧号 (image.frame) 将多路摄像头图像组合为对齐的 CameraBundle
+
+    各摄像头回调线程调用 add()，某帧的所有摄像头到齐后立即发出 bundle_ready。
+    某帧等待超过 timeout 秒、或更新的帧已经凑齐时，按 partial_policy 处理该帧:
+        - 'emit': 发出不完整的 bundle，missing 中列出缺失的摄像头
+        - 'drop': 丢弃不完整的 bundle
+    已关闭帧号的迟到图像会被丢弃，不在 camera_names 中的流（如激光雷达）会被忽略。
+    超时检查除了在新帧到达时进行，还由所属线程中的定时器周期性执行 (start_expiry_checks())，
+    某路摄像头停顿或所有摄像头都停止时，等待中的帧同样会按时关闭，不会无限期持有图像。
+    等待中的 CameraFrame 通过 frame.source 持有 CARLA 图像，bundle 交付后其中的视图保持有效。
+
+    bundle_ready 在 CARLA 回调线程（或定时检查所在的线程）中发出，跨线程连接时请使用 QueuedConnection。
+
+    Signals:
+        bundle_ready(CameraBundle): 一个仿真帧的对齐图像
+    """
+
+    bundle_ready = Signal(object)
+
+    PARTIAL_POLICIES = ('emit', 'drop')
+
+    def __init__(self,
+                 camera_names: Iterable[str],
+                 timeout: float = CAMERA_BUNDLE_TIMEOUT,
+                 partial_policy: str = CAMERA_BUNDLE_PARTIAL_POLICY,
+                 max_pending: int = 16):
+        super().__init__()
+        if partial_policy not in self.PARTIAL_POLICIES:
+            raise ValueError(f"Unsupported partial bundle policy: {partial_policy}")
+
+        self.camera_names = list(camera_names)
+        self.timeout = timeout
+        self.partial_policy = partial_policy
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        # frame_id -> (首帧到达时间, {摄像头名称: CameraFrame})
+        self._pending: Dict[int, tuple[float, Dict[str, CameraFrame]]] = {}
+        self._last_closed_frame_id = -1
+        self._stats = {'complete': 0, 'partial_emitted': 0, 'partial_dropped': 0, 'late_frames': 0}
+
+        self._expiry_timer = QTimer(self)
+        self._expiry_timer.setInterval(max(10, int(timeout * 1000 / 2)))
+        self._expiry_timer.timeout.connect(self.expire)
+
+    def add(self, frame: CameraFrame) -> None:
+        now = time.perf_counter()
+        ready: List[CameraBundle] = []
+
+        if frame.name not in self.camera_names:
+            return
+
+        with self._lock:
+            if frame.frame_id <= self._last_closed_frame_id:
+                self._stats['late_frames'] += 1
+                return
+
+            entry = self._pending.get(frame.frame_id)
+            if entry is None:
+                entry = (now, {})
+                self._pending[frame.frame_id] = entry
+            entry[1][frame.name] = frame
+
+            if len(entry[1]) == len(self.camera_names):
+                # 更早的帧不会再凑齐，按策略关闭
+                for frame_id in sorted(self._pending):
+                    if frame_id >= frame.frame_id:
+                        break
+                    self._close(frame_id, ready)
+                self._close(frame.frame_id, ready)
+
+            self._close_expired(now, ready)
+
+        for bundle in ready:
+            self.bundle_ready.emit(bundle)
+
+    def expire(self) -> None:
+        """按策略关闭等待超过 timeout 的帧（定时器或拉取循环调用，不依赖新帧到达）"""
+        ready: List[CameraBundle] = []
+        with self._lock:
+            self._close_expired(time.perf_counter(), ready)
+        for bundle in ready:
+            self.bundle_ready.emit(bundle)
+
+    def start_expiry_checks(self) -> None:
+        # 可能在工作线程中调用（如 LifecycleWorker 启动仿真），定时器只能在所属线程中启停
+        QMetaObject.invokeMethod(self._expiry_timer, 'start', Qt.ConnectionType.AutoConnection)
+
+    def stop_expiry_checks(self) -> None:
+        QMetaObject.invokeMethod(self._expiry_timer, 'stop', Qt.ConnectionType.AutoConnection)
+
+    def flush(self) -> None:
+        """按策略关闭所有等待中的帧（如传感器销毁前）"""
+        ready: List[CameraBundle] = []
+        with self._lock:
+            for frame_id in sorted(self._pending):
+                self._close(frame_id, ready)
+        for bundle in ready:
+            self.bundle_ready.emit(bundle)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._last_closed_frame_id = -1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            return stats
+
+    def _close_expired(self, now: float, ready: List[CameraBundle]) -> None:
+        """关闭超时的帧，等待中的帧过多时从最早的开始关闭（调用方需持有锁）"""
+        for frame_id in sorted(self._pending):
+            created_at = self._pending[frame_id][0]
+            if now - created_at >= self.timeout or len(self._pending) > self.max_pending:
+                self._close(frame_id, ready)
+
+    def _close(self, frame_id: int, ready: List[CameraBundle]) -> None:
+        """关闭一个帧号（调用方需持有锁）"""
+        _, frames = self._pending.pop(frame_id)
+        self._last_closed_frame_id = max(self._last_closed_frame_id, frame_id)
+
+        missing = [name for name in self.camera_names if name not in frames]
+        if missing:
+            if self.partial_policy == 'drop':
+                self._stats['partial_dropped'] += 1
+                return
+            self._stats['partial_emitted'] += 1
+        else:
+            self._stats['complete'] += 1
+
+        timestamp = next(iter(frames.values())).timestamp
+        ready.append(CameraBundle(frame_id, timestamp, frames, missing))
+
 
 class SensorManager(QObject):
     # Signals:
@@ -10,110 +171,346 @@ class SensorManager(QObject):
     rear_camera_image_ready = Signal(np.ndarray)
     left_camera_image_ready = Signal(np.ndarray)
     right_camera_image_ready = Signal(np.ndarray)
+    # 启用 bundle 后，每个仿真帧的对齐图像 (CameraBundle)，在 CARLA 回调线程中发出
+    camera_bundle_ready = Signal(object)
+    # signal 模式下任意 rig 摄像头的图像 (名称, 图像)
+    camera_image_ready = Signal(str, np.ndarray)
 
-    def __init__(self):
+    def __init__(self,
+                 image_format: str = CAMERA_IMAGE_FORMAT,
+                 delivery_mode: str = CAMERA_DELIVERY_MODE,
+                 use_frame_pool: bool = CAMERA_USE_FRAME_POOL,
+                 frame_pool_size: int = CAMERA_FRAME_POOL_SIZE,
+                 rig: Sequence[SensorSpec] = DEFAULT_CAMERA_RIG):
+        """
+        Args:
+            image_format: 发出的图像格式
+                - 'bgr': (H, W, 3) 视图，兼容旧的处理代码
+                - 'bgra': (H, W, 4) 零拷贝视图，可直接按 Format_RGB32 显示
+            delivery_mode: 图像交付方式
+                - 'signal': 每帧通过 *_camera_image_ready 信号发出（每帧拷贝一次，
+                  信号只携带数组，无法让 CARLA 缓冲区在队列中保持存活）
+                - 'mailbox': 写入 frame_mailbox，由消费者按自己的节奏拉取最新帧
+            use_frame_pool: 是否将引用 CARLA 缓冲区的帧拷贝到预分配的复用缓冲区（仅 mailbox 模式）
+                消费者用完帧后必须调用 release_frame() 归还缓冲区。每帧多一次整帧拷贝，
+                换来 CARLA 图像在回调内即可释放；默认关闭（信箱中的帧通过 source 零拷贝持有图像）
+            frame_pool_size: 每个摄像头的缓冲区数量
+            rig: 传感器描述列表，见 carla_bike_sim.carla.rig
+        """
         super().__init__()
-        self.front_camera: Optional[carla.Sensor] = None
-        self.rear_camera: Optional[carla.Sensor] = None
-        self.left_camera: Optional[carla.Sensor] = None
-        self.right_camera: Optional[carla.Sensor] = None
-        self._destroying = False  # 标志位，防止销毁时回调继续执行
-    
-    def setup_cameras(self, vehicle: carla.Vehicle, world: carla.World):
-        blueprint_library = world.get_blueprint_library()
-        
-        camera_bp = blueprint_library.find('sensor.camera.rgb')
-        camera_bp.set_attribute('image_size_x', '800')
-        camera_bp.set_attribute('image_size_y', '600')
-        camera_bp.set_attribute('fov', '90')
-        
-        camera_fisheye_bp = blueprint_library.find('sensor.camera.rgb')
-        camera_fisheye_bp.set_attribute('image_size_x', '800')
-        camera_fisheye_bp.set_attribute('image_size_y', '600')
-        camera_fisheye_bp.set_attribute('fov', '160')
-        
-        # Front camera
-        transform_front = carla.Transform(carla.Location(x=1.5, z=2.4))
-        self.front_camera = world.spawn_actor(camera_bp, transform_front, attach_to=vehicle)
-        self.front_camera.listen(lambda image: self.camera_callback(image, 'front'))
-
-        # Rear camera
-        transform_rear = carla.Transform(carla.Location(x=-1.5, z=2.4), carla.Rotation(yaw=180))
-        self.rear_camera = world.spawn_actor(camera_bp, transform_rear, attach_to=vehicle)
-        self.rear_camera.listen(lambda image: self.camera_callback(image, 'rear'))
-
-        # Left camera
-        transform_left = carla.Transform(carla.Location(y=-1.5, z=2.4), carla.Rotation(yaw=-90))
-        self.left_camera = world.spawn_actor(camera_fisheye_bp, transform_left, attach_to=vehicle)
-        self.left_camera.listen(lambda image: self.camera_callback(image, 'left'))
-
-        # Right camera
-        transform_right = carla.Transform(carla.Location(y=1.5, z=2.4), carla.Rotation(yaw=90))
-        self.right_camera = world.spawn_actor(camera_fisheye_bp, transform_right, attach_to=vehicle)
-        self.right_camera.listen(lambda image: self.camera_callback(image, 'right'))
+        if image_format not in ('bgr', 'bgra'):
+            raise ValueError(f"Unsupported image format: {image_format}")
+        if delivery_mode not in ('signal', 'mailbox'):
+            raise ValueError(f"Unsupported delivery mode: {delivery_mode}")
+        if use_frame_pool and delivery_mode != 'mailbox':
+            raise ValueError("Frame pool requires 'mailbox' delivery mode")
+        self.image_format = image_format
+        self.delivery_mode = delivery_mode
+        self.use_frame_pool = use_frame_pool
+        self.frame_pool_size = frame_pool_size
+        self._convert_image = carla_image_to_bgra if image_format == 'bgra' else carla_image_to_bgr
+        # 被覆盖或丢弃的帧同样需要归还缓冲区
+        self.frame_mailbox = FrameMailbox(on_discard=self.release_frame)
+        self._frame_pools: Dict[str, FrameBufferPool] = {}
+        self._frame_pools_lock = threading.Lock()
+        self.bundle_synchronizer: Optional[CameraBundleSynchronizer] = None
+        # 帧监听器列表，写时复制，回调线程中无需加锁即可遍历
+        self._frame_listeners: Tuple[Callable[[CameraFrame], None], ...] = ()
+        self.rig: Tuple[SensorSpec, ...] = tuple(rig)
+        # 传感器名称 -> 解码函数（语义分割、深度摄像头、激光雷达），RGB 摄像头使用 _convert_image
+        self._decoders: Dict[str, Optional[Callable]] = {spec.name: self._decoder_for(spec) for spec in self.rig}
+        self.sensors: Dict[str, carla.Sensor] = {}
+        # IMU / GNSS / 碰撞传感器的样本环形缓冲区
+        self.sensor_streams = SensorStreams()
+        self._named_signals = {
+            'front': self.front_camera_image_ready,
+            'rear': self.rear_camera_image_ready,
+            'left': self.left_camera_image_ready,
+            'right': self.right_camera_image_ready,
+        }
+        # 每次 attach_sensors() 一个会话，detach_sensors() 时拒绝旧会话的回调并等待进行中的回调结束
+        self._callback_gate = SensorCallbackGate()
     
+    @property
+    def camera_names(self) -> List[str]:
+        return [spec.name for spec in self.rig if spec.is_camera]
+
+    @property
+    def bundle_camera_names(self) -> List[str]:
+        """参与 bundle 对齐的摄像头: 只有 RGB 摄像头（语义分割、深度摄像头与同位置的 RGB 摄像头重复，
+        混入鸟瞰图 / 拼接视频没有意义，也不应让 bundle 等待它们）"""
+        return [spec.name for spec in self.rig if spec.is_rgb_camera]
+
+    @property
+    def display_names(self) -> List[str]:
+        """产生显示图像的传感器名称（摄像头和激光雷达俯视图），按 rig 顺序"""
+        return [spec.name for spec in self.rig if spec.is_camera or spec.is_lidar]
+
+    @property
+    def front_camera(self) -> Optional[carla.Sensor]:
+        return self.sensors.get('front')
+
+    @property
+    def rear_camera(self) -> Optional[carla.Sensor]:
+        return self.sensors.get('rear')
+
+    @property
+    def left_camera(self) -> Optional[carla.Sensor]:
+        return self.sensors.get('left')
+
+    @property
+    def right_camera(self) -> Optional[carla.Sensor]:
+        return self.sensors.get('right')
+
+    def add_frame_listener(self, listener: Callable[[CameraFrame], None]) -> None:
+        """注册帧监听器，在 CARLA 回调线程中对每一帧调用
+
+        监听器收到的图像是 CARLA 原始缓冲区的视图（不占用帧缓冲池），缓冲区由 frame.source 保持存活:
+        需要在回调返回后使用图像时，必须持有整个 CameraFrame（而不只是 image 数组）。
+        监听器必须立即返回（如只做入队），否则会阻塞传感器回调线程。
+        """
+        if listener not in self._frame_listeners:
+            self._frame_listeners = self._frame_listeners + (listener,)
+
+    def remove_frame_listener(self, listener: Callable[[CameraFrame], None]) -> None:
+        self._frame_listeners = tuple(l for l in self._frame_listeners if l != listener)
+
+    def enable_camera_bundles(self,
+                              timeout: float = CAMERA_BUNDLE_TIMEOUT,
+                              partial_policy: str = CAMERA_BUNDLE_PARTIAL_POLICY) -> CameraBundleSynchronizer:
+        """启用按仿真帧对齐的多摄像头 bundle，结果通过 camera_bundle_ready 发出
+
+        bundle 中的图像是 CARLA 原始缓冲区的视图（不占用帧缓冲池），缓冲区由各帧的 source 保持存活，
+        消费者持有 bundle 期间视图始终有效，无需归还。
+        """
+        self.bundle_synchronizer = CameraBundleSynchronizer(self.bundle_camera_names, timeout, partial_policy)
+        self.bundle_synchronizer.bundle_ready.connect(self.camera_bundle_ready)
+        if self.sensors:
+            # 仿真运行中启用（如开始录制时），否则由 attach_sensors() 启动
+            self.bundle_synchronizer.start_expiry_checks()
+        return self.bundle_synchronizer
+
+    def disable_camera_bundles(self) -> None:
+        if self.bundle_synchronizer is not None:
+            self.bundle_synchronizer.stop_expiry_checks()
+            self.bundle_synchronizer.bundle_ready.disconnect()
+            self.bundle_synchronizer = None
+
+    def setup_cameras(self, vehicle: carla.Vehicle, world: carla.World,
+                      rig: Optional[Sequence[SensorSpec]] = None,
+                      blueprint_library: Optional[carla.BlueprintLibrary] = None):
+        """按 rig 描述生成传感器并挂载到车辆上
+
+        Args:
+            vehicle: 挂载目标车辆
+            world: CARLA 世界
+            rig: 传感器描述列表，None 表示使用构造时指定的 rig
+            blueprint_library: 已获取的蓝图库（如 MetadataCache 中缓存的），None 表示向服务器获取
+        """
+        if blueprint_library is None:
+            blueprint_library = world.get_blueprint_library()
+        blueprints = self.prepare_rig(blueprint_library, rig)
+
+        # 每个传感器一次 RPC；批量生成见 carla_bike_sim.carla.actor_batch
+        sensors = [world.spawn_actor(bp, spec.transform(), attach_to=vehicle) for spec, bp in blueprints]
+        self.attach_sensors([spec for spec, _ in blueprints], sensors)
+
+    def prepare_rig(self, blueprint_library: carla.BlueprintLibrary,
+                    rig: Optional[Sequence[SensorSpec]] = None) -> List[Tuple[SensorSpec, carla.ActorBlueprint]]:
+        """切换 rig（None 表示保持当前 rig），返回按 rig 顺序、已设置属性的传感器蓝图"""
+        if rig is not None:
+            self.rig = tuple(rig)
+            self._decoders = {spec.name: self._decoder_for(spec) for spec in self.rig}
+
+        blueprints = []
+        for spec in self.rig:
+            bp = blueprint_library.find(spec.blueprint)
+            for key, value in spec.blueprint_attributes().items():
+                if bp.has_attribute(key):
+                    bp.set_attribute(key, value)
+            blueprints.append((spec, bp))
+        return blueprints
+
+    def attach_sensors(self, specs: Sequence[SensorSpec], sensors: Sequence[carla.Sensor]):
+        """接管已生成的传感器（与 specs 一一对应）并开始监听"""
+        generation = self._callback_gate.open()
+        self.frame_mailbox.open()
+        if self.bundle_synchronizer is not None:
+            self.bundle_synchronizer.camera_names = self.bundle_camera_names
+            self.bundle_synchronizer.reset()
+            self.bundle_synchronizer.start_expiry_checks()
+
+        for spec, sensor in zip(specs, sensors):
+            self.sensors[spec.name] = sensor
+            if self.sensor_streams.supports(spec.blueprint):
+                self.sensor_streams.add_stream(spec.name, spec.blueprint)
+                sensor.listen(self._callback_gate.wrap(generation, self.measurement_callback, spec.name))
+            else:
+                sensor.listen(self._callback_gate.wrap(generation, self.camera_callback, spec.name))
+        self.sensor_streams.start_notifications()
+
     def destroy_cameras(self):
-        """安全地销毁所有摄像头"""
-        # 设置标志位，防止新的回调执行
-        self._destroying = True
-        
-        # 定义所有摄像头及其名称
-        cameras = [
-            ('front', 'front_camera'),
-            ('rear', 'rear_camera'),
-            ('left', 'left_camera'),
-            ('right', 'right_camera')
-        ]
-        
-        # 先停止所有摄像头，防止新回调
-        for name, attr_name in cameras:
-            camera = getattr(self, attr_name)
-            if camera is not None:
-                try:
-                    camera.stop()
-                except Exception as e:
-                    print(f"Error stopping {name} camera: {e}")
-        
-        # 等待一小段时间，让正在执行的回调完成
-        import time
-        time.sleep(0.1)
-        
-        # 然后销毁所有摄像头
-        for name, attr_name in cameras:
-            camera = getattr(self, attr_name)
-            if camera is not None:
-                try:
-                    camera.destroy()
-                except Exception as e:
-                    print(f"Error destroying {name} camera: {e}")
-                finally:
-                    setattr(self, attr_name, None)
-        
-        # 重置标志位
-        self._destroying = False
-    
-    def camera_callback(self, image: carla.Image, camera_position: str):
-        """摄像头回调函数 - 在 CARLA 后台线程中执行"""
-        # 如果正在销毁，直接返回，避免访问已销毁的对象
-        if self._destroying:
-            return
-        
+        """安全地销毁所有摄像头（每个传感器一次 RPC）"""
+        for name, sensor in self.detach_sensors().items():
+            try:
+                sensor.destroy()
+            except Exception as e:
+                print(f"Error destroying {name} camera: {e}")
+
+    def detach_sensors(self) -> Dict[str, carla.Sensor]:
+        """停止所有传感器并等待进行中的回调结束，返回尚未销毁的传感器，由调用方（批量）销毁"""
+        # 先关闭会话: 此后进入的回调（包括 stop() 之后迟到的）直接被拒绝
+        self._callback_gate.close()
+
+        for name, sensor in self.sensors.items():
+            try:
+                sensor.stop()
+            except Exception as e:
+                print(f"Error stopping {name} camera: {e}")
+
+        # 只等待已经进入的回调执行完，空闲时立即返回
+        if not self._callback_gate.drain(SENSOR_CALLBACK_DRAIN_TIMEOUT):
+            print(f"Warning: {self._callback_gate.in_flight} sensor callback(s) still running "
+                  f"after {SENSOR_CALLBACK_DRAIN_TIMEOUT:.1f} s")
+
+        sensors = dict(self.sensors)
+        self.sensors.clear()
+
+        self.sensor_streams.stop_notifications()
+
+        # 丢弃尚未显示的帧，避免下次启动时显示旧画面
+        self.frame_mailbox.close()
+        if self.bundle_synchronizer is not None:
+            self.bundle_synchronizer.stop_expiry_checks()
+            self.bundle_synchronizer.flush()
+        return sensors
+
+    def get_callback_stats(self) -> Dict[str, float]:
+        """返回传感器回调的会话代数、进行中/被拒绝的回调数量和最近一次 drain 耗时"""
+        return self._callback_gate.get_stats()
+
+    def camera_callback(self, image: carla.SensorData, camera_position: str):
+        """摄像头/激光雷达回调函数 - 在 CARLA 后台线程中执行
+
+        激光雷达帧的 image 是俯视栅格图，data 是 (N, 4) float32 点云（原始缓冲区的零拷贝视图，
+        由 frame.source 保持有效；进入帧缓冲池的帧会拷贝点云）。
+        已结束会话的回调由 attach_sensors() 中的 SensorCallbackGate 拦截，不会进入这里。
+        """
+        received_at = time.perf_counter()
         try:
-            bgr_image = carla_image_to_bgr(image)
-            
-            # 再次检查，防止在图像处理过程中开始销毁
-            if self._destroying:
-                return
+            decoder = self._decoders.get(camera_position)
+            if decoder is not None:
+                bgr_image, data = decoder(image)
+            else:
+                bgr_image, data = self._convert_image(image), None
+            raw_frame = CameraFrame(
+                name=camera_position,
+                image=bgr_image,
+                frame_id=image.frame,
+                timestamp=image.timestamp,
+                received_at=received_at,
+                converted_at=time.perf_counter(),
+                data=data,
+                source=image,
+            )
 
-            if camera_position == 'front':
-                self.front_camera_image_ready.emit(bgr_image)
-            elif camera_position == 'rear':
-                self.rear_camera_image_ready.emit(bgr_image)
-            elif camera_position == 'left':
-                self.left_camera_image_ready.emit(bgr_image)
-            elif camera_position == 'right':
-                self.right_camera_image_ready.emit(bgr_image)
+            synchronizer = self.bundle_synchronizer
+            if synchronizer is not None:
+                synchronizer.add(raw_frame)
+
+            for listener in self._frame_listeners:
+                listener(raw_frame)
+
+            if self.delivery_mode == 'mailbox':
+                if self.use_frame_pool:
+                    # 缓冲池帧不持有 source，图像和测量数据都必须离开 CARLA 缓冲区；
+                    # 解码得到的图像（语义分割、深度、激光雷达俯视图）已是新分配的数组，直接移交而不再拷贝
+                    # （release_frame() 会忽略不属于缓冲池的数组）
+                    pooled_image = bgr_image
+                    if borrows_raw_data(bgr_image):
+                        pooled_image = self._copy_to_pool(camera_position, bgr_image)
+                    raw_frame = CameraFrame(
+                        camera_position,
+                        pooled_image,
+                        raw_frame.frame_id,
+                        raw_frame.timestamp,
+                        raw_frame.received_at,
+                        raw_frame.converted_at,
+                        data=self._detach_data(data),
+                    )
+                self.frame_mailbox.put(raw_frame)
+            else:
+                # 队列连接的槽在回调返回之后才执行，裸数组无法持有 source: 引用 raw_data 的图像先拷贝
+                if borrows_raw_data(bgr_image):
+                    bgr_image = bgr_image.copy()
+                self.camera_image_ready.emit(camera_position, bgr_image)
+                named_signal = self._named_signals.get(camera_position)
+                if named_signal is not None:
+                    named_signal.emit(bgr_image)
+        except Exception as e:
+            print(f"Error in camera callback ({camera_position}): {e}")
+
+    def measurement_callback(self, data: carla.SensorData, sensor_name: str):
+        """IMU / GNSS / 碰撞传感器回调 - 在 CARLA 后台线程中执行，只写入环形缓冲区"""
+        try:
+            self.sensor_streams.record(sensor_name, data)
         except Exception as e:
-            # 忽略销毁过程中的错误
-            if not self._destroying:
-                print(f"Error in camera callback ({camera_position}): {e}")
\ No newline at end of file
+            print(f"Error in measurement callback ({sensor_name}): {e}")
+
+    def _decoder_for(self, spec: SensorSpec) -> Optional[Callable]:
+        """返回语义分割/深度摄像头、激光雷达的解码函数 (data -> (显示图像, 测量数据))，RGB 摄像头返回 None"""
+        if spec.is_lidar:
+            # 每个激光雷达一个栅格化器（内部缓冲区不能跨线程共享）
+            rasterizer = LidarRasterizer()
+
+            def decoder(measurement):
+                points = lidar_points(measurement)
+                return rasterizer.render(points), points
+        else:
+            decoder = {
+                'sensor.camera.semantic_segmentation': decode_semantic_segmentation,
+                'sensor.camera.depth': decode_depth,
+            }.get(spec.blueprint)
+        if decoder is None or self.image_format == 'bgra':
+            return decoder
+
+        def decode_to_bgr(image):
+            display, data = decoder(image)
+            return display[:, :, :3], data
+        return decode_to_bgr
+
+    @staticmethod
+    def _detach_data(data: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """测量数据是 CARLA 原始缓冲区的视图（语义标签、激光雷达点云）时拷贝到自有内存，
+        已经是新分配的数组（深度）时原样返回"""
+        if data is None or data.flags.owndata:
+            return data
+        return data.copy()
+
+    def _copy_to_pool(self, camera_position: str, image: np.ndarray) -> np.ndarray:
+        """将图像拷贝到该摄像头的预分配缓冲区，形状变化时重建缓冲池"""
+        pool = self._frame_pools.get(camera_position)
+        if pool is None or not pool.matches(image.shape, image.dtype):
+            with self._frame_pools_lock:
+                pool = self._frame_pools.get(camera_position)
+                if pool is None or not pool.matches(image.shape, image.dtype):
+                    pool = FrameBufferPool(image.shape, image.dtype, self.frame_pool_size)
+                    self._frame_pools[camera_position] = pool
+
+        buffer = pool.acquire()
+        np.copyto(buffer, image)
+        return buffer
+
+    def release_frame(self, frame: CameraFrame) -> None:
+        """归还帧缓冲区（未启用缓冲池时为空操作，可安全调用）"""
+        if not self.use_frame_pool:
+            return
+        pool = self._frame_pools.get(frame.name)
+        if pool is not None:
+            pool.release(frame.image)
+
+    def get_frame_pool_stats(self) -> Dict[str, Dict[str, float]]:
+        """返回每个摄像头缓冲池的命中/未命中统计"""
+        with self._frame_pools_lock:
+            pools = dict(self._frame_pools)
+        return {name: pool.get_stats() for name, pool in pools.items()}
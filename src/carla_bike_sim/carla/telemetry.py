@@ -0,0 +1,178 @@
+"""
+基于 WorldSnapshot 的车辆遥测
+
+GUI 定时器逐字段查询车辆状态（get_velocity / get_transform / get_control）时，查询在 GUI 线程中执行，
+服务器或网络变慢会直接卡住界面。VehicleTelemetryService 改为通过 world.on_tick 注册回调，
+在 CARLA 客户端的后台线程中每个仿真步从 WorldSnapshot 读取一次车辆的全部状态，
+组装成不可变的 VehicleTelemetry 记录并原子替换最新记录；GUI 只读取最新记录，不发起任何查询。
+
+统计:
+    ticks_per_s    每秒收到的快照数（即遥测更新频率）
+    rpc_per_s      遥测路径每秒发起的 RPC 数: 只有 on_tick / remove_on_tick 的注册与注销，
+                   快照和车辆控制状态都来自客户端已接收的 episode 状态
+    staleness_ms   最近一次读取时最新记录的年龄（墙钟），服务器停顿或同步模式暂停步进时持续增长
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import carla
+
+
+@dataclass(slots=True, frozen=True)
+class VehicleTelemetry:
+    """一个仿真步的车辆状态
+
+    Attributes:
+        frame_id: CARLA 仿真帧号
+        timestamp: CARLA 仿真时间戳，单位秒
+        captured_at: 收到快照时的 time.perf_counter()
+        speed: 速度大小 (m/s)
+        location: 位置 (x, y, z)，单位米
+        rotation: 姿态 (pitch, yaw, roll)，单位度
+        throttle, brake, steer, gear: 车辆当前的控制状态
+    """
+    frame_id: int
+    timestamp: float
+    captured_at: float
+    speed: float
+    location: tuple
+    rotation: tuple
+    throttle: float
+    brake: float
+    steer: float
+    gear: int
+
+    @property
+    def age_ms(self) -> float:
+        return (time.perf_counter() - self.captured_at) * 1000.0
+
+    def as_sample(self) -> dict:
+        """转为 SessionLog.log_telemetry() 使用的字段"""
+        x, y, z = self.location
+        pitch, yaw, roll = self.rotation
+        return {
+            'velocity': self.speed,
+            'position_x': x, 'position_y': y, 'position_z': z,
+            'rotation_pitch': pitch, 'rotation_yaw': yaw, 'rotation_roll': roll,
+            'throttle': self.throttle, 'brake': self.brake, 'steer': self.steer, 'gear': self.gear,
+        }
+
+
+class VehicleTelemetryService:
+    """每个仿真步从 WorldSnapshot 采集一次车辆状态，供 GUI 无阻塞地读取最新记录
+
+    start() / stop() 在控制线程中调用；快照回调在 CARLA 客户端的后台线程中执行。
+    latest() 可在任意线程调用，只读取一个引用，不加锁也不发起查询。
+    """
+
+    def __init__(self):
+        self._world: Optional[carla.World] = None
+        self._vehicle: Optional[carla.Vehicle] = None
+        self._vehicle_id: Optional[int] = None
+        self._callback_id: Optional[int] = None
+        self._latest: Optional[VehicleTelemetry] = None
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def is_active(self) -> bool:
+        return self._callback_id is not None
+
+    def start(self, world: carla.World, vehicle: carla.Vehicle) -> None:
+        """注册 world.on_tick 回调，开始采集 vehicle 的状态"""
+        self.stop()
+        self._reset_stats()
+        self._world = world
+        self._vehicle = vehicle
+        self._vehicle_id = vehicle.id
+        self._callback_id = world.on_tick(self._on_world_tick)
+        self._count_rpc()
+
+    def stop(self) -> None:
+        """注销回调并清空最新记录"""
+        if self._callback_id is not None:
+            try:
+                self._world.remove_on_tick(self._callback_id)
+                self._count_rpc()
+            except Exception as e:
+                print(f"Error removing telemetry callback: {e}")
+        self._callback_id = None
+        self._world = None
+        self._vehicle = None
+        self._vehicle_id = None
+        self._latest = None
+
+    def latest(self) -> Optional[VehicleTelemetry]:
+        """最新的车辆状态，尚未收到快照时为 None"""
+        record = self._latest
+        if record is not None:
+            staleness_ms = record.age_ms
+            with self._stats_lock:
+                self._reads += 1
+                self._staleness_ms = staleness_ms
+                self._max_staleness_ms = max(self._max_staleness_ms, staleness_ms)
+        return record
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回快照数、RPC 数（总数和每秒）以及最近 / 最大的读取陈旧度"""
+        with self._stats_lock:
+            elapsed = time.perf_counter() - self._started_at
+            return {
+                'ticks': self._ticks,
+                'ticks_per_s': self._ticks / elapsed if elapsed > 0 else 0.0,
+                'rpc_calls': self._rpc_calls,
+                'rpc_per_s': self._rpc_calls / elapsed if elapsed > 0 else 0.0,
+                'reads': self._reads,
+                'staleness_ms': self._staleness_ms,
+                'max_staleness_ms': self._max_staleness_ms,
+            }
+
+    def _on_world_tick(self, snapshot: carla.WorldSnapshot) -> None:
+        """CARLA 客户端后台线程: 每个仿真步组装一条记录"""
+        captured_at = time.perf_counter()
+        vehicle = self._vehicle
+        actor = snapshot.find(self._vehicle_id) if vehicle is not None else None
+        if actor is None:
+            return
+        try:
+            transform = actor.get_transform()
+            velocity = actor.get_velocity()
+            # 与快照相同，读取客户端缓存的 episode 状态
+            control = vehicle.get_control()
+        except Exception as e:
+            print(f"Error capturing vehicle telemetry: {e}")
+            return
+
+        location = transform.location
+        rotation = transform.rotation
+        self._latest = VehicleTelemetry(
+            frame_id=snapshot.frame,
+            timestamp=snapshot.timestamp.elapsed_seconds,
+            captured_at=captured_at,
+            speed=math.sqrt(velocity.x ** 2 + velocity.y ** 2 + velocity.z ** 2),
+            location=(location.x, location.y, location.z),
+            rotation=(rotation.pitch, rotation.yaw, rotation.roll),
+            throttle=control.throttle,
+            brake=control.brake,
+            steer=control.steer,
+            gear=control.gear,
+        )
+        with self._stats_lock:
+            self._ticks += 1
+
+    def _count_rpc(self) -> None:
+        with self._stats_lock:
+            self._rpc_calls += 1
+
+    def _reset_stats(self) -> None:
+        with self._stats_lock:
+            self._started_at = time.perf_counter()
+            self._ticks = 0
+            self._rpc_calls = 0
+            self._reads = 0
+            self._staleness_ms = 0.0
+            self._max_staleness_ms = 0.0
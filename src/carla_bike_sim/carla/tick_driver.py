@@ -0,0 +1,120 @@
+import time
+from typing import Callable, Optional
+
+import carla
+from PySide6.QtCore import QThread, Signal
+
+from carla_bike_sim.config import SYNC_TICK_MAX_BACKOFF, SYNC_TICK_MAX_FAILURES
+
+
+class SimulationTickThread(QThread):
+    """同步模式下驱动 CARLA 仿真步进的专用线程
+
+    每个循环依次执行: before_tick()（如下发待处理的控制指令）-> world.tick()。
+    realtime=True 时按 fixed_delta_seconds 对齐墙钟节奏（稳定的实时骑行）；
+    realtime=False 时尽可能快地步进（超实时批量仿真）。
+    world.tick() 失败时按指数退避重试（每次失败发出一次 tick_error），
+    连续失败 max_failures 次后认为服务器已不可用，线程自行退出。
+
+    Signals:
+        real_time_factor_updated(float): 每个统计窗口结束时发出实际实时因子
+            （仿真时间 / 墙钟时间，1.0 表示实时）
+        tick_error(str): world.tick() 失败时发出（退避期间不会重复发出）
+    """
+
+    real_time_factor_updated = Signal(float)
+    tick_error = Signal(str)
+
+    def __init__(self,
+                 world: carla.World,
+                 fixed_delta_seconds: float,
+                 realtime: bool = True,
+                 before_tick: Optional[Callable[[], None]] = None,
+                 report_interval: float = 1.0,
+                 max_failures: int = SYNC_TICK_MAX_FAILURES,
+                 max_backoff: float = SYNC_TICK_MAX_BACKOFF):
+        super().__init__()
+        self.world = world
+        self.fixed_delta_seconds = fixed_delta_seconds
+        self.realtime = realtime
+        self.before_tick = before_tick
+        self.report_interval = report_interval
+        self.max_failures = max_failures
+        self.max_backoff = max_backoff
+
+        self.running = False
+        self._tick_count = 0
+        self._real_time_factor = 0.0
+        self._started_at = 0.0
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick_count
+
+    @property
+    def real_time_factor(self) -> float:
+        """最近一个统计窗口的实时因子"""
+        return self._real_time_factor
+
+    @property
+    def average_real_time_factor(self) -> float:
+        """自线程启动以来的平均实时因子"""
+        elapsed = time.perf_counter() - self._started_at
+        if self._tick_count == 0 or elapsed <= 0:
+            return 0.0
+        return self._tick_count * self.fixed_delta_seconds / elapsed
+
+    def start(self, *args, **kwargs):
+        # 在调用线程中置位: 线程真正开始执行前调用的 stop() 不会被 run() 覆盖
+        self.running = True
+        super().start(*args, **kwargs)
+
+    def run(self):
+        self._started_at = time.perf_counter()
+        next_deadline = self._started_at
+        window_start = self._started_at
+        window_ticks = 0
+        failures = 0
+
+        while self.running:
+            try:
+                if self.before_tick is not None:
+                    self.before_tick()
+                self.world.tick()
+            except Exception as e:
+                if not self.running:
+                    break
+                failures += 1
+                if failures >= self.max_failures:
+                    self.tick_error.emit(
+                        f"Simulation tick failed {failures} times in a row, stopping: {str(e)}")
+                    self.running = False
+                    break
+                self.tick_error.emit(f"Simulation tick failed: {str(e)}")
+                time.sleep(min(self.fixed_delta_seconds * (2 ** (failures - 1)), self.max_backoff))
+                # 恢复后不追赶退避期间落下的步数
+                next_deadline = time.perf_counter()
+                continue
+
+            failures = 0
+            self._tick_count += 1
+            window_ticks += 1
+            now = time.perf_counter()
+
+            if now - window_start >= self.report_interval:
+                self._real_time_factor = window_ticks * self.fixed_delta_seconds / (now - window_start)
+                self.real_time_factor_updated.emit(self._real_time_factor)
+                window_start = now
+                window_ticks = 0
+
+            if self.realtime:
+                next_deadline += self.fixed_delta_seconds
+                delay = next_deadline - now
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -self.fixed_delta_seconds:
+                    # 落后超过一个步长时不追帧，直接以当前时间为新基准
+                    next_deadline = now
+
+    def stop(self):
+        self.running = False
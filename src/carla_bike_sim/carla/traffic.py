@@ -0,0 +1,218 @@
+"""
+NPC 交通参与者（车辆、行人）的批量生成与清理
+
+数百个 NPC 逐个 spawn_actor / set_autopilot / destroy 需要上千次 RPC 往返。TrafficPopulation
+用 carla.command 批量命令，往返次数与 NPC 数量无关:
+
+    车辆: 1. 所有车辆的 SpawnActor(...).then(SetAutopilot(FutureActor, True, TM 端口))
+    行人: 1. 所有行人的 SpawnActor
+          2. 每个行人一个 AI 控制器的 SpawnActor(controller.ai.walker, parent_id=行人 ID)
+          3. 等待一个仿真步后 world.get_actors(控制器) 并启动（导航在客户端执行）
+    清理: 停止行人控制器后 1 个批次 DestroyActor
+
+车辆出生点来自 MetadataCache 缓存的地图出生点（排除自车的出生点），行人位置从导航网格随机选取。
+相同的 seed 得到相同的车辆位置、蓝图和 Traffic Manager / 行人随机序列。
+"""
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+import carla
+
+from carla_bike_sim.carla import actor_batch
+from carla_bike_sim.config import (
+    TRAFFIC_MANAGER_PORT,
+    TRAFFIC_SEED,
+    TRAFFIC_VEHICLE_DENSITY,
+    TRAFFIC_WALKER_DENSITY,
+)
+
+SetAutopilot = carla.command.SetAutopilot
+
+
+class TrafficPopulation:
+    """一组由 Traffic Manager 驾驶的 NPC 车辆和由 AI 控制器驱动的行人
+
+    spawn() / destroy() 在控制线程中调用（可能阻塞数秒），get_stats() 返回最近一次的生成吞吐量和清理耗时。
+    """
+
+    def __init__(self, client: carla.Client, world: carla.World,
+                 traffic_manager_port: int = TRAFFIC_MANAGER_PORT,
+                 seed: Optional[int] = TRAFFIC_SEED):
+        self.client = client
+        self.world = world
+        self.traffic_manager_port = traffic_manager_port
+        self.seed = seed
+
+        self.vehicle_ids: List[int] = []
+        self.walker_ids: List[int] = []
+        self.controllers: List[carla.WalkerAIController] = []
+        self._traffic_manager: Optional[carla.TrafficManager] = None
+        self._stats: Dict[str, float] = {}
+
+    @property
+    def actor_count(self) -> int:
+        return len(self.vehicle_ids) + len(self.walker_ids) + len(self.controllers)
+
+    def spawn(self, blueprint_library: carla.BlueprintLibrary,
+              spawn_points: Sequence[carla.Transform],
+              vehicle_density: float = TRAFFIC_VEHICLE_DENSITY,
+              walker_density: float = TRAFFIC_WALKER_DENSITY,
+              synchronous: bool = False) -> Dict[str, float]:
+        """生成 NPC 车辆和行人
+
+        Args:
+            blueprint_library: 蓝图库（如 MetadataCache 中缓存的）
+            spawn_points: 可供 NPC 车辆使用的出生点（不含自车的出生点）
+            vehicle_density: 占用 spawn_points 的比例 (0 - 1)
+            walker_density: 行人数量 = len(spawn_points) * walker_density
+            synchronous: 世界是否处于同步模式（Traffic Manager 需同步步进，行人控制器需等待一个 tick）
+
+        Returns:
+            dict: 见 get_stats()
+        """
+        rng = random.Random(self.seed)
+        vehicle_count = min(len(spawn_points), round(len(spawn_points) * max(0.0, vehicle_density)))
+        walker_count = round(len(spawn_points) * max(0.0, walker_density))
+
+        start = time.perf_counter()
+        round_trips = 0
+        failed = 0
+        if vehicle_count:
+            round_trips += 1
+            failed += self._spawn_vehicles(blueprint_library, rng.sample(list(spawn_points), vehicle_count),
+                                           rng, synchronous)
+        if walker_count:
+            round_trips += 3
+            failed += self._spawn_walkers(blueprint_library, walker_count, rng, synchronous)
+        elapsed = time.perf_counter() - start
+
+        self._stats = {
+            'vehicles': len(self.vehicle_ids),
+            'walkers': len(self.walker_ids),
+            'failed': failed,
+            'spawn_ms': elapsed * 1000.0,
+            'spawn_round_trips': round_trips,
+            'actors_per_s': self.actor_count / elapsed if elapsed > 0 else 0.0,
+        }
+        return self.get_stats()
+
+    def destroy(self) -> float:
+        """停止行人控制器并用一个批次销毁所有 NPC
+
+        Returns:
+            float: 清理耗时（毫秒）
+        """
+        start = time.perf_counter()
+        for controller in self.controllers:
+            try:
+                controller.stop()
+            except Exception as e:
+                print(f"Error stopping walker controller {controller.id}: {e}")
+        actor_ids = [controller.id for controller in self.controllers] + self.walker_ids + self.vehicle_ids
+        try:
+            actor_batch.destroy_actor_ids(self.client, actor_ids)
+        except Exception as e:
+            print(f"Error destroying traffic: {e}")
+        self.controllers = []
+        self.walker_ids = []
+        self.vehicle_ids = []
+
+        destroy_ms = (time.perf_counter() - start) * 1000.0
+        if actor_ids:
+            self._stats.update(destroyed=len(actor_ids), destroy_ms=destroy_ms, destroy_round_trips=1)
+        return destroy_ms
+
+    def set_synchronous_mode(self, enabled: bool) -> None:
+        """同步模式下 Traffic Manager 必须与客户端一起步进，恢复异步模式前需先关闭"""
+        if self._traffic_manager is not None:
+            self._traffic_manager.set_synchronous_mode(enabled)
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回最近一次生成的数量、失败数、耗时、往返次数和吞吐量 (actors/s)，以及清理耗时"""
+        return dict(self._stats)
+
+    def _get_traffic_manager(self, synchronous: bool) -> carla.TrafficManager:
+        if self._traffic_manager is None:
+            self._traffic_manager = self.client.get_trafficmanager(self.traffic_manager_port)
+            if self.seed is not None:
+                self._traffic_manager.set_random_device_seed(self.seed)
+        self._traffic_manager.set_synchronous_mode(synchronous)
+        return self._traffic_manager
+
+    def _spawn_vehicles(self, blueprint_library: carla.BlueprintLibrary,
+                        spawn_points: Sequence[carla.Transform],
+                        rng: random.Random, synchronous: bool) -> int:
+        """一个批次生成车辆并交给 Traffic Manager，返回失败数量"""
+        traffic_manager = self._get_traffic_manager(synchronous)
+        port = traffic_manager.get_port()
+        # 只用四轮车辆，自行车、摩托车在 Traffic Manager 下容易出事故
+        blueprints = [bp for bp in blueprint_library.filter('vehicle.*')
+                      if int(bp.get_attribute('number_of_wheels')) == 4]
+
+        commands = []
+        for transform in spawn_points:
+            bp = rng.choice(blueprints)
+            if bp.has_attribute('color'):
+                bp.set_attribute('color', rng.choice(bp.get_attribute('color').recommended_values))
+            bp.set_attribute('role_name', 'autopilot')
+            commands.append(actor_batch.SpawnActor(bp, transform)
+                            .then(SetAutopilot(actor_batch.FutureActor, True, port)))
+
+        actor_ids, errors = actor_batch.spawn_batch(self.client, commands)
+        self.vehicle_ids.extend(actor_id for actor_id in actor_ids if actor_id is not None)
+        return len(errors)
+
+    def _spawn_walkers(self, blueprint_library: carla.BlueprintLibrary, count: int,
+                       rng: random.Random, synchronous: bool) -> int:
+        """生成行人及其 AI 控制器并开始随机行走，返回失败数量"""
+        if self.seed is not None:
+            self.world.set_pedestrians_seed(self.seed)
+        blueprints = list(blueprint_library.filter('walker.pedestrian.*'))
+
+        commands = []
+        speeds = []
+        for _ in range(count):
+            # 导航网格在客户端，随机位置不需要 RPC
+            location = self.world.get_random_location_from_navigation()
+            if location is None:
+                continue
+            bp = rng.choice(blueprints)
+            if bp.has_attribute('is_invincible'):
+                bp.set_attribute('is_invincible', 'false')
+            # recommended_values: [静止, 步行, 跑步]
+            speeds.append(float(bp.get_attribute('speed').recommended_values[1])
+                          if bp.has_attribute('speed') else 1.4)
+            commands.append(actor_batch.SpawnActor(bp, carla.Transform(location)))
+        walker_ids, errors = actor_batch.spawn_batch(self.client, commands)
+        failed = count - len(commands) + len(errors)
+        walkers = [(walker_id, speed) for walker_id, speed in zip(walker_ids, speeds) if walker_id is not None]
+
+        controller_bp = blueprint_library.find('controller.ai.walker')
+        controller_ids, errors = actor_batch.spawn_batch(
+            self.client, [actor_batch.SpawnActor(controller_bp, carla.Transform(), walker_id)
+                          for walker_id, _ in walkers]
+        )
+        failed += len(errors)
+        # 没有控制器的行人会一直站着，直接销毁
+        actor_batch.destroy_actor_ids(self.client, [
+            walker_id for (walker_id, _), controller_id in zip(walkers, controller_ids) if controller_id is None
+        ])
+        walkers = [(walker_id, controller_id, speed)
+                   for (walker_id, speed), controller_id in zip(walkers, controller_ids) if controller_id is not None]
+        self.walker_ids.extend(walker_id for walker_id, _, _ in walkers)
+
+        # 控制器要在服务器生成之后的下一个仿真步才能启动
+        if synchronous:
+            self.world.tick()
+        else:
+            self.world.wait_for_tick()
+
+        controllers = {actor.id: actor for actor in self.world.get_actors([c for _, c, _ in walkers])}
+        for _, controller_id, speed in walkers:
+            controller = controllers[controller_id]
+            controller.start()
+            controller.go_to_location(self.world.get_random_location_from_navigation())
+            controller.set_max_speed(speed)
+            self.controllers.append(controller)
+        return failed
@@ -6,4 +6,157 @@ def carla_image_to_bgr(image: carla.Image) -> np.ndarray:
     img_array = np.frombuffer(image.raw_data, dtype=np.uint8)
     img_array = img_array.reshape((image.height, image.width, 4))
     img_bgr = img_array[:, :, :3]
-    return img_bgr
\ No newline at end of file
+    return img_bgr
+
+
+def borrows_raw_data(array: np.ndarray) -> bool:
+    """数组是否（经由视图）引用传感器数据的 raw_data 缓冲区
+
+    raw_data 是不持有底层缓冲区的 memoryview，回调返回后缓冲区随 carla.SensorData 释放并被复用；
+    这样的数组要在回调之外使用，必须同时持有 SensorData（见 CameraFrame.source）或先拷贝。
+    """
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview)
+
+
+def carla_image_to_bgra(image: carla.Image) -> np.ndarray:
+    """将 CARLA 图像包装为 BGRA 格式的 numpy 数组
+
+    零拷贝：返回的数组直接引用 image.raw_data 缓冲区（只读、C 连续），
+    可直接以 QImage.Format_RGB32 显示，无需去除 alpha 通道；只在 image 存活期间有效。
+    """
+    img_array = np.frombuffer(image.raw_data, dtype=np.uint8)
+    return img_array.reshape((image.height, image.width, 4))
+
+
+# CARLA 语义分割标签 (0.9.14+) 对应的 CityScapes 调色板 (R, G, B)，下标即标签值
+SEMANTIC_PALETTE = np.array([
+    (0, 0, 0),         # 0  Unlabeled
+    (128, 64, 128),    # 1  Roads
+    (244, 35, 232),    # 2  SideWalks
+    (70, 70, 70),      # 3  Building
+    (102, 102, 156),   # 4  Wall
+    (190, 153, 153),   # 5  Fence
+    (153, 153, 153),   # 6  Pole
+    (250, 170, 30),    # 7  TrafficLight
+    (220, 220, 0),     # 8  TrafficSign
+    (107, 142, 35),    # 9  Vegetation
+    (152, 251, 152),   # 10 Terrain
+    (70, 130, 180),    # 11 Sky
+    (220, 20, 60),     # 12 Pedestrian
+    (255, 0, 0),       # 13 Rider
+    (0, 0, 142),       # 14 Car
+    (0, 0, 70),        # 15 Truck
+    (0, 60, 100),      # 16 Bus
+    (0, 80, 100),      # 17 Train
+    (0, 0, 230),       # 18 Motorcycle
+    (119, 11, 32),     # 19 Bicycle
+    (110, 190, 160),   # 20 Static
+    (170, 120, 50),    # 21 Dynamic
+    (55, 90, 80),      # 22 Other
+    (45, 60, 150),     # 23 Water
+    (157, 234, 50),    # 24 RoadLine
+    (81, 0, 81),       # 25 Ground
+    (150, 100, 100),   # 26 Bridge
+    (230, 150, 140),   # 27 RailTrack
+    (180, 165, 180),   # 28 GuardRail
+], dtype=np.uint8)
+
+
+def _build_semantic_lut() -> np.ndarray:
+    """标签 -> BGRA 像素（按 uint32 存储，一次查表得到整个像素）"""
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    lut[:, 3] = 255
+    lut[:len(SEMANTIC_PALETTE), 0] = SEMANTIC_PALETTE[:, 2]
+    lut[:len(SEMANTIC_PALETTE), 1] = SEMANTIC_PALETTE[:, 1]
+    lut[:len(SEMANTIC_PALETTE), 2] = SEMANTIC_PALETTE[:, 0]
+    return lut.view('<u4').reshape(256)
+
+
+_SEMANTIC_LUT = _build_semantic_lut()
+
+# 24 位深度编码的最大值，对应 1000 米
+DEPTH_MAX_VALUE = (1 << 24) - 1
+DEPTH_METERS_PER_UNIT = np.float32(1000.0 / DEPTH_MAX_VALUE)
+
+
+def _build_depth_lut() -> np.ndarray:
+    """24 位深度的高 16 位 -> 对数灰度 BGRA 像素（近处亮、远处暗，与 CARLA LogarithmicDepth 相同）"""
+    normalized = (np.arange(1 << 16, dtype=np.float64) * 256 + 128) / DEPTH_MAX_VALUE
+    log_depth = np.clip(1.0 + np.log(normalized) / 5.70378, 0.0, 1.0)
+    gray = (255 - np.round(log_depth * 255)).astype(np.uint32)
+    return gray | (gray << 8) | (gray << 16) | np.uint32(0xFF000000)
+
+
+_DEPTH_LUT = _build_depth_lut()
+
+
+def semantic_tags(image: carla.Image) -> np.ndarray:
+    """语义分割图像的标签 (H, W) uint8，零拷贝（标签存放在 R 通道）"""
+    return carla_image_to_bgra(image)[:, :, 2]
+
+
+def semantic_tags_to_bgra(tags: np.ndarray) -> np.ndarray:
+    """按 CityScapes 调色板为标签上色，返回 (H, W, 4) BGRA"""
+    # np.take 比花式索引快约一倍
+    colored = np.take(_SEMANTIC_LUT, tags)
+    return colored.view(np.uint8).reshape(tags.shape[0], tags.shape[1], 4)
+
+
+def depth_units(image: carla.Image) -> np.ndarray:
+    """深度图像的 24 位整数深度 (H, W) uint32
+
+    CARLA 的编码为 R + G * 256 + B * 256^2；原始缓冲区是 BGRA，按大端 uint32 读取后
+    字节序为 B G R A（从高到低），右移 8 位即得到该值。读取和移位在同一次遍历中完成，
+    结果是新分配的数组，不引用 raw_data。
+    """
+    raw = np.frombuffer(image.raw_data, dtype='>u4').reshape((image.height, image.width))
+    return np.right_shift(raw, 8, dtype=np.uint32)
+
+
+def depth_units_to_meters(units: np.ndarray) -> np.ndarray:
+    """24 位整数深度 -> 米 (float32)，24 位整数在 float32 中可精确表示
+
+    解码时不做此转换：需要米的消费者对 CameraFrame.data 调用本函数即可。
+    """
+    return np.multiply(units, DEPTH_METERS_PER_UNIT, dtype=np.float32)
+
+
+def depth_to_bgra(image: carla.Image) -> np.ndarray:
+    """深度图像 -> 对数灰度 BGRA (H, W, 4)，用于显示
+
+    查表下标是 24 位深度的高 16 位 (G + B * 256)，即每个像素前两个字节按大端 uint16 读取，
+    直接在原始缓冲区的视图上查表，不需要任何算术运算。
+    """
+    high_bits = np.frombuffer(image.raw_data, dtype='>u2').reshape((image.height, image.width, 2))[:, :, 0]
+    colored = np.take(_DEPTH_LUT, high_bits)
+    return colored.view(np.uint8).reshape(image.height, image.width, 4)
+
+
+def decode_semantic_segmentation(image: carla.Image):
+    """解码语义分割图像
+
+    Returns:
+        (显示用 BGRA 图像, 标签 (H, W) uint8)
+    """
+    tags = semantic_tags(image)
+    return semantic_tags_to_bgra(tags), tags
+
+
+def decode_depth(image: carla.Image):
+    """解码深度图像
+
+    Returns:
+        (显示用 BGRA 图像, 24 位整数深度 (H, W) uint32)，用 depth_units_to_meters() 换算为米
+    """
+    return depth_to_bgra(image), depth_units(image)
+
+
+def lidar_points(measurement: carla.LidarMeasurement) -> np.ndarray:
+    """激光雷达点云 (N, 4) float32: x, y, z, intensity（传感器坐标系，米）
+
+    零拷贝：返回的数组直接引用 measurement.raw_data 缓冲区（只读）。
+    """
+    return np.frombuffer(measurement.raw_data, dtype=np.float32).reshape(-1, 4)
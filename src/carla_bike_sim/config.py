@@ -30,6 +30,20 @@ DEFAULT_MAP_NAME = None
 # 车辆控制参数
 DEFAULT_THROTTLE = 0.5  # 启动时的默认油门 (0.0 - 1.0)
 
+# 控制指令下发: 突发的指令合并为最新的一条，与上次发送的指令相同（在容差内）时不发送
+CONTROL_SEND_INTERVAL_MS = 20     # 异步模式下两次 apply_control 之间的最短间隔 (毫秒)，同步模式下每步最多一次
+CONTROL_CHANGE_TOLERANCE = 0.005  # 油门、刹车、转向的变化都不超过该值时视为未变化
+
+# 同步模式 (由专用 tick 线程以固定步长驱动仿真)
+SYNC_MODE_ENABLED = False
+SYNC_FIXED_DELTA_SECONDS = 0.05  # 每步仿真时间 (秒)，即 20 Hz
+SYNC_REALTIME = True             # True: 按墙钟节奏步进; False: 尽可能快 (超实时批量仿真)
+SYNC_TICK_MAX_FAILURES = 10      # world.tick() 连续失败该次数后停止 tick 线程 (服务器已断开)
+SYNC_TICK_MAX_BACKOFF = 2.0      # 连续失败时重试间隔从一个步长开始加倍，最长为该值 (秒)
+
+# 车辆和传感器用 client.apply_batch_sync 批量生成 / 销毁 (往返次数与传感器数量无关)
+ACTOR_BATCH_COMMANDS = True
+
 # 观察者摄像机位置偏移 (相对于车辆spawn点)
 SPECTATOR_OFFSET_X = 0.0
 SPECTATOR_OFFSET_Y = -5.0  # 车辆后方5米
@@ -48,6 +62,37 @@ CAMERA_IMAGE_HEIGHT = 600
 # 摄像头视野角度 (Field of View)
 CAMERA_FOV = 90
 
+# 左右广角摄像头视野角度
+SIDE_CAMERA_FOV = 160
+
+# 摄像头采集间隔 (仿真秒)，0 表示每个仿真帧都采集
+CAMERA_SENSOR_TICK = 0.0
+
+# 传感器输出的图像格式
+# 'bgra': 直接引用 CARLA 原始 4 通道缓冲区 (零拷贝，显示时按 Format_RGB32 解释)
+# 'bgr':  去除 alpha 通道的 3 通道视图 (显示前需要额外拷贝)
+CAMERA_IMAGE_FORMAT = 'bgra'
+
+# 传感器图像交付方式
+# 'mailbox': 每个摄像头只保留最新一帧，GUI 按固定节奏拉取 (GUI 卡顿时延迟有界)
+# 'signal':  每帧通过 Qt 队列信号发出 (信号无法持有 CARLA 缓冲区，每帧拷贝一次)
+CAMERA_DELIVERY_MODE = 'mailbox'
+
+# 是否将每帧拷贝到预分配的复用缓冲区 (仅 mailbox 模式)
+# 开启后 CARLA 图像在回调内即可释放，但 RGB 帧每帧多一次整帧拷贝；
+# 解码后的帧 (语义分割、深度、激光雷达) 本身已是新数组，直接移交不经过缓冲池
+CAMERA_USE_FRAME_POOL = False
+
+# 每个摄像头的缓冲区数量 (写入中 + 信箱中 + 显示中，至少 3)
+CAMERA_FRAME_POOL_SIZE = 4
+
+# 多摄像头 bundle (按仿真帧号对齐)
+CAMERA_BUNDLE_TIMEOUT = 0.5            # 等待同一帧其余摄像头的最长时间 (秒)
+CAMERA_BUNDLE_PARTIAL_POLICY = 'emit'  # 不完整 bundle 的处理方式: 'emit' 或 'drop'
+
+# 销毁传感器时等待进行中的回调结束的最长时间 (秒)，没有进行中的回调时立即返回
+SENSOR_CALLBACK_DRAIN_TIMEOUT = 2.0
+
 # 摄像头位置配置 (相对于车辆中心)
 # 格式: (x, y, z, yaw, pitch, roll)
 
@@ -84,6 +129,172 @@ RIGHT_CAMERA_PITCH = 0.0
 RIGHT_CAMERA_ROLL = 0.0
 
 
+# =============================================================================
+# 激光雷达配置
+# =============================================================================
+
+# 激光雷达安装位置 (相对于车辆中心)
+LIDAR_X = 0.0
+LIDAR_Y = 0.0
+LIDAR_Z = 2.4
+
+# 最大探测距离 (米)
+LIDAR_RANGE = 50.0
+
+# 激光线数
+LIDAR_CHANNELS = 32
+
+# 每秒点数，每次扫描约 LIDAR_POINTS_PER_SECOND * SYNC_FIXED_DELTA_SECONDS 个点
+LIDAR_POINTS_PER_SECOND = 2400000
+
+# 旋转频率 (Hz)，与仿真频率相同时每个仿真帧输出一整圈
+LIDAR_ROTATION_FREQUENCY = 20.0
+
+# 俯视栅格图边长（像素）
+LIDAR_BEV_SIZE_PX = 400
+
+# 俯视栅格图覆盖范围的一半（米），即激光雷达到图像边缘的距离
+LIDAR_BEV_RANGE_M = 40.0
+
+# 高度着色范围（米，相对激光雷达），超出范围的点按边界颜色显示
+LIDAR_BEV_Z_MIN = -2.5
+LIDAR_BEV_Z_MAX = 1.5
+
+
+# =============================================================================
+# IMU / GNSS / 碰撞传感器配置
+# =============================================================================
+
+# IMU、GNSS 安装位置 (相对于车辆中心)
+IMU_X = 0.0
+IMU_Y = 0.0
+IMU_Z = 1.0
+
+# 每个传感器环形缓冲区保留的样本数 (20 Hz 下约 200 秒)
+SENSOR_STREAM_CAPACITY = 4096
+
+# GUI 变更通知的最短间隔 (毫秒)
+SENSOR_STREAM_NOTIFY_INTERVAL_MS = 100
+
+
+# =============================================================================
+# 交通参与者 (NPC) 配置
+# =============================================================================
+
+# 启动仿真时是否生成 NPC 车辆和行人 (用 carla.command 批量生成，车辆由 Traffic Manager 驾驶)
+TRAFFIC_ENABLED = False
+
+# NPC 车辆占用地图出生点 (不含自车的出生点) 的比例 (0 - 1)
+TRAFFIC_VEHICLE_DENSITY = 0.5
+
+# 行人数量 = 地图出生点数 * 该值 (如 Town10HD 约 150 个出生点，1.0 即约 150 个行人)
+TRAFFIC_WALKER_DENSITY = 1.0
+
+# 车辆位置、蓝图和 Traffic Manager / 行人的随机种子，None 表示每次不同
+TRAFFIC_SEED = 42
+
+# Traffic Manager 端口 (同一台机器上的多个 CARLA 服务器需要不同端口)
+TRAFFIC_MANAGER_PORT = 8000
+
+
+# =============================================================================
+# 会话池配置 (多服务器并行数据采集)
+# =============================================================================
+
+# CARLA 服务器地址列表，每个服务器一个工作进程
+SESSION_POOL_SERVERS = [('localhost', 2000)]
+
+# 单个 episode 的墙钟超时 (秒)，包括加载地图和生成 actor
+SESSION_POOL_EPISODE_TIMEOUT = 600.0
+
+
+# =============================================================================
+# 录制配置
+# =============================================================================
+
+# 录制输出根目录 (每次录制在其下创建以时间命名的子目录)
+RECORDING_OUTPUT_DIR = 'recordings'
+
+# 视频布局: 'per_camera' 每个摄像头一个文件; 'mosaic' 拼接为一个网格视频
+RECORDING_LAYOUT = 'per_camera'
+
+# 视频编码 (FourCC)，如 'MJPG' 或 'XVID'
+RECORDING_CODEC = 'MJPG'
+
+# 写入视频文件的帧率
+RECORDING_FPS = 20.0
+
+# 待编码帧队列长度上限，超出时丢帧而不是阻塞传感器回调
+RECORDING_QUEUE_SIZE = 64
+
+# 原始会话日志的输出根目录（每次录制一个子目录）
+SESSION_LOG_OUTPUT_DIR = 'sessions'
+
+# 会话日志待写数据上限（字节），磁盘跟不上时超出部分丢弃并计数
+SESSION_LOG_MAX_PENDING_BYTES = 512 * 1024 * 1024
+
+# 会话回放的可选速度倍率
+SESSION_REPLAY_SPEEDS = (1.0, 2.0, 4.0, 8.0)
+
+
+# =============================================================================
+# 共享内存帧配置
+# =============================================================================
+
+# 是否在仿真运行时把摄像头帧发布到共享内存，供外部进程读取
+SHARED_FRAMES_ENABLED = False
+
+# 共享内存段名称前缀，每个摄像头一个段: "<prefix>_<camera>"
+SHARED_FRAMES_PREFIX = 'carla_bike_sim'
+
+# 每个摄像头的环形槽位数，零拷贝视图在之后 slot_count - 1 次写入内有效
+SHARED_FRAMES_SLOT_COUNT = 4
+
+
+# =============================================================================
+# 图像处理配置
+# =============================================================================
+
+# 缓存目录（如 remap 查找表）
+CACHE_DIR = '.cache'
+
+# remap 查找表的磁盘缓存目录
+REMAP_CACHE_DIR = f'{CACHE_DIR}/remap'
+
+# CARLA 元数据（地图列表、出生点）的磁盘缓存目录
+METADATA_CACHE_DIR = f'{CACHE_DIR}/metadata'
+
+# 是否校正广角摄像头后再显示
+RECTIFICATION_ENABLED = False
+
+# 需要校正的摄像头
+RECTIFICATION_CAMERAS = ('left', 'right')
+
+# 目标投影: 'cylindrical' / 'equirectangular' / 'pinhole'
+RECTIFICATION_PROJECTION = 'cylindrical'
+
+# 目标投影的水平 FOV（度），None 表示与源摄像头相同
+RECTIFICATION_OUTPUT_FOV = None
+
+# 是否合成鸟瞰图并作为额外的图块显示
+BEV_ENABLED = False
+
+# 鸟瞰图边长（像素）
+BEV_SIZE_PX = 400
+
+# 鸟瞰图覆盖范围的一半（米），即车辆到图像边缘的距离
+BEV_RANGE_M = 15.0
+
+# 地面在车辆坐标系中的高度（米）
+BEV_GROUND_Z = 0.0
+
+# 多摄像头重叠区域的融合方式: 'feather' 按权重平滑融合; 'nearest' 取最合适的单个摄像头
+BEV_BLEND = 'feather'
+
+# 鸟瞰图查找表的磁盘缓存目录
+BEV_CACHE_DIR = f'{CACHE_DIR}/bev'
+
+
 # =============================================================================
 # GUI 配置
 # =============================================================================
@@ -93,6 +304,24 @@ MAIN_WINDOW_TITLE = "CARLA Bicycle Simulator"
 MAIN_WINDOW_WIDTH = 1200
 MAIN_WINDOW_HEIGHT = 800
 
+# GUI 拉取最新摄像头帧的间隔 (毫秒)
+CAMERA_DISPLAY_INTERVAL_MS = 16
+
+# GUI 刷新车辆状态的间隔 (毫秒)，只读取遥测服务的最新记录，不查询服务器
+VEHICLE_STATUS_INTERVAL_MS = 50
+
+# 遥测记录超过该年龄 (毫秒) 时在状态面板中标记为陈旧
+TELEMETRY_STALE_MS = 500
+
+# 关闭窗口时等待进行中的连接 / 启动操作退出的最长时间 (秒)，超时后放弃该工作线程直接退出
+LIFECYCLE_CLOSE_TIMEOUT = 3.0
+
+# 摄像头帧缩放工作线程数 (cv2.resize 在 GUI 线程之外执行)
+FRAME_SCALER_WORKERS = 2
+
+# 延迟统计的滚动窗口长度（每个摄像头、每个阶段的样本数）
+LATENCY_WINDOW_SIZE = 300
+
 # 控制面板默认值
 CONTROL_PANEL_DEFAULT_HOST = DEFAULT_CARLA_HOST
 CONTROL_PANEL_DEFAULT_PORT = str(DEFAULT_CARLA_PORT)
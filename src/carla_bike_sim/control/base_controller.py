@@ -90,12 +90,13 @@ class BaseController(QObject, metaclass=QObjectMeta):
         发送控制信号（受保护方法）
 
         子类应调用此方法来发送控制信号更新，会自动进行数值限制。
+        control 直接作为当前控制信号并发出（不拷贝），调用后不应再修改它。
 
         Args:
             control (VehicleControlSignal): 要发送的控制信号
         """
         control.clamp()
-        self._current_control = control.copy()
+        self._current_control = control
         self.control_signal_updated.emit(control)
 
     def _emit_error(self, error_msg: str) -> None:
@@ -22,6 +22,8 @@ class GamepadPollingThread(QThread):
         self.trigger_deadzone = config.get('trigger_deadzone', 0.05)
         self.steer_sensitivity = config.get('steer_sensitivity', 1.0)
         self.poll_interval = config.get('poll_interval', 20) / 1000.0
+        self.change_tolerance = config.get('change_tolerance', 0.0)
+        self._last_emitted: Optional[VehicleControlSignal] = None
 
         self.axis_left_x = config.get('axis_left_x', 0)
         self.axis_left_y = config.get('axis_left_y', 1)
@@ -45,7 +47,11 @@ class GamepadPollingThread(QThread):
                 try:
                     pygame.event.pump()
                     control_signal = self._read_control_signal()
-                    self.control_updated.emit(control_signal)
+                    # 输入没有变化时不发信号
+                    if (self._last_emitted is None
+                            or not control_signal.is_close(self._last_emitted, self.change_tolerance)):
+                        self._last_emitted = control_signal
+                        self.control_updated.emit(control_signal)
                     time.sleep(self.poll_interval)
 
                 except Exception as e:
@@ -155,6 +161,7 @@ class GamepadController(BaseController):
         trigger_deadzone (float): 扳机死区，默认 0.05
         steer_sensitivity (float): 转向灵敏度，默认 1.0
         poll_interval (int): 轮询间隔（毫秒），默认 20ms
+        change_tolerance (float): 各控制量变化都不超过该值时不发出新信号，默认 0（仅去除完全相同的信号）
         axis_left_x (int): 左摇杆 X 轴编号，默认 0
         axis_left_y (int): 左摇杆 Y 轴编号，默认 1
         axis_rt (int): 右扳机轴编号，默认 5
@@ -214,8 +221,7 @@ class GamepadController(BaseController):
 
             self._is_running = False
 
-            self._current_control.reset()
-            self._emit_control_signal(self._current_control)
+            self._emit_control_signal(VehicleControlSignal())
 
             self._emit_status_change(False, "游戏手柄控制器已停止")
             print("⏹️  游戏手柄控制器已停止")
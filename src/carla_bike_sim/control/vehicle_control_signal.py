@@ -20,6 +20,13 @@ class VehicleControlSignal:
         self.brake = 0.0
         self.hand_brake = False
 
+    def is_close(self, other: 'VehicleControlSignal', tolerance: float = 0.0) -> bool:
+        """油门、转向、刹车之差都不超过 tolerance 且手刹状态相同"""
+        return (self.hand_brake == other.hand_brake
+                and abs(self.throttle - other.throttle) <= tolerance
+                and abs(self.steer - other.steer) <= tolerance
+                and abs(self.brake - other.brake) <= tolerance)
+
     def __str__(self) -> str:
         return (f"VehicleControlSignal(throttle={self.throttle:.2f}, "
                 f"steer={self.steer:.2f}, brake={self.brake:.2f}, "
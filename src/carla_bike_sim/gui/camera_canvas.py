@@ -0,0 +1,196 @@
+import math
+import time
+from typing import Dict, Optional, Sequence
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QRect, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QGuiApplication, QImage, QPainter, QPen
+
+
+class CameraCanvas(QWidget):
+    """在单次 paintEvent 中绘制所有摄像头画面的画布
+
+    set_image() 只保存最新图像并标记为待绘制，不会立即触发重绘；
+    刷新定时器按显示器刷新率检查，有新图像时才调用 update()，
+    因此无论两次刷新之间到达多少帧，每个显示刷新周期最多重绘一次。
+    两次重绘之间被新图像替换掉、从未显示的帧计为 coalesced。
+
+    Signals:
+        tile_painted(str, object, float): 图块的新图像绘制完成 (名称, set_image 传入的 tag, time.perf_counter())
+    """
+
+    tile_painted = Signal(str, object, float)
+
+    BACKGROUND_COLOR = QColor('#222')
+    BORDER_COLOR = QColor('#444')
+    TEXT_COLOR = QColor('#ddd')
+    SPACING = 2
+
+    def __init__(self, tile_names: Sequence[str] = (), titles: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.setMinimumSize(800, 600)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self._titles = dict(titles or {})
+        self._tile_names: list[str] = []
+        self._tile_rects: Dict[str, QRect] = {}
+        # 名称 -> (QImage, 保持 QImage 内存存活的对象)
+        self._images: Dict[str, tuple] = {}
+        self._texts: Dict[str, str] = {}
+        self._dirty = False
+        self._undrawn: set[str] = set()
+
+        self._stats = {'frames_received': 0, 'frames_painted': 0, 'coalesced': 0, 'paints': 0}
+
+        self.set_tiles(tile_names)
+
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0.0
+        if refresh_rate <= 0:
+            refresh_rate = 60.0
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setTimerType(Qt.PreciseTimer)
+        self._refresh_timer.timeout.connect(self._on_refresh)
+        self._refresh_timer.start(max(1, int(1000.0 / refresh_rate)))
+
+    def set_tiles(self, tile_names: Sequence[str]) -> None:
+        """设置要显示的图块（按顺序排列为近似正方形的网格）"""
+        self._tile_names = list(tile_names)
+        self._images = {name: img for name, img in self._images.items() if name in self._tile_names}
+        self._undrawn &= set(self._tile_names)
+        self._layout_tiles()
+        self.update()
+
+    def tile_names(self) -> list[str]:
+        return list(self._tile_names)
+
+    def tile_size(self, name: str) -> tuple[int, int]:
+        """返回图块的 (宽, 高)，未知名称返回 (0, 0)"""
+        rect = self._tile_rects.get(name)
+        if rect is None:
+            return (0, 0)
+        return (rect.width(), rect.height())
+
+    def set_image(self, name: str, image: QImage, keepalive: object = None, tag: object = None) -> None:
+        """保存图块的最新图像，等待下一次刷新时绘制
+
+        Args:
+            name: 图块名称
+            image: 要绘制的图像
+            keepalive: QImage 引用外部内存（如 numpy 数组）时传入该对象以保持其存活
+            tag: 绘制完成后随 tile_painted 发出的对象（如帧元数据）
+        """
+        if name not in self._tile_rects:
+            return
+
+        self._stats['frames_received'] += 1
+        if name in self._undrawn:
+            self._stats['coalesced'] += 1
+        self._undrawn.add(name)
+
+        self._images[name] = (image, keepalive, tag)
+        self._texts.pop(name, None)
+        self._dirty = True
+
+    def show_placeholder(self, message: str) -> None:
+        """清除所有图像，在每个图块中显示 标题 + 消息"""
+        self._images.clear()
+        self._undrawn.clear()
+        self._texts = {name: f"{self._title(name)}\n{message}" for name in self._tile_names}
+        self.update()
+
+    def get_stats(self) -> Dict[str, int]:
+        """返回绘制统计
+
+        Returns:
+            dict: frames_received, frames_painted, coalesced（合并掉未显示的帧数）, paints
+        """
+        return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        for key in self._stats:
+            self._stats[key] = 0
+
+    def _title(self, name: str) -> str:
+        return self._titles.get(name, name)
+
+    def _on_refresh(self):
+        if self._dirty:
+            self._dirty = False
+            self.update()
+
+    def _layout_tiles(self):
+        self._tile_rects = {}
+        count = len(self._tile_names)
+        if count == 0:
+            return
+
+        columns = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        spacing = self.SPACING
+        tile_width = max(1, (self.width() - spacing * (columns - 1)) // columns)
+        tile_height = max(1, (self.height() - spacing * (rows - 1)) // rows)
+
+        for index, name in enumerate(self._tile_names):
+            row, column = divmod(index, columns)
+            self._tile_rects[name] = QRect(
+                column * (tile_width + spacing),
+                row * (tile_height + spacing),
+                tile_width,
+                tile_height
+            )
+
+    def resizeEvent(self, event):
+        self._layout_tiles()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+
+        font = QFont(painter.font())
+        font.setPixelSize(16)
+        painter.setFont(font)
+
+        for name, rect in self._tile_rects.items():
+            painter.fillRect(rect, self.BACKGROUND_COLOR)
+
+            entry = self._images.get(name)
+            if entry is not None:
+                self._draw_image(painter, rect, entry[0])
+            else:
+                painter.setPen(self.TEXT_COLOR)
+                painter.drawText(rect, Qt.AlignCenter, self._texts.get(name, self._title(name)))
+
+            painter.setPen(QPen(self.BORDER_COLOR, 1))
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        painter.end()
+
+        painted_at = time.perf_counter()
+        self._stats['paints'] += 1
+        self._stats['frames_painted'] += len(self._undrawn)
+        undrawn = self._undrawn
+        self._undrawn = set()
+        for name in undrawn:
+            entry = self._images.get(name)
+            if entry is not None and entry[2] is not None:
+                self.tile_painted.emit(name, entry[2], painted_at)
+
+    @staticmethod
+    def _draw_image(painter: QPainter, rect: QRect, image: QImage):
+        """居中绘制；尺寸与图块不符时（如窗口刚调整大小）按宽高比缩放到图块内"""
+        width, height = image.width(), image.height()
+        if width > rect.width() or height > rect.height() or (
+                width < rect.width() - 1 and height < rect.height() - 1):
+            scale = min(rect.width() / width, rect.height() / height)
+            width = int(width * scale)
+            height = int(height * scale)
+        target = QRect(
+            rect.x() + (rect.width() - width) // 2,
+            rect.y() + (rect.height() - height) // 2,
+            width,
+            height
+        )
+        painter.drawImage(target, image)
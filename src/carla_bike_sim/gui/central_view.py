@@ -1,95 +1,139 @@
-from PySide6.QtWidgets import QWidget, QLabel, QGridLayout
+from typing import Sequence
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtGui import QImage
 import numpy as np
 
+from carla_bike_sim.gui.camera_canvas import CameraCanvas
+
 
 class CentralView(QWidget):
-    def __init__(self):
+    CAMERA_TITLES = {
+        'front': "前摄像头",
+        'rear': "后摄像头",
+        'left': "左摄像头",
+        'right': "右摄像头",
+        'front_semantic': "前语义分割",
+        'front_depth': "前深度",
+        'bev': "鸟瞰图",
+        'lidar': "激光雷达",
+    }
+
+    def __init__(self, camera_names: Sequence[str] = ('front', 'rear', 'left', 'right')):
         super().__init__()
 
-        self.front_label = self._create_camera_label("前摄像头\n(等待连接...)")
-        self.rear_label = self._create_camera_label("后摄像头\n(等待连接...)")
-        self.left_label = self._create_camera_label("左摄像头\n(等待连接...)")
-        self.right_label = self._create_camera_label("右摄像头\n(等待连接...)")
+        # 所有摄像头画面在同一个画布中绘制，按显示器刷新率合并重绘
+        self.canvas = CameraCanvas(camera_names, self.CAMERA_TITLES)
+        self.canvas.show_placeholder("(等待连接...)")
 
-        layout = QGridLayout()
+        layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(2)
-
-        # front, rear, left, right
-        layout.addWidget(self.front_label, 0, 0)
-        layout.addWidget(self.rear_label, 0, 1)
-        layout.addWidget(self.left_label, 1, 0)
-        layout.addWidget(self.right_label, 1, 1)
+        layout.addWidget(self.canvas)
 
         self.setLayout(layout)
 
-    def _create_camera_label(self, text: str) -> QLabel:
-        label = QLabel(text)
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(
-            "background-color: #222; color: #ddd; font-size: 16px; border: 1px solid #444;"
-        )
-        label.setMinimumSize(400, 300)
-        label.setScaledContents(False)
-        return label
+    def set_camera_names(self, camera_names: Sequence[str]):
+        """设置要显示的摄像头（如按 rig 配置），保留当前顺序"""
+        if list(camera_names) != self.canvas.tile_names():
+            self.canvas.set_tiles(camera_names)
 
-    def _update_camera_image(self, label: QLabel, image_bgr: np.ndarray):
-        """通用的摄像头图像更新方法
+    def _update_camera_image(self, camera_name: str, image_bgr: np.ndarray):
+        """通用的摄像头图像更新方法（在 GUI 线程中缩放）
 
         Args:
-            label: 要更新的QLabel
-            image_bgr: BGR 格式的图像数据 (numpy array)
+            camera_name: 摄像头名称
+            image_bgr: BGR (H, W, 3) 或 BGRA (H, W, 4) 格式的图像数据 (numpy array)
         """
         try:
-            if not image_bgr.flags['C_CONTIGUOUS']:
-                image_bgr = np.ascontiguousarray(image_bgr)
+            if image_bgr.shape[2] == 4:
+                q_image = self._bgra_to_qimage(image_bgr)
+            else:
+                q_image = self._bgr_to_qimage(image_bgr)
 
-            height, width, channel = image_bgr.shape
-            bytes_per_line = channel * width
+            width, height = self.canvas.tile_size(camera_name)
+            if width <= 0 or height <= 0:
+                return
 
-            # 将 numpy 数组转换为 QImage (BGR888 格式)
-            q_image = QImage(
-                image_bgr.data,
+            # scaled() 生成新的 QImage，不再引用 numpy 缓冲区
+            scaled_image = q_image.scaled(
                 width,
                 height,
-                bytes_per_line,
-                QImage.Format_BGR888
-            )
-
-            q_image = q_image.copy()
-
-            pixmap = QPixmap.fromImage(q_image)
-            scaled_pixmap = pixmap.scaled(
-                label.size(),
                 Qt.KeepAspectRatio,
                 Qt.SmoothTransformation
             )
 
-            label.setPixmap(scaled_pixmap)
+            self.canvas.set_image(camera_name, scaled_image)
 
         except Exception as e:
             print(f"Error updating camera image: {e}")
 
+    @staticmethod
+    def _bgra_to_qimage(image_bgra: np.ndarray) -> QImage:
+        """BGRA 零拷贝显示路径
+
+        小端序下 BGRA 字节序即 0xAARRGGBB，与 Format_RGB32 的内存布局一致，
+        QImage 直接包装原始缓冲区，随后的缩放直接读取该缓冲区，不产生整帧拷贝。
+        返回的 QImage 只能在 image_bgra 存活期间使用。
+        """
+        if not image_bgra.flags['C_CONTIGUOUS']:
+            image_bgra = np.ascontiguousarray(image_bgra)
+
+        height, width, _ = image_bgra.shape
+        return QImage(
+            image_bgra.data,
+            width,
+            height,
+            image_bgra.strides[0],
+            QImage.Format_RGB32
+        )
+
+    @staticmethod
+    def _bgr_to_qimage(image_bgr: np.ndarray) -> QImage:
+        """BGR 显示路径（需要连续化、QImage 拷贝，缩放时还要转换格式）"""
+        if not image_bgr.flags['C_CONTIGUOUS']:
+            image_bgr = np.ascontiguousarray(image_bgr)
+
+        height, width, channel = image_bgr.shape
+        bytes_per_line = channel * width
+
+        # 将 numpy 数组转换为 QImage (BGR888 格式)
+        q_image = QImage(
+            image_bgr.data,
+            width,
+            height,
+            bytes_per_line,
+            QImage.Format_BGR888
+        )
+
+        return q_image.copy()
+
+    def update_camera_image(self, camera_name: str, image_bgr: np.ndarray):
+        """按摄像头名称更新图像，未知名称将被忽略"""
+        self._update_camera_image(camera_name, image_bgr)
+
+    def camera_target_size(self, camera_name: str) -> tuple[int, int]:
+        """返回摄像头显示区域的 (宽, 高)，未知名称返回 (0, 0)"""
+        return self.canvas.tile_size(camera_name)
+
+    def show_scaled_image(self, camera_name: str, image: QImage, keepalive: object = None, tag: object = None):
+        """显示已缩放到图块尺寸的图像（由 FrameScaler 在工作线程中生成）
+
+        tag 会在绘制完成后随 canvas.tile_painted 发出，用于统计显示延迟
+        """
+        self.canvas.set_image(camera_name, image, keepalive, tag)
+
     def update_front_camera_image(self, image_bgr: np.ndarray):
-        self._update_camera_image(self.front_label, image_bgr)
+        self._update_camera_image('front', image_bgr)
 
     def update_rear_camera_image(self, image_bgr: np.ndarray):
-        self._update_camera_image(self.rear_label, image_bgr)
+        self._update_camera_image('rear', image_bgr)
 
     def update_left_camera_image(self, image_bgr: np.ndarray):
-        self._update_camera_image(self.left_label, image_bgr)
+        self._update_camera_image('left', image_bgr)
 
     def update_right_camera_image(self, image_bgr: np.ndarray):
-        self._update_camera_image(self.right_label, image_bgr)
+        self._update_camera_image('right', image_bgr)
 
     def show_placeholder(self, message: str = "Camera View\n(Waiting for connection...)"):
-        self.front_label.clear()
-        self.front_label.setText(f"前摄像头\n{message}")
-        self.rear_label.clear()
-        self.rear_label.setText(f"后摄像头\n{message}")
-        self.left_label.clear()
-        self.left_label.setText(f"左摄像头\n{message}")
-        self.right_label.clear()
-        self.right_label.setText(f"右摄像头\n{message}")
+        self.canvas.show_placeholder(message)
@@ -6,8 +6,11 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QGroupBox,
+    QComboBox,
 )
 
+from carla_bike_sim.config import SESSION_REPLAY_SPEEDS
+
 
 class ControlPanel(QWidget):
     def __init__(self):
@@ -21,6 +24,9 @@ class ControlPanel(QWidget):
         simulation_group = self._create_simulation_group()
         layout.addWidget(simulation_group)
 
+        recording_group = self._create_recording_group()
+        layout.addWidget(recording_group)
+
         layout.addStretch()
         self.setLayout(layout)
 
@@ -60,9 +66,39 @@ class ControlPanel(QWidget):
 
         self.start_btn = QPushButton("▶ Start Simulation")
         self.stop_btn = QPushButton("⏹ Stop Simulation")
+        # 取消正在进行的连接或启动
+        self.cancel_btn = QPushButton("✖ Cancel")
+        self.cancel_btn.setEnabled(False)
 
         layout.addWidget(self.start_btn)
         layout.addWidget(self.stop_btn)
+        layout.addWidget(self.cancel_btn)
+
+        group.setLayout(layout)
+        return group
+
+    def _create_recording_group(self):
+        group = QGroupBox("Recording")
+        layout = QVBoxLayout()
+
+        self.record_btn = QPushButton("⏺ Record Video")
+        self.record_btn.setCheckable(True)
+
+        self.session_log_btn = QPushButton("💾 Record Session Log")
+        self.session_log_btn.setCheckable(True)
+
+        layout.addWidget(self.record_btn)
+        layout.addWidget(self.session_log_btn)
+
+        replay_layout = QHBoxLayout()
+        self.replay_btn = QPushButton("⏵ Replay Session...")
+        self.replay_btn.setCheckable(True)
+        self.replay_speed_combo = QComboBox()
+        for speed in SESSION_REPLAY_SPEEDS:
+            self.replay_speed_combo.addItem(f"{speed:g}x", speed)
+        replay_layout.addWidget(self.replay_btn)
+        replay_layout.addWidget(self.replay_speed_combo)
+        layout.addLayout(replay_layout)
 
         group.setLayout(layout)
         return group
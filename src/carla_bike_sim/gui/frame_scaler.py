@@ -0,0 +1,152 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2 as cv
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from carla_bike_sim.carla.frames import CameraFrame
+from carla_bike_sim.config import FRAME_SCALER_WORKERS
+from carla_bike_sim.processing.latest_worker import LatestWinsWorker
+
+
+@dataclass(slots=True)
+class ScaledFrame:
+    """已缩放到显示尺寸的摄像头帧
+
+    Attributes:
+        name: 摄像头名称
+        image: 缩放后的 QImage，内存由 pixels 持有
+        pixels: QImage 引用的 numpy 缓冲区，需与 image 一起保持存活
+        frame_id: CARLA 仿真帧号
+        timestamp: CARLA 仿真时间戳
+        received_at: 回调收到原始帧时的 time.perf_counter()
+        converted_at, gui_received_at: 原始帧的对应时刻（见 CameraFrame）
+    """
+    name: str
+    image: QImage
+    pixels: np.ndarray
+    frame_id: int
+    timestamp: float
+    received_at: float
+    converted_at: float = 0.0
+    gui_received_at: float = 0.0
+
+
+class FrameScaler(QObject):
+    """在工作线程池中将摄像头帧缩放到目标显示尺寸
+
+    缩放使用 cv2.resize（INTER_AREA 缩小 / INTER_LINEAR 放大，执行期间释放 GIL），
+    GUI 线程只需把现成的 QImage 转为 QPixmap 并替换显示。
+    每个摄像头同时最多只有一个缩放任务；任务进行中提交的新帧只保留最新一帧，
+    被替换的帧计为 superseded（见 LatestWinsWorker）。
+
+    Signals:
+        frame_scaled(ScaledFrame): 在工作线程中发出，请使用 QueuedConnection 连接到 GUI
+    """
+
+    frame_scaled = Signal(object)
+
+    def __init__(self, max_workers: int = FRAME_SCALER_WORKERS):
+        super().__init__()
+        # 任务为 (待缩放帧, 目标尺寸, 完成回调)，按摄像头名称只保留最新一个
+        self._worker = LatestWinsWorker(self._run, release=self._release, max_workers=max_workers,
+                                        thread_name_prefix="frame-scaler")
+        self._worker.start()
+        self._lock = threading.Lock()
+        self._stats = {'frames': 0}
+        # 阶段名称 -> [累计耗时 ms, 最大耗时 ms, 次数]
+        self._stage_ms: Dict[str, list] = {}
+
+    def submit(self, frame: CameraFrame, target_size: Tuple[int, int],
+               on_done: Optional[Callable[[CameraFrame], None]] = None) -> None:
+        """提交一帧进行缩放
+
+        Args:
+            frame: 原始摄像头帧
+            target_size: 目标区域 (宽, 高)，按原始宽高比缩放到该区域内
+            on_done: 原始帧不再被使用时调用（如归还帧缓冲区），在工作线程中执行
+        """
+        self._worker.submit(frame.name, (frame, target_size, on_done))
+
+    def _run(self, job: Tuple[CameraFrame, Tuple[int, int], Optional[Callable]]):
+        frame, target_size, _ = job
+        try:
+            scaled = self._scale(frame, target_size)
+        except Exception as e:
+            print(f"Error scaling camera image ({frame.name}): {e}")
+            return
+        if scaled is not None:
+            self.frame_scaled.emit(scaled)
+
+    @staticmethod
+    def _release(job: Tuple[CameraFrame, Tuple[int, int], Optional[Callable]]):
+        frame, _, on_done = job
+        if on_done is not None:
+            on_done(frame)
+
+    def _scale(self, frame: CameraFrame, target_size: Tuple[int, int]) -> Optional[ScaledFrame]:
+        image = frame.image
+        src_height, src_width = image.shape[:2]
+        target_width, target_height = target_size
+        if target_width <= 0 or target_height <= 0:
+            return None
+
+        # 保持宽高比 (等价于 Qt.KeepAspectRatio)
+        scale = min(target_width / src_width, target_height / src_height)
+        width = max(1, int(round(src_width * scale)))
+        height = max(1, int(round(src_height * scale)))
+
+        t0 = time.perf_counter()
+        interpolation = cv.INTER_AREA if scale < 1.0 else cv.INTER_LINEAR
+        pixels = cv.resize(image, (width, height), interpolation=interpolation)
+        t1 = time.perf_counter()
+
+        if pixels.shape[2] == 4:
+            image_format = QImage.Format_RGB32
+        else:
+            image_format = QImage.Format_BGR888
+        q_image = QImage(pixels.data, width, height, pixels.strides[0], image_format)
+        t2 = time.perf_counter()
+
+        with self._lock:
+            self._stats['frames'] += 1
+        self.record_stage('resize', (t1 - t0) * 1000.0)
+        self.record_stage('convert', (t2 - t1) * 1000.0)
+
+        return ScaledFrame(frame.name, q_image, pixels, frame.frame_id, frame.timestamp,
+                           frame.received_at, frame.converted_at, frame.gui_received_at)
+
+    def record_stage(self, stage: str, elapsed_ms: float) -> None:
+        """记录一个阶段的耗时，GUI 线程也可用它记录显示阶段（如 'display'）"""
+        with self._lock:
+            entry = self._stage_ms.get(stage)
+            if entry is None:
+                entry = [0.0, 0.0, 0]
+                self._stage_ms[stage] = entry
+            entry[0] += elapsed_ms
+            entry[1] = max(entry[1], elapsed_ms)
+            entry[2] += 1
+
+    def get_stats(self) -> Dict[str, object]:
+        """返回缩放统计
+
+        Returns:
+            dict: frames, superseded, stages
+                stages 为 阶段名称 -> {'avg_ms', 'max_ms', 'count'}，
+                内置阶段为 'resize'（cv2.resize）和 'convert'（包装为 QImage）
+        """
+        with self._lock:
+            stats: Dict[str, object] = dict(self._stats)
+            stats['superseded'] = self._worker.superseded
+            stats['stages'] = {
+                stage: {'avg_ms': total / count if count else 0.0, 'max_ms': peak, 'count': count}
+                for stage, (total, peak, count) in self._stage_ms.items()
+            }
+        return stats
+
+    def shutdown(self) -> None:
+        self._worker.stop()
@@ -3,15 +3,44 @@ from PySide6.QtWidgets import (
     QDockWidget,
     QStatusBar,
     QMessageBox,
+    QFileDialog,
 )
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
 from PySide6.QtCore import Qt, QTimer
 
 from carla_bike_sim.gui.central_view import CentralView
 from carla_bike_sim.gui.control_panel import ControlPanel
+from carla_bike_sim.gui.frame_scaler import FrameScaler, ScaledFrame
 from carla_bike_sim.carla.carla_client_manager import CarlaClientManager
+from carla_bike_sim.carla.lifecycle_worker import LifecycleWorker
+from carla_bike_sim.carla.latency import LatencyTracker
+from carla_bike_sim.carla.metadata_cache import MetadataCache
+from carla_bike_sim.carla.sensor_streams import COLLISION_DTYPE, GNSS_DTYPE, IMU_DTYPE
 from carla_bike_sim.gui.status_panel import StatusPanel
 from carla_bike_sim.control import ControlInputManager, VehicleControlSignal
 from carla_bike_sim.control.gamepad import GamepadController
+from carla_bike_sim.config import (
+    BEV_ENABLED,
+    CAMERA_DISPLAY_INTERVAL_MS,
+    CONTROL_CHANGE_TOLERANCE,
+    LIFECYCLE_CLOSE_TIMEOUT,
+    RECTIFICATION_CAMERAS,
+    RECTIFICATION_ENABLED,
+    RECORDING_LAYOUT,
+    RECORDING_OUTPUT_DIR,
+    SESSION_LOG_OUTPUT_DIR,
+    SHARED_FRAMES_ENABLED,
+    SYNC_FIXED_DELTA_SECONDS,
+    TELEMETRY_STALE_MS,
+    VEHICLE_STATUS_INTERVAL_MS,
+)
+from carla_bike_sim.ipc import SharedFramePublisher
+from carla_bike_sim.processing import BEV_CAMERA_NAME, BirdsEyeViewStage, RectificationStage
+from carla_bike_sim.recording import SessionLogReader, SessionLogWriter, SessionReplay, VideoRecorder
 
 
 class MainWindow(QMainWindow):
@@ -24,6 +53,10 @@ class MainWindow(QMainWindow):
         self.central_view = None
         self.status_panel = None
         self.control_input_manager = None
+        self.video_recorder = None
+        self.session_log = None
+        self.session_replay = None
+        self.frame_publisher = None
 
         self._create_central_view()
         self._create_docks()
@@ -33,7 +66,55 @@ class MainWindow(QMainWindow):
 
         self.vehicle_update_timer = QTimer()
         self.vehicle_update_timer.timeout.connect(self._update_vehicle_status)
-        self.vehicle_update_timer.setInterval(50)
+        self.vehicle_update_timer.setInterval(VEHICLE_STATUS_INTERVAL_MS)
+
+        # mailbox 模式下 GUI 按固定节奏拉取每个摄像头的最新帧
+        self.frame_pull_timer = QTimer()
+        self.frame_pull_timer.timeout.connect(self._pull_camera_frames)
+        self.frame_pull_timer.setInterval(CAMERA_DISPLAY_INTERVAL_MS)
+
+        # 缩放在工作线程中完成，GUI 线程只替换现成的图像
+        self.frame_scaler = FrameScaler()
+        self.frame_scaler.frame_scaled.connect(
+            self._on_frame_scaled,
+            Qt.ConnectionType.QueuedConnection
+        )
+
+        # 每帧从回调入口到绘制到屏幕的各阶段延迟
+        self.latency_tracker = LatencyTracker()
+        self.central_view.canvas.tile_painted.connect(self._on_tile_painted)
+
+        # 地图列表、蓝图库和出生点缓存，在重新连接之间共享
+        self.metadata_cache = MetadataCache()
+
+        # 连接和启动仿真（load_world 可能超过 10 秒）在工作线程中执行，GUI 和手柄保持响应
+        self.lifecycle_worker = LifecycleWorker()
+        self.lifecycle_worker.finished.connect(
+            self._on_lifecycle_finished,
+            Qt.ConnectionType.QueuedConnection
+        )
+        self.lifecycle_worker.cancelled.connect(
+            self._on_lifecycle_cancelled,
+            Qt.ConnectionType.QueuedConnection
+        )
+
+        # 广角摄像头先在工作线程中校正，再进入缩放、显示路径
+        self.rectification_stage = None
+        if RECTIFICATION_ENABLED:
+            self.rectification_stage = RectificationStage()
+            self.rectification_stage.frame_rectified.connect(
+                self._on_processed_frame,
+                Qt.ConnectionType.QueuedConnection
+            )
+
+        # 鸟瞰图由同步的摄像头 bundle 在工作线程中合成，作为额外的图块显示
+        self.bev_stage = None
+        if BEV_ENABLED:
+            self.bev_stage = BirdsEyeViewStage()
+            self.bev_stage.frame_composed.connect(
+                self._on_processed_frame,
+                Qt.ConnectionType.QueuedConnection
+            )
 
         self._update_connection_ui(connected=False)
 
@@ -67,6 +148,7 @@ class MainWindow(QMainWindow):
             'trigger_deadzone': 0.05,
             'steer_sensitivity': 1.0,
             'poll_interval': 20,
+            'change_tolerance': CONTROL_CHANGE_TOLERANCE,
         }
         gamepad_ctrl = GamepadController(gamepad_config)
         self.control_input_manager.register_controller("gamepad", gamepad_ctrl)
@@ -84,25 +166,26 @@ class MainWindow(QMainWindow):
             self._on_connection_status_changed,
             Qt.ConnectionType.QueuedConnection
         )
-        self.carla_manager.sensor_manager.front_camera_image_ready.connect(
-            self.on_front_camera_image_ready,
+        self.carla_manager.lifecycle_progress.connect(
+            self._on_lifecycle_progress,
             Qt.ConnectionType.QueuedConnection
         )
-        self.carla_manager.sensor_manager.rear_camera_image_ready.connect(
-            self.on_rear_camera_image_ready,
+        # signal 模式下按名称显示 rig 中的任意摄像头（front/rear/left/right 的专用信号同时发出，不再重复连接）
+        self.carla_manager.sensor_manager.camera_image_ready.connect(
+            self.on_camera_image_ready,
             Qt.ConnectionType.QueuedConnection
         )
-        self.carla_manager.sensor_manager.left_camera_image_ready.connect(
-            self.on_left_camera_image_ready,
+        self.carla_manager.simulation_error.connect(
+            self._on_simulation_error,
             Qt.ConnectionType.QueuedConnection
         )
-        self.carla_manager.sensor_manager.right_camera_image_ready.connect(
-            self.on_right_camera_image_ready,
+        self.carla_manager.real_time_factor_updated.connect(
+            self.status_panel.update_real_time_factor,
             Qt.ConnectionType.QueuedConnection
         )
-        self.carla_manager.simulation_error.connect(
-            self._on_simulation_error,
-            Qt.ConnectionType.QueuedConnection
+        # 节流后的通知，在 GUI 线程中发出
+        self.carla_manager.sensor_manager.sensor_streams.streams_updated.connect(
+            self._on_sensor_streams_updated
         )
 
     def _connect_control_signals(self):
@@ -111,6 +194,31 @@ class MainWindow(QMainWindow):
 
         self.control_panel.start_btn.clicked.connect(self._on_start_simulation)
         self.control_panel.stop_btn.clicked.connect(self._on_stop_simulation)
+        self.control_panel.cancel_btn.clicked.connect(self._on_cancel_operation)
+
+        self.control_panel.record_btn.toggled.connect(self._on_record_toggled)
+        self.control_panel.session_log_btn.toggled.connect(self._on_session_log_toggled)
+        self.control_panel.replay_btn.toggled.connect(self._on_replay_toggled)
+
+    def _on_sensor_streams_updated(self, names: list):
+        """显示 IMU / GNSS / 碰撞传感器的最新样本"""
+        if self.carla_manager is None:
+            return
+        streams = self.carla_manager.sensor_manager.sensor_streams
+        for name in names:
+            buffer = streams.get(name)
+            if buffer is None:
+                continue
+            latest = buffer.latest(1)
+            if len(latest) == 0:
+                continue
+            sample = latest[0]
+            if buffer.dtype == IMU_DTYPE:
+                self.status_panel.update_imu(sample['accelerometer'], sample['gyroscope'])
+            elif buffer.dtype == GNSS_DTYPE:
+                self.status_panel.update_gnss(sample['latitude'], sample['longitude'])
+            elif buffer.dtype == COLLISION_DTYPE:
+                self.status_panel.update_collisions(buffer.total, sample['intensity'])
 
     def _on_connect(self):
         host = self.control_panel.host_input.text().strip()
@@ -128,25 +236,72 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Invalid Input", "Port must be a number between 1 and 65535.")
             return
 
+        if self.lifecycle_worker.is_busy:
+            return
+
         self.statusBar().showMessage(f"Connecting to {host}:{port}...")
-        self.carla_manager = CarlaClientManager(host=host, port=port)
+        self.carla_manager = CarlaClientManager(host=host, port=port, metadata_cache=self.metadata_cache)
         self._connect_carla_signals()
 
-        success = self.carla_manager.connect()
+        self._set_lifecycle_busy(True)
+        self.lifecycle_worker.connect_to_server(self.carla_manager)
 
+    def _on_connect_finished(self, success: bool):
         if not success:
             QMessageBox.warning(
                 self,
                 "Connection Failed",
-                f"Failed to connect to CARLA server at {host}:{port}.\nPlease ensure CARLA is running."
+                f"Failed to connect to CARLA server at {self.carla_manager.host}:{self.carla_manager.port}.\n"
+                "Please ensure CARLA is running."
             )
             self.carla_manager = None
-        
+            return
+
         self.central_view.show_placeholder("Waiting for simulation start")
 
+    def _on_lifecycle_progress(self, message: str, percent: int):
+        self.statusBar().showMessage(f"{message} ({percent}%)")
+
+    def _on_lifecycle_finished(self, operation: str, success: bool):
+        self._set_lifecycle_busy(False)
+        if operation == 'connect':
+            self._on_connect_finished(success)
+        elif operation == 'start':
+            self._on_start_finished(success)
+
+    def _on_lifecycle_cancelled(self, operation: str):
+        self._set_lifecycle_busy(False)
+        if operation == 'connect':
+            self.carla_manager = None
+            self._update_connection_ui(connected=False)
+            self.statusBar().showMessage("Connection cancelled")
+        elif operation == 'start':
+            self._update_connection_ui(connected=True)
+            self.statusBar().showMessage("Simulation start cancelled")
+
+    def _on_cancel_operation(self):
+        if self.lifecycle_worker.is_busy:
+            self.statusBar().showMessage("Cancelling after the current step...")
+            self.control_panel.cancel_btn.setEnabled(False)
+            self.lifecycle_worker.cancel()
+
+    def _set_lifecycle_busy(self, busy: bool):
+        """连接或启动进行中时只允许取消"""
+        panel = self.control_panel
+        panel.cancel_btn.setEnabled(busy)
+        if busy:
+            for widget in (panel.host_input, panel.port_input, panel.connect_btn,
+                           panel.disconnect_btn, panel.start_btn, panel.replay_btn):
+                widget.setEnabled(False)
+
     def _on_disconnect(self):
-        if self.carla_manager is not None:
+        if self.carla_manager is not None and not self.lifecycle_worker.is_busy:
             self.statusBar().showMessage("Disconnecting from CARLA server...")
+            self.control_panel.record_btn.setChecked(False)
+            self.control_panel.session_log_btn.setChecked(False)
+            self._stop_frame_sharing()
+            self._stop_birds_eye_view()
+            self.frame_pull_timer.stop()
             self.carla_manager.disconnect()
             self.carla_manager = None
             self.status_panel.reset()
@@ -163,27 +318,67 @@ class MainWindow(QMainWindow):
         self.control_panel.connect_btn.setEnabled(not connected)
         self.control_panel.disconnect_btn.setEnabled(connected)
 
-        self.control_panel.start_btn.setEnabled(connected)
+        self.control_panel.start_btn.setEnabled(connected and self.session_replay is None)
         self.control_panel.stop_btn.setEnabled(False)
+        self.control_panel.record_btn.setEnabled(False)
+        self.control_panel.session_log_btn.setEnabled(False)
+        self.control_panel.replay_btn.setEnabled(True)
 
-        if not connected:
+        if not connected and self.session_replay is None:
             self.central_view.show_placeholder("Disconnected from CARLA server")
 
-    def on_front_camera_image_ready(self, image_rgb):
-        self.central_view.update_front_camera_image(image_rgb)
-        self.status_panel.on_camera_frame_received('front')
+    def on_camera_image_ready(self, camera_name: str, image_rgb):
+        self.central_view.update_camera_image(camera_name, image_rgb)
+        self.status_panel.on_camera_frame_received(camera_name)
 
-    def on_rear_camera_image_ready(self, image_rgb):
-        self.central_view.update_rear_camera_image(image_rgb)
-        self.status_panel.on_camera_frame_received('rear')
+    def _pull_camera_frames(self):
+        if self.carla_manager is None:
+            return
 
-    def on_left_camera_image_ready(self, image_rgb):
-        self.central_view.update_left_camera_image(image_rgb)
-        self.status_panel.on_camera_frame_received('left')
+        sensor_manager = self.carla_manager.sensor_manager
+        frames = sensor_manager.frame_mailbox.take_all()
+        now = time.perf_counter()
+        for name, frame in frames.items():
+            frame.gui_received_at = now
+            # 需要校正的摄像头在校正完成后归还缓冲区
+            if self.rectification_stage is not None and self.rectification_stage.submit(
+                    frame, on_done=sensor_manager.release_frame):
+                continue
+            # 缩放完成后归还缓冲区
+            self.frame_scaler.submit(
+                frame,
+                self.central_view.camera_target_size(name),
+                on_done=sensor_manager.release_frame
+            )
 
-    def on_right_camera_image_ready(self, image_rgb):
-        self.central_view.update_right_camera_image(image_rgb)
-        self.status_panel.on_camera_frame_received('right')
+    def _on_processed_frame(self, frame):
+        """显示处理阶段（校正、鸟瞰图）输出的新帧"""
+        if not self.frame_pull_timer.isActive():
+            return
+        self.frame_scaler.submit(frame, self.central_view.camera_target_size(frame.name))
+
+    def _on_frame_scaled(self, scaled: ScaledFrame):
+        # 仿真停止后到达的帧不再显示，避免覆盖占位符
+        if not self.frame_pull_timer.isActive() and self.session_replay is None:
+            return
+
+        start = time.perf_counter()
+        self.central_view.show_scaled_image(scaled.name, scaled.image, scaled.pixels, tag=scaled)
+        self.frame_scaler.record_stage('display', (time.perf_counter() - start) * 1000.0)
+        self.status_panel.on_camera_frame_received(scaled.name)
+
+    def _on_tile_painted(self, name: str, scaled, painted_at: float):
+        # 只统计实时仿真的帧（回放帧的时间戳来自过去的会话）
+        if not self.frame_pull_timer.isActive() or not isinstance(scaled, ScaledFrame):
+            return
+        self.latency_tracker.record_frame(
+            name, scaled.timestamp, scaled.received_at,
+            scaled.converted_at, scaled.gui_received_at, painted_at
+        )
+
+    def get_latency_stats(self, camera_name: Optional[str] = None) -> dict:
+        """返回摄像头到屏幕的延迟分位数，格式见 LatencyTracker.get_percentiles()"""
+        return self.latency_tracker.get_percentiles(camera_name)
 
     def _on_simulation_error(self, error_message: str):
         self.statusBar().showMessage(f"Error: {error_message}")
@@ -193,17 +388,41 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Not Connected", "Please connect to CARLA server first.")
             return
 
-        self.statusBar().showMessage("Starting simulation...")
+        if self.lifecycle_worker.is_busy:
+            return
 
-        success = self.carla_manager.start_simulation(vehicle_blueprint="vehicle.bh.crossbike")
+        self.statusBar().showMessage("Starting simulation...")
+        self._set_lifecycle_busy(True)
+        self.lifecycle_worker.start_simulation(self.carla_manager, vehicle_blueprint="vehicle.bh.crossbike")
 
+    def _on_start_finished(self, success: bool):
         if success:
-            self.statusBar().showMessage("Simulation started")
+            self.statusBar().showMessage(
+                "Simulation started" + self._metadata_cache_summary() + self._traffic_summary()
+            )
+            camera_names = list(self.carla_manager.sensor_manager.display_names)
+            if self.bev_stage is not None and self._start_birds_eye_view():
+                camera_names.append(BEV_CAMERA_NAME)
+            self.central_view.set_camera_names(camera_names)
+            if self.rectification_stage is not None:
+                self._setup_rectification()
+            self.status_panel.update_simulation_mode(
+                self.carla_manager.is_synchronous, SYNC_FIXED_DELTA_SECONDS
+            )
+            self.control_panel.disconnect_btn.setEnabled(True)
             self.control_panel.start_btn.setEnabled(False)
             self.control_panel.stop_btn.setEnabled(True)
+            self.control_panel.record_btn.setEnabled(True)
+            self.control_panel.session_log_btn.setEnabled(True)
+            self.control_panel.replay_btn.setEnabled(False)
+            self.latency_tracker.reset()
             self.vehicle_update_timer.start()
+            self.frame_pull_timer.start()
+            if SHARED_FRAMES_ENABLED:
+                self._start_frame_sharing()
             self.control_input_manager.switch_controller("gamepad")
         else:
+            self._update_connection_ui(connected=True)
             QMessageBox.warning(
                 self,
                 "Start Failed",
@@ -216,59 +435,317 @@ class MainWindow(QMainWindow):
 
         self.statusBar().showMessage("Stopping simulation...")
 
+        self.control_panel.record_btn.setChecked(False)
+        self.control_panel.record_btn.setEnabled(False)
+        self.control_panel.session_log_btn.setChecked(False)
+        self.control_panel.session_log_btn.setEnabled(False)
+        self.control_panel.replay_btn.setEnabled(True)
+        self._stop_frame_sharing()
+        self._stop_birds_eye_view()
         self.vehicle_update_timer.stop()
+        self.frame_pull_timer.stop()
         self.control_input_manager.stop_all()
         self.carla_manager.stop_simulation()
 
-        self.statusBar().showMessage("Simulation stopped")
+        self.statusBar().showMessage(
+            "Simulation stopped" + self._control_summary() + self._rectification_summary()
+        )
         self.control_panel.start_btn.setEnabled(True)
         self.control_panel.stop_btn.setEnabled(False)
         self.central_view.show_placeholder("Simulation stopped")
 
         self.status_panel.reset()
 
+    def _setup_rectification(self):
+        fovs = {
+            spec.name: spec.fov
+            for spec in self.carla_manager.sensor_manager.rig
+            if spec.is_camera and spec.name in RECTIFICATION_CAMERAS
+        }
+        self.rectification_stage.set_cameras(fovs)
+        # 第一帧之前加载（或计算）查找表
+        for spec in self.carla_manager.sensor_manager.rig:
+            if spec.name in fovs:
+                self.rectification_stage.warm_up(spec.image_size_x, spec.image_size_y)
+
+    def _start_birds_eye_view(self) -> bool:
+        sensor_manager = self.carla_manager.sensor_manager
+        try:
+            self.bev_stage.configure(sensor_manager.rig)
+        except Exception as e:
+            print(f"Error building bird's-eye view tables: {e}")
+            return False
+
+        if sensor_manager.bundle_synchronizer is None:
+            sensor_manager.enable_camera_bundles()
+        sensor_manager.camera_bundle_ready.connect(
+            self.bev_stage.submit_bundle,
+            Qt.ConnectionType.DirectConnection
+        )
+        self.bev_stage.start()
+        return True
+
+    def _stop_birds_eye_view(self):
+        if self.bev_stage is None or self.carla_manager is None:
+            return
+        try:
+            self.carla_manager.sensor_manager.camera_bundle_ready.disconnect(self.bev_stage.submit_bundle)
+        except (RuntimeError, TypeError):
+            pass
+        self.bev_stage.stop()
+
+    def _metadata_cache_summary(self) -> str:
+        stats = self.metadata_cache.get_stats()
+        hits = sum(kind['hits'] for kind in stats.values())
+        total = hits + sum(kind['misses'] for kind in stats.values())
+        if total == 0:
+            return ""
+        return f" (metadata cache: {hits}/{total} hits)"
+
+    def _traffic_summary(self) -> str:
+        stats = self.carla_manager.get_traffic_stats()
+        if not stats:
+            return ""
+        return (f" (traffic: {stats['vehicles']} vehicles, {stats['walkers']} walkers "
+                f"in {stats['spawn_ms']:.0f} ms)")
+
+    def _control_summary(self) -> str:
+        stats = self.carla_manager.get_control_stats()
+        if stats['submitted'] == 0:
+            return ""
+        return (f" (control: {stats['sent']} sent, {stats['suppressed']} unchanged, "
+                f"{stats['coalesced']} coalesced)")
+
+    def _rectification_summary(self) -> str:
+        if self.rectification_stage is None:
+            return ""
+        cameras = self.rectification_stage.get_stats()['cameras']
+        if not cameras:
+            return ""
+        costs = ", ".join(
+            f"{name} {cost['avg_ms']:.1f} ms/frame" for name, cost in cameras.items()
+        )
+        return f" (rectification: {costs})"
+
+    def _on_record_toggled(self, checked: bool):
+        if checked:
+            self._start_recording()
+        else:
+            self._stop_recording()
+
+    def _start_recording(self):
+        if self.carla_manager is None or self.video_recorder is not None:
+            return
+
+        sensor_manager = self.carla_manager.sensor_manager
+        output_dir = Path(RECORDING_OUTPUT_DIR) / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.video_recorder = VideoRecorder(
+            output_dir,
+            layout=RECORDING_LAYOUT,
+            camera_names=sensor_manager.bundle_camera_names
+        )
+        self.video_recorder.start()
+
+        # 录制器只做入队，直接在 CARLA 回调线程中调用
+        if RECORDING_LAYOUT == 'mosaic':
+            if sensor_manager.bundle_synchronizer is None:
+                sensor_manager.enable_camera_bundles()
+            sensor_manager.camera_bundle_ready.connect(
+                self.video_recorder.submit_bundle,
+                Qt.ConnectionType.DirectConnection
+            )
+        else:
+            sensor_manager.add_frame_listener(self.video_recorder.submit)
+
+        self.control_panel.record_btn.setText("⏹ Stop Recording")
+        self.statusBar().showMessage(f"Recording to {output_dir}")
+
+    def _stop_recording(self):
+        if self.video_recorder is None:
+            return
+
+        if self.carla_manager is not None:
+            sensor_manager = self.carla_manager.sensor_manager
+            if RECORDING_LAYOUT == 'mosaic':
+                sensor_manager.camera_bundle_ready.disconnect(self.video_recorder.submit_bundle)
+            else:
+                sensor_manager.remove_frame_listener(self.video_recorder.submit)
+
+        self.video_recorder.stop()
+        stats = self.video_recorder.get_stats()
+        self.statusBar().showMessage(
+            f"Recording saved to {self.video_recorder.output_dir}: "
+            f"{stats['written']} frames written, {stats['dropped']} dropped, "
+            f"max lag {stats['max_lag'] * 1000:.0f} ms"
+        )
+        self.video_recorder = None
+        self.control_panel.record_btn.setText("⏺ Record Video")
+
+    def _start_frame_sharing(self):
+        if self.carla_manager is None or self.frame_publisher is not None:
+            return
+        # 共享内存写入只有一次 memcpy，直接在 CARLA 回调线程中执行
+        self.frame_publisher = SharedFramePublisher()
+        self.carla_manager.sensor_manager.add_frame_listener(self.frame_publisher.publish)
+
+    def _stop_frame_sharing(self):
+        if self.frame_publisher is None:
+            return
+        if self.carla_manager is not None:
+            self.carla_manager.sensor_manager.remove_frame_listener(self.frame_publisher.publish)
+        self.frame_publisher.close()
+        self.frame_publisher = None
+
+    def _on_session_log_toggled(self, checked: bool):
+        if checked:
+            self._start_session_log()
+        else:
+            self._stop_session_log()
+
+    def _start_session_log(self):
+        if self.carla_manager is None or self.session_log is not None:
+            return
+
+        session_dir = Path(SESSION_LOG_OUTPUT_DIR) / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_log = SessionLogWriter(session_dir)
+        self.session_log.open()
+        # 原始帧直接在 CARLA 回调线程中入队，控制和遥测在 GUI 线程中记录
+        self.carla_manager.sensor_manager.add_frame_listener(self.session_log.log_camera_frame)
+
+        self.control_panel.session_log_btn.setText("⏹ Stop Session Log")
+        self.statusBar().showMessage(f"Logging session to {session_dir}")
+
+    def _stop_session_log(self):
+        if self.session_log is None:
+            return
+
+        if self.carla_manager is not None:
+            self.carla_manager.sensor_manager.remove_frame_listener(self.session_log.log_camera_frame)
+
+        self.session_log.close()
+        stats = self.session_log.get_stats()
+        self.statusBar().showMessage(
+            f"Session log saved to {self.session_log.session_dir}: "
+            f"{stats['records']} records, {stats['bytes'] / (1024 * 1024):.0f} MB, "
+            f"{stats['dropped']} dropped"
+        )
+        self.session_log = None
+        self.control_panel.session_log_btn.setText("💾 Record Session Log")
+
+    def _on_replay_toggled(self, checked: bool):
+        if checked:
+            self._start_replay()
+        else:
+            self._stop_replay()
+
+    def _start_replay(self):
+        if self.session_replay is not None:
+            return
+
+        session_dir = QFileDialog.getExistingDirectory(self, "Select Session Log", SESSION_LOG_OUTPUT_DIR)
+        if not session_dir:
+            self.control_panel.replay_btn.setChecked(False)
+            return
+
+        try:
+            reader = SessionLogReader(session_dir)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Replay Failed", f"Failed to open session log:\n{e}")
+            self.control_panel.replay_btn.setChecked(False)
+            return
+
+        speed = self.control_panel.replay_speed_combo.currentData()
+        self.session_replay = SessionReplay(reader, speed=speed)
+        self.session_replay.camera_frame_ready.connect(self._on_replay_camera_frame)
+        self.session_replay.telemetry_ready.connect(self._on_replay_telemetry)
+        self.session_replay.finished.connect(lambda: self.control_panel.replay_btn.setChecked(False))
+
+        self.central_view.set_camera_names(reader.streams)
+        self.status_panel.reset()
+        self.control_panel.start_btn.setEnabled(False)
+        self.control_panel.replay_speed_combo.setEnabled(False)
+        self.control_panel.replay_btn.setText("⏹ Stop Replay")
+        self.statusBar().showMessage(
+            f"Replaying {session_dir} ({len(reader)} records, {reader.duration:.1f} s) at {speed:g}x"
+        )
+        self.session_replay.start()
+
+    def _stop_replay(self):
+        if self.session_replay is None:
+            return
+
+        self.session_replay.stop()
+        self.session_replay.reader.close()
+        self.session_replay = None
+
+        self.control_panel.start_btn.setEnabled(self.carla_manager is not None)
+        self.control_panel.replay_speed_combo.setEnabled(True)
+        self.control_panel.replay_btn.setText("⏵ Replay Session...")
+        self.central_view.show_placeholder("Replay finished")
+        self.statusBar().showMessage("Replay finished")
+
+    def _on_replay_camera_frame(self, frame):
+        # 回放帧与实时帧走同一条缩放、显示路径
+        self.frame_scaler.submit(frame, self.central_view.camera_target_size(frame.name))
+
+    def _on_replay_telemetry(self, sample: dict):
+        self.status_panel.update_vehicle_velocity(sample['velocity'])
+        self.status_panel.update_vehicle_control(sample['throttle'], sample['brake'], sample['steer'])
+        self.status_panel.update_vehicle_gear(sample['gear'])
+        self.status_panel.update_vehicle_transform(
+            sample['position_x'], sample['position_y'], sample['position_z'],
+            sample['rotation_pitch'], sample['rotation_yaw'], sample['rotation_roll']
+        )
+
     def _update_vehicle_status(self):
         if self.carla_manager is None or not self.carla_manager.is_running:
             return
 
-        velocity = self.carla_manager.get_vehicle_velocity()
-        if velocity is not None:
-            import math
-            speed = math.sqrt(velocity.x**2 + velocity.y**2 + velocity.z**2)
-            self.status_panel.update_vehicle_velocity(speed)
-
-        transform = self.carla_manager.get_vehicle_transform()
-        if transform is not None:
-            loc = transform.location
-            rot = transform.rotation
-            self.status_panel.update_vehicle_transform(
-                loc.x, loc.y, loc.z,
-                rot.pitch, rot.yaw, rot.roll
-            )
+        # 只读取遥测服务在仿真步回调中组装好的最新记录，服务器变慢也不会阻塞 GUI 线程
+        telemetry = self.carla_manager.get_vehicle_telemetry()
+        if telemetry is None:
+            return
 
-        if self.carla_manager.vehicle is not None:
-            control = self.carla_manager.vehicle.get_control()
-            self.status_panel.update_vehicle_control(
-                control.throttle,
-                control.brake,
-                control.steer
-            )
-            self.status_panel.update_vehicle_gear(control.gear)
+        age_ms = telemetry.age_ms
+        self.status_panel.update_telemetry_age(age_ms, stale=age_ms > TELEMETRY_STALE_MS)
+        self.status_panel.update_vehicle_velocity(telemetry.speed)
+        self.status_panel.update_vehicle_transform(*telemetry.location, *telemetry.rotation)
+        self.status_panel.update_vehicle_control(telemetry.throttle, telemetry.brake, telemetry.steer)
+        self.status_panel.update_vehicle_gear(telemetry.gear)
+
+        if self.session_log is not None:
+            self.session_log.log_telemetry(telemetry.as_sample())
+
+        self.status_panel.update_camera_latency(self.latency_tracker.get_percentiles(stages=('total',)))
 
     def _on_vehicle_control_signal(self, control: VehicleControlSignal):
         if self.carla_manager and self.carla_manager.is_running:
-            self.carla_manager.set_vehicle_control(
-                throttle=control.throttle,
-                steer=control.steer,
-                brake=control.brake,
-                hand_brake=control.hand_brake
-            )
+            # 控制器发出的信号已限幅且不再修改，直接交给发送阶段（不拷贝）
+            self.carla_manager.submit_vehicle_control(control)
+            if self.session_log is not None:
+                self.session_log.log_control(control)
 
     def closeEvent(self, event):
+        self._stop_recording()
+        self._stop_session_log()
+        self._stop_replay()
+        self._stop_frame_sharing()
+        self._stop_birds_eye_view()
         self.vehicle_update_timer.stop()
+        self.frame_pull_timer.stop()
+        self.frame_scaler.shutdown()
+        if self.rectification_stage is not None:
+            self.rectification_stage.shutdown()
         if self.control_input_manager:
             self.control_input_manager.stop_all()
-        if self.carla_manager is not None:
+        # 等待进行中的连接 / 启动在当前步骤结束后退出，再清理它可能已创建的资源；
+        # 阻塞中的 RPC（如 load_world）要到客户端超时才返回，不能让关闭窗口等那么久
+        self.lifecycle_worker.cancel()
+        if not self.lifecycle_worker.wait(LIFECYCLE_CLOSE_TIMEOUT):
+            # 工作线程仍持有 manager，此时 disconnect() 会与它竞争；线程为守护线程，随进程退出
+            print(f"Warning: {self.lifecycle_worker.operation} operation still running after "
+                  f"{LIFECYCLE_CLOSE_TIMEOUT:.1f} s, closing without waiting for it")
+        elif self.carla_manager is not None:
             self.carla_manager.disconnect()
         event.accept()
 
@@ -56,6 +56,10 @@ class StatusPanel(QWidget):
         camera_group = self._create_camera_fps_group()
         main_layout.addWidget(camera_group)
 
+        # 仿真状态
+        simulation_group = self._create_simulation_group()
+        main_layout.addWidget(simulation_group)
+
         # 车辆状态
         vehicle_group = self._create_vehicle_status_group()
         main_layout.addWidget(vehicle_group)
@@ -67,6 +71,10 @@ class StatusPanel(QWidget):
         transform_group = self._create_transform_group()
         main_layout.addWidget(transform_group)
 
+        # IMU / GNSS / 碰撞
+        sensors_group = self._create_sensors_group()
+        main_layout.addWidget(sensors_group)
+
         main_layout.addStretch()
         self.setLayout(main_layout)
 
@@ -80,14 +88,44 @@ class StatusPanel(QWidget):
         self.left_fps_label = self._create_value_label("-- fps")
         self.right_fps_label = self._create_value_label("-- fps")
 
+        # 回调入口 -> 绘制到屏幕的延迟 p50/p95/p99
+        self._latency_labels = {
+            name: self._create_value_label("-- ms") for name in ('front', 'rear', 'left', 'right')
+        }
+        for label in self._latency_labels.values():
+            label.setToolTip("Callback-to-paint latency p50 / p95 / p99 (ms)")
+
         layout.addWidget(QLabel("Front:"), 0, 0)
         layout.addWidget(self.front_fps_label, 0, 1)
+        layout.addWidget(self._latency_labels['front'], 0, 2)
         layout.addWidget(QLabel("Rear:"), 1, 0)
         layout.addWidget(self.rear_fps_label, 1, 1)
+        layout.addWidget(self._latency_labels['rear'], 1, 2)
         layout.addWidget(QLabel("Left:"), 2, 0)
         layout.addWidget(self.left_fps_label, 2, 1)
+        layout.addWidget(self._latency_labels['left'], 2, 2)
         layout.addWidget(QLabel("Right:"), 3, 0)
         layout.addWidget(self.right_fps_label, 3, 1)
+        layout.addWidget(self._latency_labels['right'], 3, 2)
+
+        group.setLayout(layout)
+        return group
+
+    def _create_simulation_group(self):
+        group = QGroupBox("Simulation")
+        layout = QGridLayout()
+        layout.setSpacing(5)
+
+        self.sim_mode_label = self._create_value_label("--")
+        self.real_time_factor_label = self._create_value_label("--")
+        self.telemetry_age_label = self._create_value_label("--")
+
+        layout.addWidget(QLabel("Mode:"), 0, 0)
+        layout.addWidget(self.sim_mode_label, 0, 1)
+        layout.addWidget(QLabel("Real-time factor:"), 1, 0)
+        layout.addWidget(self.real_time_factor_label, 1, 1)
+        layout.addWidget(QLabel("Telemetry age:"), 2, 0)
+        layout.addWidget(self.telemetry_age_label, 2, 1)
 
         group.setLayout(layout)
         return group
@@ -170,6 +208,31 @@ class StatusPanel(QWidget):
         group.setLayout(layout)
         return group
 
+    def _create_sensors_group(self):
+        group = QGroupBox("Sensors")
+        layout = QGridLayout()
+        layout.setSpacing(5)
+
+        self.imu_accel_label = self._create_value_label("--")
+        self.imu_accel_label.setToolTip("Accelerometer x / y / z (m/s²)")
+        self.imu_gyro_label = self._create_value_label("--")
+        self.imu_gyro_label.setToolTip("Gyroscope x / y / z (rad/s)")
+        self.gnss_label = self._create_value_label("--")
+        self.gnss_label.setToolTip("Latitude / longitude (°)")
+        self.collision_label = self._create_value_label("0")
+
+        layout.addWidget(QLabel("Accel:"), 0, 0)
+        layout.addWidget(self.imu_accel_label, 0, 1)
+        layout.addWidget(QLabel("Gyro:"), 1, 0)
+        layout.addWidget(self.imu_gyro_label, 1, 1)
+        layout.addWidget(QLabel("GNSS:"), 2, 0)
+        layout.addWidget(self.gnss_label, 2, 1)
+        layout.addWidget(QLabel("Collisions:"), 3, 0)
+        layout.addWidget(self.collision_label, 3, 1)
+
+        group.setLayout(layout)
+        return group
+
     def _create_value_label(self, text: str = "") -> QLabel:
         label = QLabel(text)
         label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
@@ -243,6 +306,31 @@ class StatusPanel(QWidget):
 
         return 0.0
 
+    def update_camera_latency(self, percentiles: dict):
+        """更新各摄像头的显示延迟
+
+        Args:
+            percentiles: LatencyTracker.get_percentiles() 的结果，使用其中的 'total' 阶段
+        """
+        for name, label in self._latency_labels.items():
+            total = percentiles.get(name, {}).get('total')
+            if total is None:
+                label.setText("-- ms")
+            else:
+                label.setText(f"{total['p50']:.0f}/{total['p95']:.0f}/{total['p99']:.0f} ms")
+
+    def update_imu(self, accelerometer, gyroscope):
+        ax, ay, az = accelerometer
+        gx, gy, gz = gyroscope
+        self.imu_accel_label.setText(f"{ax:.1f} / {ay:.1f} / {az:.1f}")
+        self.imu_gyro_label.setText(f"{gx:.2f} / {gy:.2f} / {gz:.2f}")
+
+    def update_gnss(self, latitude: float, longitude: float):
+        self.gnss_label.setText(f"{latitude:.6f} / {longitude:.6f}")
+
+    def update_collisions(self, count: int, last_intensity: float):
+        self.collision_label.setText(f"{count} (last {last_intensity:.0f} N·s)")
+
     def update_vehicle_velocity(self, velocity: float):
         self._cached_data['velocity'] = velocity
 
@@ -251,6 +339,19 @@ class StatusPanel(QWidget):
         self._cached_data['brake'] = brake
         self._cached_data['steer'] = steer
 
+    def update_simulation_mode(self, synchronous: bool, fixed_delta_seconds: float = 0.0):
+        if synchronous:
+            self.sim_mode_label.setText(f"Sync {fixed_delta_seconds * 1000:.0f} ms")
+        else:
+            self.sim_mode_label.setText("Async")
+            self.real_time_factor_label.setText("--")
+
+    def update_real_time_factor(self, real_time_factor: float):
+        self.real_time_factor_label.setText(f"{real_time_factor:.2f}x")
+
+    def update_telemetry_age(self, age_ms: float, stale: bool = False):
+        self.telemetry_age_label.setText(f"{age_ms:.0f} ms" + (" (stale)" if stale else ""))
+
     def update_vehicle_gear(self, gear: int):
         self._cached_data['gear'] = gear
 
@@ -266,6 +367,12 @@ class StatusPanel(QWidget):
     def reset(self):
         for camera_name in self._camera_frame_times:
             self._camera_frame_times[camera_name].clear()
+        for label in self._latency_labels.values():
+            label.setText("-- ms")
+        self.imu_accel_label.setText("--")
+        self.imu_gyro_label.setText("--")
+        self.gnss_label.setText("--")
+        self.collision_label.setText("0")
 
         self._cached_data = {
             'velocity': 0.0,
@@ -285,3 +392,7 @@ class StatusPanel(QWidget):
         self.rear_fps_label.setText("-- fps")
         self.left_fps_label.setText("-- fps")
         self.right_fps_label.setText("-- fps")
+
+        self.sim_mode_label.setText("--")
+        self.real_time_factor_label.setText("--")
+        self.telemetry_age_label.setText("--")
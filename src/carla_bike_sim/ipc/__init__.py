@@ -0,0 +1,12 @@
+"""
+进程间通信模块
+
+通过共享内存把摄像头帧零拷贝地提供给本机的外部进程。
+"""
+from .shared_frames import SharedFrame, SharedFramePublisher, SharedFrameReader
+
+__all__ = [
+    'SharedFrame',
+    'SharedFramePublisher',
+    'SharedFrameReader',
+]
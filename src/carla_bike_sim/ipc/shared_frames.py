@@ -0,0 +1,320 @@
+"""
+共享内存摄像头帧
+
+SharedFramePublisher 在仿真进程中把每个摄像头的帧写入 multiprocessing.shared_memory 环形槽位，
+本机任意数量的外部进程（感知、机器学习等）可用 SharedFrameReader 零拷贝读取，无需 pickle 或套接字。
+本模块只依赖 numpy，外部进程无需安装 PySide6 或 carla。
+
+每个摄像头一个共享内存段，名称为 "<prefix>_<camera>"，布局:
+
+    段头 (SEGMENT_HEADER_DTYPE): magic, version, slot_count, slot_capacity, write_seq
+    slot_count 个槽位，每个槽位 = 槽位头 (SLOT_HEADER_DTYPE) + slot_capacity 字节图像数据
+
+写入使用 seqlock: 写第 n 帧（n 从 1 开始）时先把槽位 seq 置为奇数 2n-1，写完数据和元数据后置为 2n，
+最后把段头 write_seq 置为 n。读者读取前后比较槽位 seq，不一致或为奇数说明读到了正在写入的槽位。
+环形缓冲区有 slot_count 个槽位，因此零拷贝视图在之后的 slot_count - 1 次写入内保持有效。
+"""
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from carla_bike_sim.carla.frames import CameraFrame
+from carla_bike_sim.config import SHARED_FRAMES_PREFIX, SHARED_FRAMES_SLOT_COUNT
+
+SEGMENT_MAGIC = 0x43424653  # 'CBFS'
+SEGMENT_VERSION = 1
+
+SEGMENT_HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'),
+    ('version', '<u4'),
+    ('slot_count', '<u4'),
+    ('reserved', '<u4'),
+    ('slot_capacity', '<u8'),
+    ('write_seq', '<u8'),
+])
+
+SLOT_HEADER_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('frame_id', '<i8'),
+    ('timestamp', '<f8'),
+    ('received_at', '<f8'),
+    ('height', '<u4'),
+    ('width', '<u4'),
+    ('channels', '<u4'),
+    ('reserved', '<u4'),
+    ('nbytes', '<u8'),
+])
+
+# 图像数据按 64 字节对齐
+_ALIGNMENT = 64
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def segment_name(camera_name: str, prefix: str = SHARED_FRAMES_PREFIX) -> str:
+    return f"{prefix}_{camera_name}"
+
+
+class _Segment:
+    """一个摄像头共享内存段上的 numpy 视图"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, slot_count: int, slot_capacity: int):
+        self.shm = shm
+        self.slot_count = slot_count
+        self.slot_capacity = slot_capacity
+        self.slot_stride = _align(SLOT_HEADER_DTYPE.itemsize) + _align(slot_capacity)
+        self.header = np.ndarray((), dtype=SEGMENT_HEADER_DTYPE, buffer=shm.buf)
+
+        base = _align(SEGMENT_HEADER_DTYPE.itemsize)
+        self.slot_headers = []
+        self.slot_data = []
+        for index in range(slot_count):
+            offset = base + index * self.slot_stride
+            self.slot_headers.append(
+                np.ndarray((), dtype=SLOT_HEADER_DTYPE, buffer=shm.buf, offset=offset)
+            )
+            self.slot_data.append(
+                np.ndarray((slot_capacity,), dtype=np.uint8, buffer=shm.buf,
+                           offset=offset + _align(SLOT_HEADER_DTYPE.itemsize))
+            )
+
+    @staticmethod
+    def total_size(slot_count: int, slot_capacity: int) -> int:
+        stride = _align(SLOT_HEADER_DTYPE.itemsize) + _align(slot_capacity)
+        return _align(SEGMENT_HEADER_DTYPE.itemsize) + slot_count * stride
+
+    def release(self):
+        # 先释放所有 numpy 视图，否则 SharedMemory.close() 会因仍有导出缓冲区而失败
+        self.header = None
+        self.slot_headers = []
+        self.slot_data = []
+
+
+class SharedFramePublisher:
+    """把摄像头帧发布到共享内存环形槽位
+
+    publish() 可作为 SensorManager 的帧监听器在 CARLA 回调线程中调用，
+    每帧一次 memcpy。每个摄像头的共享内存段在收到第一帧时按该帧大小创建，
+    之后更大的帧无法放入槽位，丢弃并计数。
+    """
+
+    def __init__(self, prefix: str = SHARED_FRAMES_PREFIX, slot_count: int = SHARED_FRAMES_SLOT_COUNT):
+        if slot_count < 2:
+            raise ValueError("slot_count must be at least 2")
+        self.prefix = prefix
+        self.slot_count = slot_count
+
+        self._segments: Dict[str, _Segment] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'published': 0, 'oversized': 0}
+
+    def publish(self, frame: CameraFrame) -> bool:
+        """写入一帧
+
+        Returns:
+            bool: 帧超过槽位容量或发布器已关闭时返回 False
+        """
+        image = frame.image
+        with self._lock:
+            if self._closed:
+                return False
+            segment = self._segments.get(frame.name)
+            if segment is None:
+                segment = self._create_segment(frame.name, image.nbytes)
+            if image.nbytes > segment.slot_capacity:
+                self._stats['oversized'] += 1
+                return False
+
+            seq = int(segment.header['write_seq']) + 1
+            slot = (seq - 1) % segment.slot_count
+            slot_header = segment.slot_headers[slot]
+
+            slot_header['seq'] = 2 * seq - 1
+            segment.slot_data[slot][:image.nbytes] = image.reshape(-1) if image.flags['C_CONTIGUOUS'] \
+                else np.ascontiguousarray(image).reshape(-1)
+            slot_header['frame_id'] = frame.frame_id
+            slot_header['timestamp'] = frame.timestamp
+            slot_header['received_at'] = frame.received_at
+            slot_header['height'] = image.shape[0]
+            slot_header['width'] = image.shape[1]
+            slot_header['channels'] = image.shape[2] if image.ndim == 3 else 1
+            slot_header['nbytes'] = image.nbytes
+            slot_header['seq'] = 2 * seq
+            segment.header['write_seq'] = seq
+
+            self._stats['published'] += 1
+        return True
+
+    def camera_names(self) -> list[str]:
+        with self._lock:
+            return list(self._segments)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """关闭并删除所有共享内存段（已连接的读者持有的映射仍然有效）"""
+        with self._lock:
+            self._closed = True
+            segments = list(self._segments.values())
+            self._segments.clear()
+        for segment in segments:
+            shm = segment.shm
+            segment.release()
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _create_segment(self, camera_name: str, slot_capacity: int) -> _Segment:
+        name = segment_name(camera_name, self.prefix)
+        size = _Segment.total_size(self.slot_count, slot_capacity)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # 上次运行异常退出留下的段
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        segment = _Segment(shm, self.slot_count, slot_capacity)
+        segment.header['magic'] = SEGMENT_MAGIC
+        segment.header['version'] = SEGMENT_VERSION
+        segment.header['slot_count'] = self.slot_count
+        segment.header['slot_capacity'] = slot_capacity
+        segment.header['write_seq'] = 0
+        self._segments[camera_name] = segment
+        return segment
+
+
+@dataclass(slots=True)
+class SharedFrame:
+    """从共享内存读到的一帧
+
+    image 是共享内存上的只读视图（零拷贝），在发布器写入之后 slot_count - 1 帧内有效；
+    使用完后可调用 SharedFrameReader.is_valid() 确认期间没有被覆盖。
+    """
+    name: str
+    image: np.ndarray
+    frame_id: int
+    timestamp: float
+    received_at: float
+    seq: int
+
+
+class SharedFrameReader:
+    """读取一个摄像头的共享内存帧（可在任意本机进程中使用）"""
+
+    def __init__(self, camera_name: str, prefix: str = SHARED_FRAMES_PREFIX):
+        self.camera_name = camera_name
+        shm = self._attach(segment_name(camera_name, prefix))
+
+        header = np.ndarray((), dtype=SEGMENT_HEADER_DTYPE, buffer=shm.buf)
+        if int(header['magic']) != SEGMENT_MAGIC or int(header['version']) != SEGMENT_VERSION:
+            del header
+            shm.close()
+            raise ValueError(f"Not a shared frame segment: {shm.name}")
+        slot_count = int(header['slot_count'])
+        slot_capacity = int(header['slot_capacity'])
+        del header
+
+        self._segment = _Segment(shm, slot_count, slot_capacity)
+        self._last_seq = 0
+        self._stats = {'read': 0, 'torn': 0, 'missed': 0}
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        # 读者不拥有该段，不能让 resource_tracker 在读者进程退出时删除它
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+    @property
+    def write_seq(self) -> int:
+        """发布器已写入的帧数"""
+        return int(self._segment.header['write_seq'])
+
+    def read_latest(self, retries: int = 3) -> Optional[SharedFrame]:
+        """零拷贝读取最新一帧
+
+        Returns:
+            SharedFrame，没有比上次读取更新的帧或多次重试仍读到正在写入的槽位时返回 None
+        """
+        segment = self._segment
+        for _ in range(retries):
+            seq = int(segment.header['write_seq'])
+            if seq == 0 or seq == self._last_seq:
+                return None
+
+            slot_header = segment.slot_headers[(seq - 1) % segment.slot_count]
+            if int(slot_header['seq']) != 2 * seq:
+                self._stats['torn'] += 1
+                continue
+
+            height = int(slot_header['height'])
+            width = int(slot_header['width'])
+            channels = int(slot_header['channels'])
+            nbytes = int(slot_header['nbytes'])
+            frame_id = int(slot_header['frame_id'])
+            timestamp = float(slot_header['timestamp'])
+            received_at = float(slot_header['received_at'])
+
+            # 读取元数据期间槽位被覆盖则重试
+            if int(slot_header['seq']) != 2 * seq:
+                self._stats['torn'] += 1
+                continue
+
+            image = segment.slot_data[(seq - 1) % segment.slot_count][:nbytes]
+            image = image.reshape((height, width, channels) if channels > 1 else (height, width))
+            image.flags.writeable = False
+
+            if self._last_seq and seq > self._last_seq + 1:
+                self._stats['missed'] += seq - self._last_seq - 1
+            self._last_seq = seq
+            self._stats['read'] += 1
+            return SharedFrame(self.camera_name, image, frame_id, timestamp, received_at, seq)
+        return None
+
+    def read_latest_copy(self, retries: int = 3) -> Optional[SharedFrame]:
+        """读取最新一帧并拷贝出共享内存，拷贝完成后校验未被覆盖"""
+        for _ in range(retries):
+            frame = self.read_latest()
+            if frame is None:
+                return None
+            image = frame.image.copy()
+            if self.is_valid(frame):
+                frame.image = image
+                return frame
+            self._stats['torn'] += 1
+            self._last_seq = frame.seq - 1
+        return None
+
+    def is_valid(self, frame: SharedFrame) -> bool:
+        """frame 的槽位是否仍未被新帧覆盖"""
+        slot_header = self._segment.slot_headers[(frame.seq - 1) % self._segment.slot_count]
+        return int(slot_header['seq']) == 2 * frame.seq
+
+    def get_stats(self) -> Dict[str, int]:
+        """返回读取统计: read, torn（读到正在写入的槽位而重试）, missed（两次读取之间跳过的帧）"""
+        return dict(self._stats)
+
+    def close(self) -> None:
+        shm = self._segment.shm
+        self._segment.release()
+        try:
+            shm.close()
+        except BufferError:
+            # 调用方仍持有零拷贝视图，映射随这些视图一起释放
+            pass
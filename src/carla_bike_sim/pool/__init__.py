@@ -0,0 +1,14 @@
+"""
+会话池模块
+
+在同一台机器上的多个 CARLA 服务器（不同端口）上并行执行数据采集 episode，
+每个服务器一个独立的工作进程，由调度器把 episode 分配给空闲的服务器。
+"""
+from .episode import Episode, EpisodeResult
+from .session_pool import SessionPool
+
+__all__ = [
+    'Episode',
+    'EpisodeResult',
+    'SessionPool',
+]
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from carla_bike_sim.carla.rig import SensorSpec
+from carla_bike_sim.config import (
+    DEFAULT_VEHICLE_BLUEPRINT,
+    SESSION_POOL_EPISODE_TIMEOUT,
+    SYNC_FIXED_DELTA_SECONDS,
+    TRAFFIC_VEHICLE_DENSITY,
+    TRAFFIC_WALKER_DENSITY,
+)
+
+
+@dataclass
+class Episode:
+    """一次数据采集任务（在某个空闲服务器上执行，需可被 pickle 传给工作进程）
+
+    Attributes:
+        episode_id: 任务编号，由 SessionPool.submit() 分配
+        map_name: 地图名称，None 表示服务器的第一个可用地图
+        duration: 采集的仿真时长（秒）
+        vehicle_blueprint: 自车蓝图 ID
+        rig: 传感器描述列表，None 表示 SensorManager 的默认 rig
+        fixed_delta_seconds: 同步模式下每步的仿真时间（秒）
+        traffic: 是否生成 NPC 车辆和行人
+        traffic_vehicle_density, traffic_walker_density: 见 TrafficPopulation.spawn()
+        seed: NPC 的随机种子
+        output_dir: 会话日志根目录（每个 episode 一个子目录），None 表示不记录
+        timeout: 墙钟超时（秒），超时的 episode 记为失败
+    """
+    episode_id: int = -1
+    map_name: Optional[str] = None
+    duration: float = 30.0
+    vehicle_blueprint: str = DEFAULT_VEHICLE_BLUEPRINT
+    rig: Optional[Tuple[SensorSpec, ...]] = None
+    fixed_delta_seconds: float = SYNC_FIXED_DELTA_SECONDS
+    traffic: bool = False
+    traffic_vehicle_density: float = TRAFFIC_VEHICLE_DENSITY
+    traffic_walker_density: float = TRAFFIC_WALKER_DENSITY
+    seed: Optional[int] = None
+    output_dir: Optional[str] = None
+    timeout: float = SESSION_POOL_EPISODE_TIMEOUT
+
+
+@dataclass
+class EpisodeResult:
+    """一次 episode 的执行结果
+
+    Attributes:
+        episode_id: 对应的 Episode.episode_id
+        server: 执行该 episode 的服务器 "host:port"
+        success: 是否采集满 duration
+        error: 失败原因
+        frames: 收到的摄像头帧总数（所有摄像头）
+        sim_seconds: 实际采集的仿真时长（秒）
+        wall_seconds: 从启动仿真到停止的墙钟耗时（秒），包括加载地图和生成 actor
+        started_at: 开始时间 (time.time())
+        output_dir: 会话日志目录，未记录时为 None
+    """
+    episode_id: int
+    server: str = ""
+    success: bool = False
+    error: Optional[str] = None
+    frames: int = 0
+    sim_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    started_at: float = 0.0
+    output_dir: Optional[str] = None
@@ -0,0 +1,268 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from carla_bike_sim.config import TRAFFIC_MANAGER_PORT
+from carla_bike_sim.pool.episode import Episode, EpisodeResult
+from carla_bike_sim.pool.session_worker import run_session_worker
+
+
+@dataclass
+class _Worker:
+    """父进程中一个服务器 / 工作进程的调度状态"""
+    index: int
+    host: str
+    port: int
+    process: Optional[multiprocessing.Process] = None
+    task_queue: Optional[multiprocessing.Queue] = None
+    ready: bool = False
+    failed: Optional[str] = None
+    episode: Optional[Episode] = None
+    dispatched_at: float = 0.0
+    stats: Dict[str, float] = field(default_factory=lambda: {
+        'completed': 0, 'failed': 0, 'frames': 0, 'sim_seconds': 0.0, 'busy_seconds': 0.0,
+    })
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def is_free(self) -> bool:
+        return self.ready and self.failed is None and self.episode is None
+
+
+class SessionPool(QObject):
+    """在多个 CARLA 服务器上并行执行数据采集 episode 的会话池
+
+    每个服务器一个工作进程（见 session_worker），各自持有独立的 CarlaClientManager、世界、自车和 rig，
+    互不共享 GIL。调度线程只把 episode 交给空闲且已连接的服务器（每个服务器同一时刻只执行一个），
+    其余 episode 在父进程中排队；工作进程意外退出时，正在执行的 episode 记为失败，该服务器不再使用。
+
+    信号在调度线程中发出，跨线程连接时请使用 QueuedConnection。
+
+    Signals:
+        episode_finished(EpisodeResult): 一个 episode 执行完毕（成功或失败）
+        server_failed(str, str): 服务器连接失败或工作进程退出 ("host:port", 错误信息)
+    """
+
+    episode_finished = Signal(object)
+    server_failed = Signal(str, str)
+
+    def __init__(self, servers: Sequence[Tuple[str, int]],
+                 manager_options: Optional[dict] = None,
+                 traffic_manager_port: int = TRAFFIC_MANAGER_PORT):
+        """
+        Args:
+            servers: CARLA 服务器地址列表 [(host, port), ...]
+            manager_options: 传给每个工作进程中 CarlaClientManager 的其他参数（需可被 pickle），
+                不能包含 traffic_manager_port（每个工作进程的端口由 traffic_manager_port 参数分配）
+            traffic_manager_port: 第一个服务器的 Traffic Manager 端口，之后的服务器依次加 1
+        """
+        super().__init__()
+        if not servers:
+            raise ValueError("Session pool needs at least one server")
+        if manager_options and 'traffic_manager_port' in manager_options:
+            # 所有工作进程共用一个端口时 Traffic Manager 会相互冲突
+            raise ValueError("Pass the base Traffic Manager port as traffic_manager_port, "
+                             "not in manager_options")
+        self.manager_options = dict(manager_options or {})
+        self.traffic_manager_port = traffic_manager_port
+        self._workers = [_Worker(index, host, port) for index, (host, port) in enumerate(servers)]
+        # spawn: 工作进程不继承父进程的 Qt / CARLA 客户端线程
+        self._context = multiprocessing.get_context('spawn')
+        self._result_queue: Optional[multiprocessing.Queue] = None
+
+        self._lock = threading.Condition()
+        self._pending: Deque[Episode] = deque()
+        self._results: List[EpisodeResult] = []
+        self._next_episode_id = 0
+        self._scheduler: Optional[threading.Thread] = None
+        self._running = False
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """启动所有工作进程和调度线程（连接在工作进程中进行，不阻塞调用方）"""
+        if self._running:
+            return
+        self._result_queue = self._context.Queue()
+        for worker in self._workers:
+            options = {**self.manager_options, 'traffic_manager_port': self.traffic_manager_port + worker.index}
+            worker.task_queue = self._context.Queue()
+            worker.process = self._context.Process(
+                target=run_session_worker,
+                args=(worker.index, worker.host, worker.port, worker.task_queue, self._result_queue, options),
+                name=f"carla-session-{worker.name}",
+                daemon=True,
+            )
+            worker.process.start()
+
+        self._running = True
+        self._started_at = time.perf_counter()
+        self._stopped_at = 0.0
+        self._scheduler = threading.Thread(target=self._run_scheduler, name="session-pool-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def submit(self, episode: Episode) -> int:
+        """排队一个 episode，返回分配的 episode_id"""
+        with self._lock:
+            episode = replace(episode, episode_id=self._next_episode_id)
+            self._next_episode_id += 1
+            self._pending.append(episode)
+            self._dispatch()
+            return episode.episode_id
+
+    def submit_many(self, episodes: Iterable[Episode]) -> List[int]:
+        return [self.submit(episode) for episode in episodes]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交的 episode 执行完毕（或没有可用的服务器）
+
+        Returns:
+            bool: 超时仍有 episode 未完成时返回 False
+        """
+        with self._lock:
+            return self._lock.wait_for(self._is_idle, timeout)
+
+    def results(self) -> List[EpisodeResult]:
+        with self._lock:
+            return list(self._results)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """丢弃排队中的 episode，等待正在执行的 episode 结束后停止所有工作进程"""
+        if not self._running:
+            return
+        with self._lock:
+            self._pending.clear()
+        for worker in self._workers:
+            if worker.process is not None and worker.process.is_alive():
+                worker.task_queue.put(None)
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(timeout)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+        self._running = False
+        self._stopped_at = time.perf_counter()
+        self._scheduler.join()
+        self._scheduler = None
+
+    def get_stats(self) -> dict:
+        """返回会话池的汇总吞吐量和每个服务器的统计
+
+        Returns:
+            dict: servers, ready, busy, queued, completed, failed, frames,
+                episodes_per_hour, frames_per_s, sim_speed (仿真秒 / 墙钟秒，所有服务器之和),
+                per_server: {"host:port": {completed, failed, frames, sim_seconds, utilization, status}}
+        """
+        with self._lock:
+            if self._started_at == 0.0:
+                elapsed = 0.0
+            else:
+                elapsed = (self._stopped_at or time.perf_counter()) - self._started_at
+            completed = sum(worker.stats['completed'] for worker in self._workers)
+            frames = sum(worker.stats['frames'] for worker in self._workers)
+            sim_seconds = sum(worker.stats['sim_seconds'] for worker in self._workers)
+            per_server = {}
+            for worker in self._workers:
+                stats = dict(worker.stats)
+                stats['utilization'] = stats.pop('busy_seconds') / elapsed if elapsed > 0 else 0.0
+                stats['status'] = ('failed' if worker.failed is not None else
+                                   'busy' if worker.episode is not None else
+                                   'ready' if worker.ready else 'connecting')
+                per_server[worker.name] = stats
+            return {
+                'servers': len(self._workers),
+                'ready': sum(1 for worker in self._workers if worker.ready and worker.failed is None),
+                'busy': sum(1 for worker in self._workers if worker.episode is not None),
+                'queued': len(self._pending),
+                'completed': completed,
+                'failed': sum(worker.stats['failed'] for worker in self._workers),
+                'frames': frames,
+                'episodes_per_hour': completed * 3600.0 / elapsed if elapsed > 0 else 0.0,
+                'frames_per_s': frames / elapsed if elapsed > 0 else 0.0,
+                'sim_speed': sim_seconds / elapsed if elapsed > 0 else 0.0,
+                'per_server': per_server,
+            }
+
+    def _is_idle(self) -> bool:
+        """没有正在执行的 episode，且排队中的 episode 已无服务器可用（调用方需持有锁）"""
+        if any(worker.episode is not None for worker in self._workers):
+            return False
+        return not self._pending or all(worker.failed is not None for worker in self._workers)
+
+    def _dispatch(self) -> None:
+        """把排队中的 episode 交给空闲的服务器（调用方需持有锁）"""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.is_free:
+                worker.episode = self._pending.popleft()
+                worker.dispatched_at = time.perf_counter()
+                worker.task_queue.put(worker.episode)
+
+    def _run_scheduler(self):
+        while self._running:
+            try:
+                kind, index, payload = self._result_queue.get(timeout=0.5)
+            except Exception:
+                self._check_workers()
+                continue
+
+            worker = self._workers[index]
+            if kind == 'ready':
+                with self._lock:
+                    worker.ready = True
+                    self._dispatch()
+            elif kind == 'failed':
+                self._mark_failed(worker, payload)
+            elif kind == 'result':
+                self._record_result(worker, payload)
+
+    def _record_result(self, worker: _Worker, result: EpisodeResult) -> None:
+        with self._lock:
+            worker.episode = None
+            stats = worker.stats
+            stats['busy_seconds'] += time.perf_counter() - worker.dispatched_at
+            stats['completed' if result.success else 'failed'] += 1
+            stats['frames'] += result.frames
+            stats['sim_seconds'] += result.sim_seconds
+            self._results.append(result)
+            self._dispatch()
+            self._lock.notify_all()
+        self.episode_finished.emit(result)
+
+    def _mark_failed(self, worker: _Worker, error: str) -> None:
+        """服务器不可用: 正在执行的 episode 记为失败，排队中的 episode 留给其他服务器"""
+        with self._lock:
+            worker.failed = error
+            episode = worker.episode
+            worker.episode = None
+            if episode is not None:
+                worker.stats['failed'] += 1
+                worker.stats['busy_seconds'] += time.perf_counter() - worker.dispatched_at
+                result = EpisodeResult(episode.episode_id, server=worker.name, error=error)
+                self._results.append(result)
+            self._lock.notify_all()
+        print(f"Session pool server {worker.name} unavailable: {error}")
+        self.server_failed.emit(worker.name, error)
+        if episode is not None:
+            self.episode_finished.emit(result)
+
+    def _check_workers(self) -> None:
+        for worker in self._workers:
+            if worker.failed is None and worker.process is not None and not worker.process.is_alive():
+                # 结果队列中可能还有该进程退出前写入的消息，下一轮再检查
+                if worker.process.exitcode == 0 and worker.episode is None:
+                    continue
+                self._mark_failed(worker, f"Worker process exited with code {worker.process.exitcode}")
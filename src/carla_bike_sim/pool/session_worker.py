@@ -0,0 +1,163 @@
+"""
+会话池的工作进程
+
+每个工作进程连接一个 CARLA 服务器，持有自己的 CarlaClientManager（世界、自车和传感器 rig），
+从任务队列中逐个取出 Episode 执行，结果写入结果队列。工作进程没有 GUI: 仿真以同步模式、
+尽可能快地步进，摄像头帧通过帧监听器计数（并可写入会话日志）。
+
+结果队列中的消息:
+    ('ready', worker_index, 服务器版本)       连接成功，可以接收 episode
+    ('failed', worker_index, 错误信息)        连接失败，进程退出
+    ('result', worker_index, EpisodeResult)  一个 episode 执行完毕（成功或失败）
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QCoreApplication
+
+from carla_bike_sim.carla.carla_client_manager import CarlaClientManager
+from carla_bike_sim.carla.frames import CameraFrame
+from carla_bike_sim.carla.metadata_cache import MetadataCache
+from carla_bike_sim.pool.episode import Episode, EpisodeResult
+from carla_bike_sim.recording import SessionLogWriter
+
+
+class _FrameCounter:
+    """帧监听器: 统计各摄像头回调线程收到的帧数"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, frame: CameraFrame) -> None:
+        with self._lock:
+            self.count += 1
+
+
+def run_session_worker(worker_index: int, host: str, port: int, task_queue, result_queue,
+                       manager_options: Optional[dict] = None) -> None:
+    """工作进程入口（multiprocessing 的 target）
+
+    Args:
+        worker_index: 工作进程编号，写入每条结果消息
+        host, port: CARLA 服务器地址
+        task_queue: Episode 队列，None 表示退出
+        result_queue: 结果消息队列，见模块说明
+        manager_options: 传给 CarlaClientManager 的其他参数（如 traffic_manager_port、client_factory）
+    """
+    app = QCoreApplication.instance() or QCoreApplication([])
+    manager = CarlaClientManager(host=host, port=port, metadata_cache=MetadataCache(), **(manager_options or {}))
+    errors = []
+    manager.simulation_error.connect(errors.append)
+
+    if not manager.connect():
+        result_queue.put(('failed', worker_index, errors[-1] if errors else f"Failed to connect to {host}:{port}"))
+        return
+    result_queue.put(('ready', worker_index, manager.server_version))
+
+    try:
+        while True:
+            episode = task_queue.get()
+            if episode is None:
+                break
+            errors.clear()
+            result = run_episode(manager, episode, errors)
+            result.server = f"{host}:{port}"
+            result_queue.put(('result', worker_index, result))
+            app.processEvents()
+    finally:
+        manager.disconnect()
+
+
+def run_episode(manager: CarlaClientManager, episode: Episode, errors: list) -> EpisodeResult:
+    """在已连接的 manager 上执行一个 episode，直到仿真时间达到 episode.duration 或墙钟超时
+
+    任何异常（如会话日志目录不可写）都记录为失败的 EpisodeResult，仿真总会被停止，
+    工作进程可以继续执行下一个 episode。
+    """
+    result = EpisodeResult(episode_id=episode.episode_id, started_at=time.time())
+    counter = _FrameCounter()
+    session_log: Optional[SessionLogWriter] = None
+    started = time.perf_counter()
+
+    try:
+        simulation_started = manager.start_simulation(
+            map_name=episode.map_name,
+            vehicle_blueprint=episode.vehicle_blueprint,
+            synchronous=True,
+            fixed_delta_seconds=episode.fixed_delta_seconds,
+            realtime=False,
+            rig=episode.rig,
+            traffic=episode.traffic,
+            traffic_vehicle_density=episode.traffic_vehicle_density,
+            traffic_walker_density=episode.traffic_walker_density,
+            traffic_seed=episode.seed,
+        )
+    except Exception as e:
+        simulation_started = False
+        errors.append(f"Failed to start simulation: {e}")
+    if not simulation_started:
+        _stop_simulation(manager)
+        return _finish(result, started, error=errors[-1] if errors else "Failed to start simulation")
+
+    sensor_manager = manager.sensor_manager
+    error = None
+    first_timestamp = None
+    last_frame_id = -1
+    deadline = started + episode.timeout
+    try:
+        sensor_manager.add_frame_listener(counter)
+        if episode.output_dir is not None:
+            session_log = SessionLogWriter(Path(episode.output_dir) / f"episode_{episode.episode_id}")
+            session_log.open()
+            sensor_manager.add_frame_listener(session_log.log_camera_frame)
+            result.output_dir = str(session_log.session_dir)
+
+        while True:
+            telemetry = manager.get_vehicle_telemetry()
+            if telemetry is not None and telemetry.frame_id != last_frame_id:
+                last_frame_id = telemetry.frame_id
+                if first_timestamp is None:
+                    first_timestamp = telemetry.timestamp
+                result.sim_seconds = telemetry.timestamp - first_timestamp
+                if session_log is not None:
+                    session_log.log_telemetry(telemetry.as_sample())
+                if result.sim_seconds >= episode.duration:
+                    break
+            if time.perf_counter() > deadline:
+                error = f"Episode timed out after {episode.timeout:.0f} s"
+                break
+            time.sleep(0.01)
+    except Exception as e:
+        error = f"Episode failed: {e}"
+    finally:
+        sensor_manager.remove_frame_listener(counter)
+        if session_log is not None:
+            sensor_manager.remove_frame_listener(session_log.log_camera_frame)
+            try:
+                session_log.close()
+            except Exception as e:
+                print(f"Error closing session log: {e}")
+                if error is None:
+                    error = f"Failed to close session log: {e}"
+        _stop_simulation(manager)
+
+    result.frames = counter.count
+    return _finish(result, started, error=error)
+
+
+def _stop_simulation(manager: CarlaClientManager) -> None:
+    """停止仿真，异常只打印，不影响 episode 结果的返回"""
+    try:
+        manager.stop_simulation()
+    except Exception as e:
+        print(f"Error stopping simulation: {e}")
+
+
+def _finish(result: EpisodeResult, started: float, error: Optional[str] = None) -> EpisodeResult:
+    result.wall_seconds = time.perf_counter() - started
+    result.success = error is None
+    result.error = error
+    return result
@@ -0,0 +1,22 @@
+"""
+图像处理模块
+
+在工作线程中对摄像头帧做显示前的处理（如广角校正、鸟瞰图合成），以及激光雷达点云的俯视栅格化。
+"""
+from .birds_eye_view import BEV_CAMERA_NAME, BevKey, BirdsEyeViewStage, build_bev_tables
+from .latest_worker import LatestWinsWorker
+from .lidar_raster import LidarRasterizer
+from .rectification import RectificationStage, RemapCache, RemapKey, build_remap_tables
+
+__all__ = [
+    'BEV_CAMERA_NAME',
+    'BevKey',
+    'BirdsEyeViewStage',
+    'build_bev_tables',
+    'LatestWinsWorker',
+    'LidarRasterizer',
+    'RectificationStage',
+    'RemapCache',
+    'RemapKey',
+    'build_remap_tables',
+]
@@ -0,0 +1,291 @@
+"""
+鸟瞰图 (BEV) 合成
+
+根据 rig 中各摄像头相对车辆的安装位置和角度，对地面做逆透视映射 (IPM)：
+鸟瞰图的每个像素对应车辆坐标系中地面上的一点，投影到每个摄像头得到该摄像头图像中的采样坐标。
+这些坐标（cv2.remap 查找表）和各摄像头的融合权重只与 rig 和鸟瞰图参数有关，
+预先计算一次后缓存在内存和磁盘中，每个同步帧只需对每个摄像头做一次 remap 再加权求和。
+
+车辆坐标系与 CARLA 相同: x 向前, y 向右, z 向上（米）；
+鸟瞰图上方为车辆前方，中心为车辆原点。
+"""
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2 as cv
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from carla_bike_sim.carla.frames import CameraBundle, CameraFrame
+from carla_bike_sim.carla.rig import SensorSpec
+from carla_bike_sim.config import (
+    BEV_BLEND,
+    BEV_CACHE_DIR,
+    BEV_GROUND_Z,
+    BEV_RANGE_M,
+    BEV_SIZE_PX,
+)
+from carla_bike_sim.processing.latest_worker import LatestWinsWorker
+from carla_bike_sim.processing.rectification import RemapCache
+
+BLEND_MODES = ('feather', 'nearest')
+
+BEV_CAMERA_NAME = 'bev'
+
+
+@dataclass(frozen=True)
+class BevKey:
+    """一组鸟瞰图查找表的参数
+
+    Attributes:
+        cameras: 每个摄像头的 (name, x, y, z, pitch, yaw, roll, fov, width, height)
+        size_px: 鸟瞰图边长（像素）
+        range_m: 鸟瞰图覆盖范围的一半（米），即车辆到边缘的距离
+        ground_z: 地面在车辆坐标系中的高度（米）
+        blend: 融合方式，见 BLEND_MODES
+    """
+    cameras: Tuple[tuple, ...]
+    size_px: int
+    range_m: float
+    ground_z: float
+    blend: str
+
+    @classmethod
+    def from_rig(cls, specs: Sequence[SensorSpec], size_px: int = BEV_SIZE_PX,
+                 range_m: float = BEV_RANGE_M, ground_z: float = BEV_GROUND_Z,
+                 blend: str = BEV_BLEND) -> 'BevKey':
+        cameras = tuple(
+            (spec.name, spec.x, spec.y, spec.z, spec.pitch, spec.yaw, spec.roll,
+             spec.fov, spec.image_size_x, spec.image_size_y)
+            # 只用 RGB 摄像头: 同一位置的语义分割 / 深度摄像头会按权重混入类别颜色和深度灰度
+            for spec in specs if spec.is_rgb_camera
+        )
+        return cls(cameras, size_px, range_m, ground_z, blend)
+
+    @property
+    def camera_names(self) -> list[str]:
+        return [camera[0] for camera in self.cameras]
+
+    def cache_name(self) -> str:
+        digest = hashlib.sha1(repr(self).encode('utf-8')).hexdigest()[:16]
+        return f"bev_{self.size_px}px_{self.range_m:g}m_{self.blend}_{digest}.npz"
+
+
+def _rotation_matrix(pitch: float, yaw: float, roll: float) -> np.ndarray:
+    """CARLA Rotation 的旋转矩阵（列为摄像头的 前/右/上 方向在车辆坐标系中的表示）"""
+    cp, sp = math.cos(math.radians(pitch)), math.sin(math.radians(pitch))
+    cy, sy = math.cos(math.radians(yaw)), math.sin(math.radians(yaw))
+    cr, sr = math.cos(math.radians(roll)), math.sin(math.radians(roll))
+    return np.array([
+        [cp * cy, cy * sp * sr - sy * cr, -cy * sp * cr - sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, -sy * sp * cr + cy * sr],
+        [sp, -cp * sr, cp * cr],
+    ])
+
+
+def build_bev_tables(key: BevKey) -> Tuple[np.ndarray, ...]:
+    """计算每个摄像头的 remap 表和融合权重
+
+    Returns:
+        按 key.cameras 顺序依次为 (bbox, map1, map2, weight)。
+        bbox 为 int32 [top, bottom, left, right]，是该摄像头权重非零区域在鸟瞰图中的范围，
+        remap 表和 weight (float32, (h, w, 1)) 都只覆盖该区域，以减少每帧的 remap 工作量。
+        所有摄像头的权重在每个像素上之和为 1（没有摄像头看到的像素为 0）
+    """
+    if key.blend not in BLEND_MODES:
+        raise ValueError(f"Unsupported BEV blend mode: {key.blend}")
+
+    size = key.size_px
+    meters_per_pixel = 2.0 * key.range_m / size
+    centers = (np.arange(size, dtype=np.float64) + 0.5) * meters_per_pixel
+    # 行 -> x（上方为前方），列 -> y（右侧为右方）
+    ground_x, ground_y = np.meshgrid(key.range_m - centers, centers - key.range_m, indexing='ij')
+    ground = np.stack([ground_x, ground_y, np.full_like(ground_x, key.ground_z)], axis=-1)
+
+    maps = []
+    scores = []
+    for _, x, y, z, pitch, yaw, roll, fov, width, height in key.cameras:
+        rotation = _rotation_matrix(pitch, yaw, roll)
+        # 车辆坐标 -> 摄像头坐标 (前, 右, 上)
+        local = (ground - np.array([x, y, z])) @ rotation
+        forward, right, up = local[..., 0], local[..., 1], local[..., 2]
+
+        focal = width / (2.0 * math.tan(math.radians(fov) / 2.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = focal * right / forward + width / 2.0 - 0.5
+            v = -focal * up / forward + height / 2.0 - 0.5
+        valid = (forward > 0.1) & (u >= 0) & (u <= width - 1) & (v >= 0) & (v <= height - 1)
+
+        # 越靠近光轴、越近的地面点越清晰
+        distance = np.linalg.norm(local, axis=-1)
+        score = np.where(valid, (forward / distance) ** 4 / np.maximum(distance, 1.0), 0.0)
+
+        map_x = np.where(valid, u, -1.0).astype(np.float32)
+        map_y = np.where(valid, v, -1.0).astype(np.float32)
+        maps.append(cv.convertMaps(map_x, map_y, cv.CV_16SC2))
+        scores.append(score)
+
+    scores = np.stack(scores)
+    if key.blend == 'nearest':
+        best = np.argmax(scores, axis=0)
+        weights = (np.arange(len(scores))[:, None, None] == best) & (scores > 0)
+        weights = weights.astype(np.float32)
+    else:
+        total = scores.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(total > 0, scores / total, 0.0).astype(np.float32)
+
+    tables = []
+    for (map1, map2), weight in zip(maps, weights):
+        rows = np.flatnonzero(weight.any(axis=1))
+        columns = np.flatnonzero(weight.any(axis=0))
+        if len(rows) == 0:
+            top = bottom = left = right = 0
+        else:
+            top, bottom = rows[0], rows[-1] + 1
+            left, right = columns[0], columns[-1] + 1
+        region = (slice(top, bottom), slice(left, right))
+        tables.extend([
+            np.array([top, bottom, left, right], dtype=np.int32),
+            np.ascontiguousarray(map1[region]),
+            np.ascontiguousarray(map2[region]),
+            np.ascontiguousarray(weight[region][..., None]),
+        ])
+    return tuple(tables)
+
+
+class BirdsEyeViewStage(QObject):
+    """把同步的四路摄像头 bundle 合成为一张鸟瞰图
+
+    submit_bundle() 可直接连接 SensorManager.camera_bundle_ready（DirectConnection），
+    只保存最新的 bundle；合成在单独的工作线程中进行，来不及处理的 bundle 计为 superseded
+    （见 LatestWinsWorker）。
+
+    Signals:
+        frame_composed(CameraFrame): 合成的鸟瞰图，名称为 BEV_CAMERA_NAME，在工作线程中发出
+    """
+
+    frame_composed = Signal(object)
+
+    def __init__(self, cache: Optional[RemapCache] = None):
+        super().__init__()
+        self.cache = cache if cache is not None else RemapCache(BEV_CACHE_DIR)
+
+        self._key: Optional[BevKey] = None
+        # 摄像头名称 -> (区域切片, map1, map2, 权重)
+        self._tables: Dict[str, tuple] = {}
+        # (摄像头名称, 通道数) -> 按通道展开的权重，供 cv2.multiply 使用
+        self._channel_weights: Dict[Tuple[str, int], np.ndarray] = {}
+
+        self._lock = threading.Lock()
+        self._worker = LatestWinsWorker(self._run, thread_name_prefix="birds-eye-view")
+        self._stats = {'composed': 0, 'partial': 0, 'compose_ms': 0.0, 'max_ms': 0.0}
+
+    def configure(self, specs: Sequence[SensorSpec], **params) -> None:
+        """按 rig 加载（或计算）查找表
+
+        Args:
+            specs: 传感器描述（非 RGB 摄像头会被忽略）
+            **params: BevKey.from_rig 的其他参数（size_px, range_m, ground_z, blend）
+        """
+        key = BevKey.from_rig(specs, **params)
+        tables = self.cache.get(key, build_bev_tables)
+        camera_tables = {}
+        for index, name in enumerate(key.camera_names):
+            bbox, map1, map2, weight = tables[index * 4:index * 4 + 4]
+            top, bottom, left, right = (int(value) for value in bbox)
+            if bottom > top and right > left:
+                camera_tables[name] = ((slice(top, bottom), slice(left, right)), map1, map2, weight)
+        with self._lock:
+            self._key = key
+            self._tables = camera_tables
+            self._channel_weights = {}
+
+    def start(self) -> None:
+        self._worker.start()
+
+    def stop(self) -> None:
+        """丢弃尚未合成的 bundle 并等待进行中的合成结束"""
+        self._worker.stop()
+
+    def submit_bundle(self, bundle: CameraBundle) -> None:
+        self._worker.submit(BEV_CAMERA_NAME, bundle)
+
+    def compose(self, bundle: CameraBundle) -> Optional[np.ndarray]:
+        """同步合成一张鸟瞰图 (BGR 或 BGRA，与输入相同)，未配置时返回 None"""
+        with self._lock:
+            tables = self._tables
+            key = self._key
+        if key is None:
+            return None
+
+        present = [name for name in tables if name in bundle.frames]
+        if not present:
+            return None
+        sample = bundle.frames[present[0]].image
+        channels = sample.shape[2] if sample.ndim == 3 else 1
+
+        size = key.size_px
+        accumulator = np.zeros((size, size, channels), dtype=np.float32)
+        partial = len(present) < len(tables)
+        weight_sum = np.zeros((size, size, 1), dtype=np.float32) if partial else None
+
+        for name in present:
+            region, map1, map2, weight = tables[name]
+            warped = cv.remap(bundle.frames[name].image, map1, map2, cv.INTER_LINEAR,
+                              borderMode=cv.BORDER_CONSTANT)
+            accumulator[region] += cv.multiply(
+                warped, self._expanded_weight(name, weight, channels), dtype=cv.CV_32F
+            ).reshape(warped.shape[0], warped.shape[1], channels)
+            if partial:
+                weight_sum[region] += weight
+
+        if partial:
+            # 缺少摄像头时按实际参与的权重重新归一化
+            np.divide(accumulator, weight_sum, out=accumulator, where=weight_sum > 0)
+        return accumulator.astype(np.uint8)
+
+    def _expanded_weight(self, name: str, weight: np.ndarray, channels: int) -> np.ndarray:
+        expanded = self._channel_weights.get((name, channels))
+        if expanded is None:
+            expanded = np.repeat(weight, channels, axis=2)
+            if channels == 1:
+                expanded = expanded[..., 0]
+            self._channel_weights[(name, channels)] = expanded
+        return expanded
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回合成统计: composed, partial, superseded, avg_ms, max_ms"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['superseded'] = self._worker.superseded
+        compose_ms = stats.pop('compose_ms')
+        stats['avg_ms'] = compose_ms / stats['composed'] if stats['composed'] else 0.0
+        return stats
+
+    def _run(self, bundle: CameraBundle):
+        start = time.perf_counter()
+        try:
+            image = self.compose(bundle)
+        except Exception as e:
+            print(f"Error composing bird's-eye view: {e}")
+            return
+        if image is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        with self._lock:
+            self._stats['composed'] += 1
+            if not bundle.is_complete:
+                self._stats['partial'] += 1
+            self._stats['compose_ms'] += elapsed_ms
+            self._stats['max_ms'] = max(self._stats['max_ms'], elapsed_ms)
+
+        received_at = min(frame.received_at for frame in bundle.frames.values())
+        self.frame_composed.emit(
+            CameraFrame(BEV_CAMERA_NAME, image, bundle.frame_id, bundle.timestamp, received_at)
+        )
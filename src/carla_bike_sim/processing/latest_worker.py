@@ -0,0 +1,131 @@
+"""
+最新任务优先的工作线程池
+
+显示前的各处理阶段（缩放、广角校正、鸟瞰图合成）都只关心每路图像的最新一帧:
+同一个键（如摄像头名称）同时最多只有一个任务在执行，执行期间提交的新任务只保留最新一个，
+被替换的任务计为 superseded。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+
+class LatestWinsWorker:
+    """按键只保留最新任务的工作线程池
+
+    每个任务恰好结束一次: 执行完毕、被更新的任务替换或在 stop() 时被丢弃，
+    之后都会调用 release(job)（如归还帧缓冲区）。
+    process 和 release 在工作线程中执行（被替换的任务在提交线程中释放）。
+
+    线程安全：submit() 可在任意线程中调用。
+    """
+
+    def __init__(self,
+                 process: Callable[[object], None],
+                 release: Optional[Callable[[object], None]] = None,
+                 max_workers: int = 1,
+                 thread_name_prefix: str = "latest-wins"):
+        """
+        Args:
+            process: 执行一个任务，异常会被打印，不影响后续任务
+            release: 任务结束时调用，None 表示不需要释放
+            max_workers: 工作线程数（不同键的任务可并行执行）
+            thread_name_prefix: 工作线程名称前缀
+        """
+        self._process = process
+        self._release = release
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = False
+        self._busy: set = set()
+        # 键 -> 等待执行的最新任务
+        self._next: Dict[Hashable, object] = {}
+        self._superseded = 0
+
+    @property
+    def superseded(self) -> int:
+        with self._lock:
+            return self._superseded
+
+    @property
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._running
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix=self.thread_name_prefix)
+            self._running = True
+
+    def stop(self) -> None:
+        """丢弃等待中的任务并等待执行中的任务结束，之后可再次 start()"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            executor = self._executor
+            self._executor = None
+            pending = list(self._next.values())
+            self._next.clear()
+        for job in pending:
+            self._finish(job)
+        executor.shutdown(wait=True)
+
+    def submit(self, key: Hashable, job: object) -> bool:
+        """提交任务；该键已有任务在执行时替换等待中的任务
+
+        Returns:
+            bool: 未运行时返回 False（任务立即释放）
+        """
+        released = None
+        accepted = True
+        with self._lock:
+            if not self._running:
+                released = job
+                accepted = False
+            elif key in self._busy:
+                released = self._next.get(key)
+                self._next[key] = job
+                if released is not None:
+                    self._superseded += 1
+            else:
+                self._busy.add(key)
+                self._executor.submit(self._run, key, job)
+
+        if released is not None:
+            self._finish(released)
+        return accepted
+
+    def _run(self, key: Hashable, job: object):
+        while True:
+            try:
+                self._process(job)
+            except Exception as e:
+                print(f"Error in {self.thread_name_prefix} worker ({key}): {e}")
+            finally:
+                self._finish(job)
+
+            with self._lock:
+                pending = self._next.pop(key, None)
+                if pending is None or not self._running:
+                    self._busy.discard(key)
+                    break
+            job = pending
+
+        # stop() 期间留下的任务也要释放
+        if pending is not None:
+            self._finish(pending)
+
+    def _finish(self, job: object) -> None:
+        if self._release is None:
+            return
+        try:
+            self._release(job)
+        except Exception as e:
+            print(f"Error releasing {self.thread_name_prefix} job: {e}")
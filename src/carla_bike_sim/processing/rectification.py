@@ -0,0 +1,299 @@
+"""
+广角摄像头校正
+
+CARLA 的 sensor.camera.rgb 是理想针孔（直线投影）模型，没有镜头畸变参数；
+FOV 160 时画面边缘被严重拉伸（边缘像素对应的角度远小于中心像素）。
+这里把针孔图像重投影到拉伸更均匀的目标投影:
+
+    - 'cylindrical': 柱面投影，水平方向按角度均匀采样，垂直方向保持直线
+    - 'equirectangular': 等距柱状投影，水平和垂直方向都按角度均匀采样
+    - 'pinhole': 更窄 FOV 的针孔投影（裁剪中心区域）
+
+重投影的 cv2.remap 查找表只与 (分辨率, FOV, 目标投影) 有关，按此计算一次后缓存在内存和磁盘中，
+之后每帧只需一次 cv2.remap（执行期间释放 GIL），在工作线程中完成。
+"""
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import cv2 as cv
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from carla_bike_sim.carla.frames import CameraFrame
+from carla_bike_sim.config import (
+    RECTIFICATION_OUTPUT_FOV,
+    RECTIFICATION_PROJECTION,
+    REMAP_CACHE_DIR,
+)
+from carla_bike_sim.processing.latest_worker import LatestWinsWorker
+
+PROJECTIONS = ('cylindrical', 'equirectangular', 'pinhole')
+
+
+@dataclass(frozen=True)
+class RemapKey:
+    """一组查找表的参数
+
+    Attributes:
+        width, height: 源图像尺寸（输出尺寸与之相同）
+        fov: 源针孔摄像头的水平 FOV（度）
+        projection: 目标投影，见 PROJECTIONS
+        output_fov: 目标投影的水平 FOV（度）
+    """
+    width: int
+    height: int
+    fov: float
+    projection: str
+    output_fov: float
+
+    def cache_name(self) -> str:
+        text = f"{self.width}x{self.height}_fov{self.fov:g}_{self.projection}_out{self.output_fov:g}"
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]
+        return f"remap_{text}_{digest}.npz"
+
+
+def build_remap_tables(key: RemapKey) -> Tuple[np.ndarray, np.ndarray]:
+    """计算 cv2.remap 查找表（定点格式 CV_16SC2 + CV_16UC1，remap 时比浮点表更快）"""
+    if key.projection not in PROJECTIONS:
+        raise ValueError(f"Unsupported projection: {key.projection}")
+    if not 0 < key.fov < 180:
+        raise ValueError("Source FOV must be between 0 and 180 degrees")
+    if key.projection == 'pinhole' and not 0 < key.output_fov < 180:
+        raise ValueError("Pinhole output FOV must be between 0 and 180 degrees")
+
+    width, height = key.width, key.height
+    cx, cy = width / 2.0, height / 2.0
+    focal = cx / math.tan(math.radians(key.fov) / 2.0)
+
+    u = np.arange(width, dtype=np.float64) + 0.5 - cx
+    v = np.arange(height, dtype=np.float64) + 0.5 - cy
+    uu, vv = np.meshgrid(u, v)
+
+    half_output_fov = math.radians(key.output_fov) / 2.0
+    if key.projection == 'pinhole':
+        output_focal = cx / math.tan(half_output_fov)
+        x, y, z = uu, vv, np.full_like(uu, output_focal)
+    else:
+        # 输出图像每像素对应的角度，垂直方向与水平方向相同
+        radians_per_pixel = 2.0 * half_output_fov / width
+        theta = uu * radians_per_pixel
+        if key.projection == 'cylindrical':
+            x, y, z = np.sin(theta), vv * radians_per_pixel, np.cos(theta)
+        else:
+            phi = vv * radians_per_pixel
+            x, y, z = np.cos(phi) * np.sin(theta), np.sin(phi), np.cos(phi) * np.cos(theta)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        map_x = (focal * x / z + cx - 0.5).astype(np.float32)
+        map_y = (focal * y / z + cy - 0.5).astype(np.float32)
+    # 摄像头后方的光线没有对应像素
+    behind = z <= 0
+    map_x[behind] = -1.0
+    map_y[behind] = -1.0
+
+    return cv.convertMaps(map_x, map_y, cv.CV_16SC2)
+
+
+class RemapCache:
+    """查找表缓存（内存 + 磁盘 .npz）
+
+    键需要可哈希并提供 cache_name()（磁盘文件名）；缓存的值是一组 numpy 数组，
+    除校正用的 RemapKey 外，也用于鸟瞰图等其他预计算查找表。
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = REMAP_CACHE_DIR):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._tables: Dict[object, Tuple[np.ndarray, ...]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'builds': 0, 'build_ms': 0.0}
+
+    def get(self, key, builder: Callable[[object], Tuple[np.ndarray, ...]] = build_remap_tables
+            ) -> Tuple[np.ndarray, ...]:
+        """返回 key 对应的查找表，内存和磁盘都没有时调用 builder(key) 计算并保存"""
+        with self._lock:
+            tables = self._tables.get(key)
+            if tables is not None:
+                self._stats['memory_hits'] += 1
+                return tables
+
+            tables = self._load(key)
+            if tables is not None:
+                self._stats['disk_hits'] += 1
+            else:
+                start = time.perf_counter()
+                tables = tuple(builder(key))
+                self._stats['builds'] += 1
+                self._stats['build_ms'] += (time.perf_counter() - start) * 1000.0
+                self._save(key, tables)
+
+            self._tables[key] = tables
+            return tables
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回缓存统计: memory_hits, disk_hits, builds, build_ms（累计计算耗时）"""
+        with self._lock:
+            return dict(self._stats)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+    def _load(self, key) -> Optional[Tuple[np.ndarray, ...]]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / key.cache_name()
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                return tuple(data[f'arr_{index}'] for index in range(len(data.files)))
+        except Exception as e:
+            print(f"Error loading remap cache {path}: {e}")
+            return None
+
+    def _save(self, key, tables: Tuple[np.ndarray, ...]):
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / key.cache_name()
+            # 先写临时文件再替换，避免并发读到不完整的文件
+            tmp_path = path.with_suffix('.tmp.npz')
+            np.savez(tmp_path, *tables)
+            tmp_path.replace(path)
+        except OSError as e:
+            print(f"Error saving remap cache: {e}")
+
+
+class RectificationStage(QObject):
+    """在工作线程中校正指定摄像头的帧
+
+    每个摄像头同时最多只有一个校正任务，任务进行中提交的新帧只保留最新一帧（计为 superseded，
+    见 LatestWinsWorker）。
+
+    Signals:
+        frame_rectified(CameraFrame): 校正后的帧（image 为新数组），在工作线程中发出
+    """
+
+    frame_rectified = Signal(object)
+
+    def __init__(self,
+                 camera_fovs: Optional[Dict[str, float]] = None,
+                 projection: str = RECTIFICATION_PROJECTION,
+                 output_fov: Optional[float] = RECTIFICATION_OUTPUT_FOV,
+                 cache: Optional[RemapCache] = None,
+                 max_workers: int = 1):
+        """
+        Args:
+            camera_fovs: 需要校正的摄像头名称 -> 水平 FOV（度）
+            projection: 目标投影，见 PROJECTIONS
+            output_fov: 目标投影的水平 FOV（度），None 表示与源摄像头相同
+            cache: 查找表缓存，None 表示使用默认磁盘目录的新缓存
+        """
+        super().__init__()
+        if projection not in PROJECTIONS:
+            raise ValueError(f"Unsupported projection: {projection}")
+        self.projection = projection
+        self.output_fov = output_fov
+        self.cache = cache if cache is not None else RemapCache()
+
+        self._camera_fovs: Dict[str, float] = dict(camera_fovs or {})
+        # 任务为 (原始帧, 完成回调)，按摄像头名称只保留最新一个
+        self._worker = LatestWinsWorker(self._run, release=self._release, max_workers=max_workers,
+                                        thread_name_prefix="rectification")
+        self._worker.start()
+        self._lock = threading.Lock()
+        # 摄像头名称 -> [帧数, 累计耗时 ms, 最大耗时 ms]
+        self._cost: Dict[str, list] = {}
+
+    def set_cameras(self, camera_fovs: Dict[str, float]) -> None:
+        with self._lock:
+            self._camera_fovs = dict(camera_fovs)
+
+    def handles(self, camera_name: str) -> bool:
+        with self._lock:
+            return camera_name in self._camera_fovs
+
+    def warm_up(self, width: int, height: int) -> None:
+        """预先计算（或从磁盘加载）所有摄像头的查找表，避免第一帧卡顿"""
+        with self._lock:
+            fovs = set(self._camera_fovs.values())
+        for fov in fovs:
+            self.cache.get(self._remap_key(width, height, fov))
+
+    def submit(self, frame: CameraFrame, on_done: Optional[Callable[[CameraFrame], None]] = None) -> bool:
+        """提交一帧进行校正
+
+        Args:
+            frame: 原始摄像头帧
+            on_done: 原始帧不再被使用时调用（如归还帧缓冲区），在工作线程中执行
+
+        Returns:
+            bool: 该摄像头不需要校正时返回 False（不会调用 on_done）
+        """
+        if not self.handles(frame.name):
+            return False
+        self._worker.submit(frame.name, (frame, on_done))
+        return True
+
+    def rectify(self, frame: CameraFrame) -> CameraFrame:
+        """同步校正一帧（在调用线程中执行）"""
+        with self._lock:
+            fov = self._camera_fovs[frame.name]
+        height, width = frame.image.shape[:2]
+        map1, map2 = self.cache.get(self._remap_key(width, height, fov))
+
+        start = time.perf_counter()
+        image = cv.remap(frame.image, map1, map2, cv.INTER_LINEAR, borderMode=cv.BORDER_CONSTANT)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        with self._lock:
+            cost = self._cost.setdefault(frame.name, [0, 0.0, 0.0])
+            cost[0] += 1
+            cost[1] += elapsed_ms
+            cost[2] = max(cost[2], elapsed_ms)
+
+        # 保留原始帧的全部元数据（converted_at、gui_received_at 等）；校正后的图像是新数组，
+        # 不再引用 CARLA 缓冲区，测量数据与新的几何不对应，一并去掉
+        return replace(frame, image=image, data=None, source=None)
+
+    def _remap_key(self, width: int, height: int, fov: float) -> RemapKey:
+        output_fov = self.output_fov if self.output_fov is not None else fov
+        return RemapKey(width, height, fov, self.projection, output_fov)
+
+    def _run(self, job: Tuple[CameraFrame, Optional[Callable]]):
+        frame, _ = job
+        try:
+            rectified = self.rectify(frame)
+        except Exception as e:
+            print(f"Error rectifying camera image ({frame.name}): {e}")
+            return
+        self.frame_rectified.emit(rectified)
+
+    @staticmethod
+    def _release(job: Tuple[CameraFrame, Optional[Callable]]):
+        frame, on_done = job
+        if on_done is not None:
+            on_done(frame)
+
+    def get_stats(self) -> Dict[str, object]:
+        """返回校正统计
+
+        Returns:
+            dict: superseded, cameras（摄像头名称 -> {'frames', 'avg_ms', 'max_ms'}，每帧 remap 耗时）,
+                cache（RemapCache.get_stats()）
+        """
+        with self._lock:
+            cameras = {
+                name: {'frames': count, 'avg_ms': total / count if count else 0.0, 'max_ms': peak}
+                for name, (count, total, peak) in self._cost.items()
+            }
+        return {'superseded': self._worker.superseded, 'cameras': cameras, 'cache': self.cache.get_stats()}
+
+    def shutdown(self) -> None:
+        self._worker.stop()
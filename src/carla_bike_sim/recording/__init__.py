@@ -0,0 +1,15 @@
+"""
+录制模块
+
+在后台线程中录制摄像头数据，不阻塞 CARLA 传感器回调和实时显示；
+原始会话日志可在没有 CARLA 服务器时回放。
+"""
+from .session_log import SessionLogReader, SessionLogWriter, SessionReplay
+from .video_recorder import VideoRecorder
+
+__all__ = [
+    'SessionLogReader',
+    'SessionLogWriter',
+    'SessionReplay',
+    'VideoRecorder',
+]
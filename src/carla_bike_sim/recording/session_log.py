@@ -0,0 +1,395 @@
+"""
+原始会话日志
+
+无损记录一次骑行中的所有摄像头帧（原始 BGRA）、控制信号和车辆遥测，并支持按索引随机访问回放。
+
+会话目录结构:
+    session.json   元数据（格式版本、图像流名称列表）
+    records.bin    只追加的数据文件，各记录的负载依次相接
+    index.bin      定长索引（INDEX_DTYPE），每条记录一项，与数据同步追加
+
+读取时 records.bin 以内存映射方式打开，摄像头帧直接作为映射内存上的 numpy 视图返回（零拷贝）；
+index.bin 以 np.memmap 打开，按仿真帧号定位为 O(1)（打开时建立帧号 -> 索引位置的字典），
+按仿真时间戳或采集墙钟时间定位使用二分查找。
+多个摄像头回调线程的记录交错写入，时间戳并不严格按写入顺序递增，二分查找在时间戳的前缀最大值上进行。
+session.json 在每个图像流第一次写入前更新，进程意外退出后日志仍然可读。
+"""
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from carla_bike_sim.carla.frames import CameraFrame
+from carla_bike_sim.config import SESSION_LOG_MAX_PENDING_BYTES
+from carla_bike_sim.control.vehicle_control_signal import VehicleControlSignal
+
+SESSION_FORMAT_VERSION = 1
+
+RECORD_CAMERA = 1
+RECORD_CONTROL = 2
+RECORD_TELEMETRY = 3
+
+INDEX_DTYPE = np.dtype([
+    ('kind', 'u1'),        # RECORD_*
+    ('stream', 'u1'),      # 摄像头记录: session.json 中 streams 的下标
+    ('channels', 'u1'),
+    ('reserved', 'u1'),
+    ('width', '<u4'),
+    ('height', '<u4'),
+    ('frame_id', '<i8'),   # 仿真帧号（控制/遥测记录为写入时最近的摄像头帧号）
+    ('timestamp', '<f8'),  # 仿真时间戳（秒）
+    ('wall_time', '<f8'),  # 采集时的 time.perf_counter()
+    ('offset', '<u8'),     # 负载在 records.bin 中的偏移
+    ('length', '<u8'),     # 负载字节数
+])
+
+# throttle, steer, brake, hand_brake
+CONTROL_STRUCT = struct.Struct('<3d?')
+
+TELEMETRY_FIELDS = (
+    'velocity', 'throttle', 'brake', 'steer',
+    'position_x', 'position_y', 'position_z',
+    'rotation_pitch', 'rotation_yaw', 'rotation_roll',
+)
+# TELEMETRY_FIELDS + gear
+TELEMETRY_STRUCT = struct.Struct(f'<{len(TELEMETRY_FIELDS)}di')
+
+
+class SessionLogWriter:
+    """会话日志写入器
+
+    log_*() 方法只做入队，可以在 CARLA 回调线程或 GUI 线程中调用；
+    后台线程按到达顺序追加到 records.bin / index.bin。
+    待写数据超过 max_pending_bytes（磁盘跟不上）时丢弃新记录并计数。
+    """
+
+    def __init__(self, session_dir: Union[str, Path],
+                 max_pending_bytes: int = SESSION_LOG_MAX_PENDING_BYTES):
+        self.session_dir = Path(session_dir)
+        self.max_pending_bytes = max_pending_bytes
+
+        self._streams: List[str] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._last_frame_id = -1
+        self._last_timestamp = 0.0
+
+        self._lock = threading.Lock()
+        self._pending_bytes = 0
+        self._stats = {'records': 0, 'bytes': 0, 'dropped': 0}
+
+    @property
+    def is_open(self) -> bool:
+        return self._running
+
+    def open(self) -> None:
+        if self._running:
+            return
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self._records_file = open(self.session_dir / 'records.bin', 'ab')
+        self._index_file = open(self.session_dir / 'index.bin', 'ab')
+        self._offset = self._records_file.tell()
+        self._write_metadata()
+
+        self._metadata_streams = len(self._streams)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """写完所有待写记录后关闭文件"""
+        with self._lock:
+            if not self._running:
+                return
+            # 与 _enqueue() 中的检查在同一把锁内，结束标记之后不会再有记录入队
+            self._running = False
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._records_file.close()
+        self._index_file.close()
+        self._write_metadata()
+
+    def log_camera_frame(self, frame: CameraFrame) -> bool:
+        """记录一帧摄像头图像（可作为 SensorManager 的帧监听器）"""
+        image = frame.image
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 1
+        with self._lock:
+            if frame.name not in self._streams:
+                self._streams.append(frame.name)
+            stream = self._streams.index(frame.name)
+            self._last_frame_id = max(self._last_frame_id, frame.frame_id)
+            self._last_timestamp = max(self._last_timestamp, frame.timestamp)
+
+        header = (RECORD_CAMERA, stream, channels, width, height,
+                  frame.frame_id, frame.timestamp, frame.received_at)
+        # image 是 CARLA 缓冲区的视图，本身不持有缓冲区: 入队整个帧，由 frame.source 保持缓冲区存活直到写入；
+        # 没有 source 的帧（如帧缓冲池中之后会被复用的缓冲区）在调用线程中拷贝
+        payload = frame if frame.source is not None else image.copy()
+        return self._enqueue(header, payload, image.nbytes)
+
+    def log_control(self, control: VehicleControlSignal) -> bool:
+        payload = CONTROL_STRUCT.pack(control.throttle, control.steer, control.brake, control.hand_brake)
+        return self._enqueue(self._scalar_header(RECORD_CONTROL), payload, len(payload))
+
+    def log_telemetry(self, sample: Dict[str, float]) -> bool:
+        """记录一次车辆遥测，键见 TELEMETRY_FIELDS 以及 'gear'"""
+        values = [float(sample.get(name, 0.0)) for name in TELEMETRY_FIELDS]
+        payload = TELEMETRY_STRUCT.pack(*values, int(sample.get('gear', 0)))
+        return self._enqueue(self._scalar_header(RECORD_TELEMETRY), payload, len(payload))
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_bytes'] = self._pending_bytes
+        return stats
+
+    def _scalar_header(self, kind: int) -> tuple:
+        with self._lock:
+            frame_id, timestamp = self._last_frame_id, self._last_timestamp
+        return (kind, 0, 0, 0, 0, frame_id, timestamp, time.perf_counter())
+
+    def _enqueue(self, header: tuple, payload, nbytes: int) -> bool:
+        with self._lock:
+            if not self._running:
+                return False
+            if self._pending_bytes + nbytes > self.max_pending_bytes:
+                self._stats['dropped'] += 1
+                return False
+            self._pending_bytes += nbytes
+            # 无界队列，put() 不会阻塞
+            self._queue.put((header, payload, nbytes))
+        return True
+
+    def _run(self):
+        entry = np.zeros(1, dtype=INDEX_DTYPE)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            header, payload, nbytes = item
+            try:
+                kind, stream, channels, width, height, frame_id, timestamp, wall_time = header
+                if kind == RECORD_CAMERA and stream >= self._metadata_streams:
+                    # 新的图像流: 先让 session.json 包含它，再写入引用它的记录
+                    self._metadata_streams = self._write_metadata()
+                if isinstance(payload, CameraFrame):
+                    payload = payload.image
+                if isinstance(payload, np.ndarray):
+                    payload = np.ascontiguousarray(payload).data
+                self._records_file.write(payload)
+
+                entry[0] = (kind, stream, channels, 0, width, height, frame_id,
+                            timestamp, wall_time, self._offset, nbytes)
+                self._index_file.write(entry.tobytes())
+                self._offset += nbytes
+            except Exception as e:
+                print(f"Error writing session log record: {e}")
+            finally:
+                with self._lock:
+                    self._pending_bytes -= nbytes
+                    self._stats['records'] += 1
+                    self._stats['bytes'] += nbytes
+
+        self._records_file.flush()
+        self._index_file.flush()
+
+    def _write_metadata(self) -> int:
+        """写入 session.json（先写临时文件再替换，不会留下半个文件），返回写入的图像流数量"""
+        with self._lock:
+            streams = list(self._streams)
+        metadata = {'version': SESSION_FORMAT_VERSION, 'streams': streams}
+        path = self.session_dir / 'session.json'
+        temp_path = path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        temp_path.replace(path)
+        return len(streams)
+
+
+class SessionLogReader:
+    """会话日志读取器（内存映射，零拷贝）"""
+
+    def __init__(self, session_dir: Union[str, Path]):
+        self.session_dir = Path(session_dir)
+        with open(self.session_dir / 'session.json', 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if metadata.get('version') != SESSION_FORMAT_VERSION:
+            raise ValueError(f"Unsupported session log version: {metadata.get('version')}")
+        self.streams: List[str] = metadata['streams']
+
+        index_path = self.session_dir / 'index.bin'
+        record_count = index_path.stat().st_size // INDEX_DTYPE.itemsize
+        if record_count > 0:
+            self.index = np.memmap(index_path, dtype=INDEX_DTYPE, mode='r', shape=(record_count,))
+        else:
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+
+        self._records_file = open(self.session_dir / 'records.bin', 'rb')
+        if self._records_file.seek(0, 2) > 0:
+            self._data = mmap.mmap(self._records_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b''
+
+        # 进程意外退出时索引可能比数据文件多写了几项，丢弃指向文件末尾之外的记录
+        if len(self.index) > 0:
+            ends = np.asarray(self.index['offset']) + np.asarray(self.index['length'])
+            self.index = self.index[:int(np.searchsorted(ends, len(self._data), side='right'))]
+
+        # 仿真帧号 -> 该帧第一条记录的位置
+        frame_ids, first_positions = np.unique(np.asarray(self.index['frame_id']), return_index=True)
+        self._frame_positions = dict(zip(frame_ids.tolist(), first_positions.tolist()))
+        # 各回调线程的记录交错写入，时间不按写入顺序单调；前缀最大值是单调的，
+        # 在其上二分得到的正是第一条时间 >= 目标的记录
+        self._wall_times = np.asarray(self.index['wall_time'])
+        self._max_wall_times = np.maximum.accumulate(self._wall_times) if len(self.index) else self._wall_times
+        timestamps = np.asarray(self.index['timestamp'])
+        self._max_timestamps = np.maximum.accumulate(timestamps) if len(self.index) else timestamps
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def duration(self) -> float:
+        """会话时长（秒，按采集墙钟时间）"""
+        if len(self.index) < 2:
+            return 0.0
+        return float(self._wall_times.max() - self._wall_times.min())
+
+    def seek_frame(self, frame_id: int) -> Optional[int]:
+        """返回该仿真帧第一条记录的位置，不存在时返回 None"""
+        return self._frame_positions.get(frame_id)
+
+    def seek_timestamp(self, timestamp: float) -> int:
+        """返回仿真时间戳 >= timestamp（秒）的第一条记录的位置，超出会话末尾时返回 len(self)"""
+        return int(np.searchsorted(self._max_timestamps, timestamp, side='left'))
+
+    def seek_time(self, seconds_from_start: float) -> int:
+        """返回采集墙钟时间在会话开始 seconds_from_start 秒处（或之后）的第一条记录的位置"""
+        if len(self.index) == 0:
+            return 0
+        target = self._wall_times.min() + seconds_from_start
+        return int(np.searchsorted(self._max_wall_times, target, side='left'))
+
+    def read(self, position: int):
+        """读取一条记录
+
+        Returns:
+            摄像头记录返回 CameraFrame（image 为映射内存上的只读视图），
+            控制记录返回 VehicleControlSignal，遥测记录返回 dict
+        """
+        entry = self.index[position]
+        kind = int(entry['kind'])
+        offset = int(entry['offset'])
+        length = int(entry['length'])
+
+        if kind == RECORD_CAMERA:
+            height, width, channels = int(entry['height']), int(entry['width']), int(entry['channels'])
+            image = np.frombuffer(self._data, dtype=np.uint8, count=length, offset=offset)
+            image = image.reshape((height, width, channels) if channels > 1 else (height, width))
+            return CameraFrame(
+                name=self.streams[int(entry['stream'])],
+                image=image,
+                frame_id=int(entry['frame_id']),
+                timestamp=float(entry['timestamp']),
+                received_at=float(entry['wall_time']),
+            )
+
+        payload = self._data[offset:offset + length]
+        if kind == RECORD_CONTROL:
+            throttle, steer, brake, hand_brake = CONTROL_STRUCT.unpack(payload)
+            return VehicleControlSignal(throttle, steer, brake, hand_brake)
+        if kind == RECORD_TELEMETRY:
+            *values, gear = TELEMETRY_STRUCT.unpack(payload)
+            sample = dict(zip(TELEMETRY_FIELDS, values))
+            sample['gear'] = gear
+            return sample
+        raise ValueError(f"Unknown record kind: {kind}")
+
+    def __iter__(self) -> Iterator:
+        for position in range(len(self.index)):
+            yield self.read(position)
+
+    def close(self) -> None:
+        # 仍被 numpy 视图引用时 mmap 无法关闭，交给垃圾回收
+        try:
+            if isinstance(self._data, mmap.mmap):
+                self._data.close()
+        except BufferError:
+            pass
+        self._records_file.close()
+
+
+class SessionReplay(QObject):
+    """在 GUI 线程中按原始节奏（或加速）回放会话日志，无需 CARLA 服务器
+
+    Signals:
+        camera_frame_ready(CameraFrame): 摄像头帧
+        control_ready(VehicleControlSignal): 控制信号
+        telemetry_ready(dict): 车辆遥测（键同 StatusPanel 的缓存数据）
+        finished(): 回放结束
+    """
+
+    camera_frame_ready = Signal(object)
+    control_ready = Signal(object)
+    telemetry_ready = Signal(dict)
+    finished = Signal()
+
+    def __init__(self, reader: SessionLogReader, speed: float = 1.0, interval_ms: int = 5):
+        super().__init__()
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        self.reader = reader
+        self.speed = speed
+
+        self._position = 0
+        self._start_wall = 0.0
+        self._start_record_time = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timer)
+
+    @property
+    def is_playing(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self, position: int = 0) -> None:
+        if len(self.reader) == 0:
+            self.finished.emit()
+            return
+        self._position = position
+        self._start_wall = time.perf_counter()
+        self._start_record_time = float(self.reader.index['wall_time'][position])
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _on_timer(self):
+        index = self.reader.index
+        elapsed = (time.perf_counter() - self._start_wall) * self.speed
+        deadline = self._start_record_time + elapsed
+
+        while self._position < len(index) and index['wall_time'][self._position] <= deadline:
+            record = self.reader.read(self._position)
+            self._position += 1
+            if isinstance(record, CameraFrame):
+                self.camera_frame_ready.emit(record)
+            elif isinstance(record, VehicleControlSignal):
+                self.control_ready.emit(record)
+            else:
+                self.telemetry_ready.emit(record)
+
+        if self._position >= len(index):
+            self._timer.stop()
+            self.finished.emit()
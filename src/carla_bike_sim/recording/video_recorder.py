@@ -0,0 +1,259 @@
+import csv
+import math
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import cv2 as cv
+import numpy as np
+
+from carla_bike_sim.carla.frames import CameraBundle, CameraFrame
+from carla_bike_sim.config import (
+    RECORDING_CODEC,
+    RECORDING_FPS,
+    RECORDING_QUEUE_SIZE,
+)
+
+
+class VideoRecorder:
+    """后台视频录制器
+
+    submit()/submit_bundle() 只把帧放入有界队列后立即返回，可以直接在 CARLA 回调线程中调用；
+    队列已满时丢弃该帧并计数，绝不阻塞传感器回调或实时显示。
+    队列中保存的是整个 CameraFrame / CameraBundle: 零拷贝视图的缓冲区由 frame.source 保持存活，
+    直到编码线程写完该帧。
+    后台编码线程使用 cv2.VideoWriter 写入视频，并为每个视频写一个 CSV 时间戳文件 (sidecar)。
+
+    布局:
+        - 'per_camera': 每个摄像头一个视频文件 <name>.avi + <name>.csv（使用 submit()）
+        - 'mosaic': 所有摄像头拼成网格写入 mosaic.avi + mosaic.csv（使用 submit_bundle()）
+
+    CSV 列: index, frame_id, sim_timestamp, received_at, written_at
+        received_at / written_at 为 time.perf_counter()，两者之差即录制延迟。
+    """
+
+    LAYOUTS = ('per_camera', 'mosaic')
+
+    def __init__(self,
+                 output_dir: Union[str, Path],
+                 layout: str = 'per_camera',
+                 codec: str = RECORDING_CODEC,
+                 fps: float = RECORDING_FPS,
+                 queue_size: int = RECORDING_QUEUE_SIZE,
+                 camera_names: Optional[Sequence[str]] = None):
+        """
+        Args:
+            output_dir: 输出目录（不存在时自动创建）
+            layout: 'per_camera' 或 'mosaic'
+            codec: FourCC 编码，如 'MJPG' 或 'XVID'
+            fps: 写入视频文件的帧率
+            queue_size: 待编码队列长度上限
+            camera_names: mosaic 布局中各图块的顺序，None 表示按首个 bundle 的顺序
+        """
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unsupported recording layout: {layout}")
+
+        self.output_dir = Path(output_dir)
+        self.layout = layout
+        self.codec = codec
+        self.fps = fps
+        self.camera_names = list(camera_names) if camera_names else None
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # _running 的检查与入队在同一把锁内，stop() 之后不会有帧排在结束标记之后
+        self._submit_lock = threading.Lock()
+
+        self._writers: Dict[str, cv.VideoWriter] = {}
+        self._sidecars: Dict[str, tuple] = {}
+        self._frame_sizes: Dict[str, tuple] = {}
+        self._frame_indices: Dict[str, int] = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'max_queue_depth': 0,
+            'encode_ms_total': 0.0,
+            'last_lag': 0.0,
+            'max_lag': 0.0,
+        }
+
+    @property
+    def is_recording(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止接收新帧，编码完队列中剩余的帧后关闭所有文件"""
+        with self._submit_lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, frame: CameraFrame) -> bool:
+        """提交单个摄像头帧（per_camera 布局），不阻塞
+
+        零拷贝视图必须带有 frame.source；没有 source 的帧视为自有内存，调用方提交后不能再复用其缓冲区
+        （帧缓冲池中的帧请勿提交）。
+
+        Returns:
+            bool: 队列已满或未在录制时返回 False
+        """
+        return self._enqueue(frame)
+
+    def submit_bundle(self, bundle: CameraBundle) -> bool:
+        """提交一个多摄像头 bundle（mosaic 布局），不阻塞"""
+        return self._enqueue(bundle)
+
+    def _enqueue(self, item) -> bool:
+        with self._submit_lock:
+            if not self._running:
+                return False
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._stats_lock:
+                    self._stats['dropped'] += 1
+                return False
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回录制统计
+
+        Returns:
+            dict: submitted, written, dropped, queue_depth, max_queue_depth,
+                encode_ms_avg, last_lag, max_lag（收到帧到写入完成的秒数）
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        encode_ms_total = stats.pop('encode_ms_total')
+        stats['encode_ms_avg'] = encode_ms_total / stats['written'] if stats['written'] else 0.0
+        stats['queue_depth'] = self._queue.qsize()
+        return stats
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                start = time.perf_counter()
+                try:
+                    if isinstance(item, CameraBundle):
+                        received_at = min(f.received_at for f in item.frames.values())
+                        self._write('mosaic', self._compose_mosaic(item), item.frame_id,
+                                    item.timestamp, received_at)
+                    else:
+                        self._write(item.name, item.image, item.frame_id,
+                                    item.timestamp, item.received_at)
+                except Exception as e:
+                    print(f"Error recording frame: {e}")
+                    continue
+
+                done = time.perf_counter()
+                with self._stats_lock:
+                    self._stats['encode_ms_total'] += (done - start) * 1000.0
+        finally:
+            self._close_files()
+
+    def _write(self, name: str, image: np.ndarray, frame_id: int,
+               sim_timestamp: float, received_at: float):
+        if image.shape[2] == 4:
+            image = cv.cvtColor(image, cv.COLOR_BGRA2BGR)
+        elif not image.flags['C_CONTIGUOUS']:
+            image = np.ascontiguousarray(image)
+
+        height, width = image.shape[:2]
+        writer = self._writers.get(name)
+        if writer is None:
+            writer = self._open_writer(name, width, height)
+        elif self._frame_sizes[name] != (width, height):
+            # VideoWriter 要求固定尺寸
+            image = cv.resize(image, self._frame_sizes[name], interpolation=cv.INTER_AREA)
+
+        writer.write(image)
+
+        written_at = time.perf_counter()
+        index = self._frame_indices[name]
+        self._frame_indices[name] = index + 1
+        self._sidecars[name][1].writerow(
+            [index, frame_id, f"{sim_timestamp:.6f}", f"{received_at:.6f}", f"{written_at:.6f}"]
+        )
+
+        lag = written_at - received_at
+        with self._stats_lock:
+            self._stats['written'] += 1
+            self._stats['last_lag'] = lag
+            self._stats['max_lag'] = max(self._stats['max_lag'], lag)
+
+    def _open_writer(self, name: str, width: int, height: int) -> cv.VideoWriter:
+        fourcc = cv.VideoWriter_fourcc(*self.codec)
+        video_path = self.output_dir / f"{name}.avi"
+        writer = cv.VideoWriter(str(video_path), fourcc, self.fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"Failed to open video writer: {video_path}")
+
+        sidecar_file = open(self.output_dir / f"{name}.csv", 'w', newline='')
+        sidecar = csv.writer(sidecar_file)
+        sidecar.writerow(['index', 'frame_id', 'sim_timestamp', 'received_at', 'written_at'])
+
+        self._writers[name] = writer
+        self._sidecars[name] = (sidecar_file, sidecar)
+        self._frame_sizes[name] = (width, height)
+        self._frame_indices[name] = 0
+        return writer
+
+    def _compose_mosaic(self, bundle: CameraBundle) -> np.ndarray:
+        """按 camera_names 顺序拼接网格，缺失的摄像头填黑"""
+        if self.camera_names is None:
+            self.camera_names = list(bundle.frames)
+
+        sample = next(iter(bundle.frames.values())).image
+        tile_height, tile_width = sample.shape[:2]
+        count = len(self.camera_names)
+        columns = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+
+        mosaic = np.zeros((rows * tile_height, columns * tile_width, 3), dtype=np.uint8)
+        for index, name in enumerate(self.camera_names):
+            frame = bundle.frames.get(name)
+            if frame is None:
+                continue
+            image = frame.image
+            if image.shape[2] == 4:
+                image = image[:, :, :3]
+            if image.shape[:2] != (tile_height, tile_width):
+                image = cv.resize(image, (tile_width, tile_height), interpolation=cv.INTER_AREA)
+            row, column = divmod(index, columns)
+            mosaic[row * tile_height:(row + 1) * tile_height,
+                   column * tile_width:(column + 1) * tile_width] = image
+        return mosaic
+
+    def _close_files(self):
+        for writer in self._writers.values():
+            writer.release()
+        for sidecar_file, _ in self._sidecars.values():
+            sidecar_file.close()
+        self._writers.clear()
+        self._sidecars.clear()
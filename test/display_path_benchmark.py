@@ -0,0 +1,206 @@
+"""
+摄像头显示路径基准测试
+
+测量 4 路 800x600 摄像头从传感器回调到显示的完整路径:
+    mailbox:        默认路径，回调 -> FrameMailbox -> FrameScaler (工作线程缩放) -> CentralView
+    mailbox + pool: 同上，开启帧缓冲池 (use_frame_pool=True)
+    signal:         回调 -> camera_image_ready 信号 -> CentralView.update_camera_image (GUI 线程缩放)
+无需 CARLA 服务器：使用与 carla.Image.raw_data 布局相同的 BGRA 缓冲区 (memoryview) 模拟传感器输出，
+直接调用 SensorManager.camera_callback，其余参数使用 config 中的默认值。
+
+每帧整帧拷贝次数为实测值（缩放输出的图块尺寸图像不计在内）:
+    交付拷贝: 到达显示阶段的图像不再与 raw_data 共享内存的次数（缓冲池拷贝、signal 模式的拷贝）
+    显示拷贝: 到达显示阶段的图像不是 C 连续数组的次数（cv2.resize / QImage 需要先生成连续副本）
+缓冲池路径另外打印缓冲池的 acquire 次数，应与交付拷贝一致。
+
+使用方法:
+    python test/display_path_benchmark.py
+"""
+import os
+import sys
+import time
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PySide6.QtCore import QEventLoop, Qt
+from PySide6.QtWidgets import QApplication
+
+from carla_bike_sim.carla.rig import SensorSpec
+from carla_bike_sim.carla.sensors import SensorManager
+from carla_bike_sim.config import SYNC_FIXED_DELTA_SECONDS
+from carla_bike_sim.gui.central_view import CentralView
+from carla_bike_sim.gui.frame_scaler import FrameScaler
+
+CAMERA_NAMES = ['front', 'rear', 'left', 'right']
+CAMERA_COUNT = len(CAMERA_NAMES)
+WIDTH = 800
+HEIGHT = 600
+FRAMES = 120
+TARGET_FPS = 30.0
+# 等待缩放结果的超时（秒）
+SCALE_TIMEOUT = 5.0
+
+
+class FakeImage:
+    """与 carla.Image 接口相同的模拟图像，raw_data 与 CARLA 一样是 memoryview"""
+
+    def __init__(self, raw_data: memoryview, frame: int):
+        self.raw_data = raw_data
+        self.width = WIDTH
+        self.height = HEIGHT
+        self.frame = frame
+        self.timestamp = frame * SYNC_FIXED_DELTA_SECONDS
+
+
+class CopyCounter:
+    """统计到达显示阶段的图像相对 raw_data 的整帧拷贝次数"""
+
+    def __init__(self, raw_arrays: dict[str, np.ndarray]):
+        self.raw_arrays = raw_arrays
+        self.frames = 0
+        self.delivery_copies = 0
+        self.display_copies = 0
+
+    def count(self, name: str, image: np.ndarray) -> None:
+        self.frames += 1
+        if not np.shares_memory(image, self.raw_arrays[name]):
+            self.delivery_copies += 1
+        if not image.flags['C_CONTIGUOUS']:
+            self.display_copies += 1
+
+    def per_frame(self) -> tuple[float, float]:
+        if self.frames == 0:
+            return 0.0, 0.0
+        return self.delivery_copies / self.frames, self.display_copies / self.frames
+
+
+def make_raw_buffers() -> dict[str, memoryview]:
+    """生成与 carla.Image.raw_data 相同布局 (BGRA, uint8) 的只读缓冲区"""
+    rng = np.random.default_rng(0)
+    return {
+        name: memoryview(rng.integers(0, 256, size=HEIGHT * WIDTH * 4, dtype=np.uint8).tobytes())
+        for name in CAMERA_NAMES
+    }
+
+
+def make_manager(**options) -> SensorManager:
+    rig = [SensorSpec(name, image_size_x=WIDTH, image_size_y=HEIGHT) for name in CAMERA_NAMES]
+    manager = SensorManager(rig=rig, **options)
+    manager.frame_mailbox.open()
+    return manager
+
+
+def run_mailbox(app: QApplication, view: CentralView, scaler: FrameScaler, manager: SensorManager,
+                raw_buffers: dict[str, memoryview], counter: CopyCounter) -> float:
+    """默认路径，返回每个传感器周期（4 路摄像头各一帧，直到全部显示）的平均耗时（秒）"""
+    shown = []
+
+    def on_scaled(scaled):
+        view.show_scaled_image(scaled.name, scaled.image, scaled.pixels, tag=scaled)
+        shown.append(scaled.name)
+
+    scaler.frame_scaled.connect(on_scaled)
+    try:
+        start = time.perf_counter()
+        for frame_id in range(FRAMES):
+            shown.clear()
+            for name, raw in raw_buffers.items():
+                manager.camera_callback(FakeImage(raw, frame_id), name)
+            # 与 MainWindow._pull_camera_frames 相同: 取走最新帧，缩放完成后归还缓冲区
+            for name, frame in manager.frame_mailbox.take_all().items():
+                counter.count(name, frame.image)
+                scaler.submit(frame, view.camera_target_size(name), on_done=manager.release_frame)
+            deadline = time.perf_counter() + SCALE_TIMEOUT
+            while len(shown) < CAMERA_COUNT and time.perf_counter() < deadline:
+                # 阻塞等待缩放结果，不与缩放线程争抢 CPU
+                app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+        return (time.perf_counter() - start) / FRAMES
+    finally:
+        scaler.frame_scaled.disconnect(on_scaled)
+
+
+def run_signal(app: QApplication, view: CentralView, manager: SensorManager,
+               raw_buffers: dict[str, memoryview], counter: CopyCounter) -> float:
+    """signal 路径，返回每个传感器周期的平均耗时（秒）"""
+
+    def on_image(name, image):
+        counter.count(name, image)
+        view.update_camera_image(name, image)
+
+    # 回调在本线程中执行，直接连接即可在 GUI 线程中显示
+    manager.camera_image_ready.connect(on_image, Qt.ConnectionType.DirectConnection)
+    start = time.perf_counter()
+    for frame_id in range(FRAMES):
+        for name, raw in raw_buffers.items():
+            manager.camera_callback(FakeImage(raw, frame_id), name)
+        app.processEvents()
+    return (time.perf_counter() - start) / FRAMES
+
+
+def pool_acquires(manager: SensorManager) -> int:
+    total = 0
+    for pool in manager._frame_pools.values():
+        stats = pool.get_stats()
+        total += stats['hits'] + stats['misses']
+    return total
+
+
+def main():
+    app = QApplication(sys.argv)
+    view = CentralView(CAMERA_NAMES)
+    view.resize(1200, 800)
+    view.show()
+    app.processEvents()
+
+    scaler = FrameScaler()
+    raw_buffers = make_raw_buffers()
+    raw_arrays = {name: np.frombuffer(raw, dtype=np.uint8) for name, raw in raw_buffers.items()}
+    frame_bytes = HEIGHT * WIDTH * 4
+
+    def mailbox(manager, counter):
+        return run_mailbox(app, view, scaler, manager, raw_buffers, counter)
+
+    def signal(manager, counter):
+        return run_signal(app, view, manager, raw_buffers, counter)
+
+    # 名称 -> (运行函数, SensorManager 参数)
+    cases = {
+        'mailbox': (mailbox, {}),
+        'mailbox + pool': (mailbox, {'use_frame_pool': True}),
+        'signal': (signal, {'delivery_mode': 'signal'}),
+    }
+
+    results = {}
+    for name, (run, options) in cases.items():
+        run(make_manager(**options), CopyCounter(raw_arrays))  # 预热
+        manager = make_manager(**options)
+        counter = CopyCounter(raw_arrays)
+        period = run(manager, counter)
+        results[name] = (period, counter, pool_acquires(manager))
+    scaler.shutdown()
+
+    print("=" * 72)
+    print(f"  显示路径基准: {CAMERA_COUNT} x {WIDTH}x{HEIGHT}, {FRAMES} 个周期")
+    print("=" * 72)
+    for name, (period, counter, acquires) in results.items():
+        fps = 1.0 / period if period > 0 else float('inf')
+        delivery, display = counter.per_frame()
+        copies = delivery + display
+        copied_mb = copies * CAMERA_COUNT * frame_bytes * TARGET_FPS / 1e6
+        print(f"  {name:15s}: {period * 1000:7.2f} ms/周期  最高 {fps:6.1f} fps  "
+              f"整帧拷贝 {copies:.2f}/帧 (交付 {delivery:.2f}, 显示 {display:.2f}; "
+              f"@{TARGET_FPS:.0f} fps: {copied_mb:6.1f} MB/s)")
+        if acquires:
+            print(f"  {'':15s}  缓冲池 acquire {acquires} 次 / {counter.frames} 帧")
+
+    default_fps = 1.0 / results['mailbox'][0]
+    status = "✅" if default_fps >= TARGET_FPS else "❌"
+    print("-" * 72)
+    print(f"  {status} 默认路径可维持 {default_fps:.1f} fps (目标 >= {TARGET_FPS:.0f} fps)")
+
+
+if __name__ == '__main__':
+    main()
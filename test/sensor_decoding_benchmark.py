@@ -0,0 +1,112 @@
+"""
+语义分割 / 深度摄像头解码基准测试
+
+验证 4 路 800x600 语义分割摄像头和 4 路深度摄像头在全速率下的解码开销不超过每帧 CPU 预算。
+无需 CARLA 服务器：用与 carla.Image.raw_data 布局相同的 BGRA 字节缓冲区模拟传感器输出，
+直接调用 SensorManager.camera_callback，测得的是完整的回调路径（解码 + mailbox）。
+
+解码方式:
+    语义分割: 标签 (R 通道) 零拷贝视图 -> 调色板查表 (uint32 LUT，一次得到整个 BGRA 像素)
+    深度:     原始缓冲区按大端 uint32 读取并右移 8 位，一次遍历得到 24 位整数深度（米按需换算）；
+              显示用的对数灰度图直接以高 16 位查表
+
+使用方法:
+    python test/sensor_decoding_benchmark.py
+"""
+import os
+import sys
+import time
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import numpy as np
+
+from carla_bike_sim.carla.rig import SensorSpec
+from carla_bike_sim.carla.sensors import SensorManager
+from carla_bike_sim.config import SYNC_FIXED_DELTA_SECONDS
+
+CAMERA_COUNT = 4
+WIDTH = 800
+HEIGHT = 600
+FRAMES = 200
+# 每帧（单个摄像头）回调的 CPU 预算
+FRAME_CPU_BUDGET_MS = 5.0
+SENSOR_RATE_HZ = 1.0 / SYNC_FIXED_DELTA_SECONDS
+
+
+class FakeImage:
+    """与 carla.Image 接口相同的模拟图像"""
+
+    def __init__(self, raw_data: bytes, frame: int):
+        self.raw_data = raw_data
+        self.width = WIDTH
+        self.height = HEIGHT
+        self.frame = frame
+        self.timestamp = frame * SYNC_FIXED_DELTA_SECONDS
+
+
+def make_semantic_buffer(rng) -> bytes:
+    image = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    image[:, :, 2] = rng.integers(0, 29, size=(HEIGHT, WIDTH), dtype=np.uint8)
+    image[:, :, 3] = 255
+    return image.tobytes()
+
+
+def make_depth_buffer(rng) -> bytes:
+    image = rng.integers(0, 256, size=(HEIGHT, WIDTH, 4), dtype=np.uint8)
+    image[:, :, 3] = 255
+    return image.tobytes()
+
+
+def run(blueprint: str, raw_buffers: list[bytes]) -> np.ndarray:
+    """返回每帧回调的 CPU 耗时（毫秒）"""
+    names = [f"cam{index}" for index in range(CAMERA_COUNT)]
+    rig = [SensorSpec(name, blueprint=blueprint, image_size_x=WIDTH, image_size_y=HEIGHT) for name in names]
+    manager = SensorManager(rig=rig)
+    manager.frame_mailbox.open()
+
+    costs = []
+    for frame in range(FRAMES):
+        for name, raw in zip(names, raw_buffers):
+            image = FakeImage(raw, frame)
+            start = time.thread_time()
+            manager.camera_callback(image, name)
+            costs.append((time.thread_time() - start) * 1000.0)
+        # 模拟 GUI 取走并归还缓冲区
+        for taken in manager.frame_mailbox.take_all().values():
+            manager.release_frame(taken)
+    return np.array(costs)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    cases = {
+        'semantic': ('sensor.camera.semantic_segmentation', [make_semantic_buffer(rng) for _ in range(CAMERA_COUNT)]),
+        'depth': ('sensor.camera.depth', [make_depth_buffer(rng) for _ in range(CAMERA_COUNT)]),
+    }
+
+    print("=" * 60)
+    print(f"  解码基准: {CAMERA_COUNT} x {WIDTH}x{HEIGHT} @ {SENSOR_RATE_HZ:.0f} Hz, {FRAMES} 帧/摄像头")
+    print(f"  每帧 CPU 预算: {FRAME_CPU_BUDGET_MS:.1f} ms")
+    print("=" * 60)
+
+    passed = True
+    for name, (blueprint, buffers) in cases.items():
+        run(blueprint, buffers)  # 预热
+        costs = run(blueprint, buffers)
+        p50, p95, p99 = np.percentile(costs, (50, 95, 99))
+        load = p50 * CAMERA_COUNT * SENSOR_RATE_HZ / 1000.0
+        ok = p95 <= FRAME_CPU_BUDGET_MS
+        passed &= ok
+        status = "✅" if ok else "❌"
+        print(f"  {status} {name:8s}: p50 {p50:5.2f} ms  p95 {p95:5.2f} ms  p99 {p99:5.2f} ms  "
+              f"(单核占用 {load * 100:4.1f}%)")
+
+    print("-" * 60)
+    print("  全部通过" if passed else "  超出预算")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+多服务器会话池吞吐量基准测试
+
+SessionPool 为每个 CARLA 服务器启动一个工作进程，把 --episodes 个 episode 分配给空闲的服务器并行执行，
+最后输出每个 episode 的结果和整个会话池的汇总吞吐量 (episodes/h, frames/s, 仿真速度)。
+
+默认连接 --servers 中的 CARLA 服务器（同一台机器上的多个服务器请使用不同端口，
+如 CarlaUE4.sh -carla-rpc-port=2000 / 2003）。--stand-in 时使用 time_to_first_frame_benchmark
+中的本地替身客户端，无需服务器即可验证调度和汇总统计。
+
+使用方法:
+    python test/session_pool_benchmark.py [--servers localhost:2000,localhost:2003] [--episodes 8]
+        [--duration 10] [--traffic] [--output-dir sessions/pool] [--stand-in]
+"""
+import argparse
+import os
+import sys
+import time
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import Qt
+
+from carla_bike_sim.carla.rig import DEFAULT_CAMERA_RIG
+from carla_bike_sim.pool import Episode, SessionPool
+
+
+def parse_servers(text: str):
+    servers = []
+    for item in text.split(','):
+        host, _, port = item.strip().rpartition(':')
+        servers.append((host or 'localhost', int(port)))
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-server session pool throughput benchmark")
+    parser.add_argument('--servers', default='localhost:2000', help="Comma separated host:port list")
+    parser.add_argument('--episodes', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="Simulated seconds per episode")
+    parser.add_argument('--map', default=None)
+    parser.add_argument('--traffic', action='store_true', help="Spawn NPC traffic in every episode")
+    parser.add_argument('--output-dir', default=None, help="Write a session log per episode")
+    parser.add_argument('--stand-in', action='store_true', help="Use the local stand-in client (no server)")
+    args = parser.parse_args()
+
+    manager_options = {}
+    if args.stand_in:
+        from time_to_first_frame_benchmark import StandInClient
+        manager_options = {'client_factory': StandInClient, 'batch_actor_commands': False}
+
+    servers = parse_servers(args.servers)
+    pool = SessionPool(servers, manager_options=manager_options)
+    pool.episode_finished.connect(lambda result: print(
+        f"  {'✅' if result.success else '❌'} episode {result.episode_id:3d} @ {result.server}: "
+        f"{result.frames:6d} frames  {result.sim_seconds:6.1f} 仿真秒  {result.wall_seconds:6.1f} s"
+        + (f"  ({result.error})" if result.error else "")
+    ), Qt.ConnectionType.DirectConnection)  # 没有事件循环，在调度线程中直接打印
+
+    print("=" * 72)
+    print(f"  会话池基准: {len(servers)} 个服务器, {args.episodes} 个 episode, 每个 {args.duration:.0f} 仿真秒")
+    print("=" * 72)
+
+    started = time.perf_counter()
+    pool.start()
+    pool.submit_many(
+        Episode(map_name=args.map, duration=args.duration, rig=DEFAULT_CAMERA_RIG,
+                traffic=args.traffic, seed=index, output_dir=args.output_dir)
+        for index in range(args.episodes)
+    )
+    pool.wait()
+    pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    stats = pool.get_stats()
+    print("-" * 72)
+    print(f"  完成 {stats['completed']} / 失败 {stats['failed']}, 总耗时 {elapsed:.1f} s")
+    print(f"  吞吐量: {stats['episodes_per_hour']:.0f} episodes/h, {stats['frames_per_s']:.0f} frames/s, "
+          f"仿真速度 {stats['sim_speed']:.2f}x")
+    for name, server in stats['per_server'].items():
+        print(f"    {name}: {server['status']:<10} 完成 {server['completed']}  失败 {server['failed']}  "
+              f"{server['frames']} frames  利用率 {server['utilization'] * 100:.0f}%")
+
+    passed = stats['completed'] == args.episodes
+    print("  全部通过" if passed else "  未通过")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+"""
+连接 / 启动仿真到首帧的耗时基准测试
+
+无需 CARLA 服务器：StandInClient 是与 carla.Client 接口相同的本地替身，
+load_world 按 --load-delay 模拟服务器加载地图的耗时，传感器以 20 Hz 输出固定内容的 BGRA 图像。
+通过 LifecycleWorker 在工作线程中执行连接和启动，测量:
+    - connect:  点击连接 -> 连接完成
+    - start:    点击启动 -> 启动完成
+    - first frame: 点击启动 -> 第一帧进入 frame_mailbox
+    - GUI 最大卡顿: 操作期间 GUI 事件循环两次定时器回调之间的最大间隔
+最后测试一次在 load_world 期间取消启动，确认车辆和传感器被清理。
+
+使用方法:
+    python test/time_to_first_frame_benchmark.py [--load-delay 2.0] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import carla
+import numpy as np
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from carla_bike_sim.carla.carla_client_manager import CarlaClientManager
+from carla_bike_sim.carla.lifecycle_worker import LifecycleWorker
+from carla_bike_sim.carla.metadata_cache import MetadataCache
+from carla_bike_sim.config import SYNC_FIXED_DELTA_SECONDS
+
+# GUI 事件循环允许的最大卡顿
+MAX_GUI_STALL_MS = 50.0
+
+
+class StandInImage:
+    def __init__(self, raw_data: bytes, width: int, height: int, frame: int, timestamp: float):
+        self.raw_data = raw_data
+        self.width = width
+        self.height = height
+        self.frame = frame
+        self.timestamp = timestamp
+
+
+class StandInBlueprint:
+    def __init__(self, blueprint_id: str):
+        self.id = blueprint_id
+        self.attributes = {}
+
+    def has_attribute(self, key: str) -> bool:
+        return True
+
+    def set_attribute(self, key: str, value: str):
+        self.attributes[key] = value
+
+
+class StandInBlueprintLibrary:
+    def find(self, blueprint_id: str) -> StandInBlueprint:
+        return StandInBlueprint(blueprint_id)
+
+
+class StandInMap:
+    def get_spawn_points(self):
+        return [carla.Transform(carla.Location(x=10.0, y=20.0, z=0.5), carla.Rotation(yaw=90.0))]
+
+
+class StandInTimestamp:
+    def __init__(self, elapsed_seconds: float):
+        self.elapsed_seconds = elapsed_seconds
+
+
+class StandInSnapshot:
+    """与 carla.WorldSnapshot 接口相同：按 ID 查找 actor 的状态"""
+
+    def __init__(self, frame: int, timestamp: float, actors):
+        self.frame = frame
+        self.timestamp = StandInTimestamp(timestamp)
+        self._actors = {actor.id: actor for actor in actors}
+
+    def find(self, actor_id: int):
+        return self._actors.get(actor_id)
+
+
+class StandInActor:
+    _next_id = 1
+
+    def __init__(self, world: 'StandInWorld', blueprint: StandInBlueprint, transform: carla.Transform):
+        self.id = StandInActor._next_id
+        StandInActor._next_id += 1
+        self.world = world
+        self.blueprint = blueprint
+        self.transform = transform
+        self.control = carla.VehicleControl()
+        self.is_alive = True
+
+    def set_transform(self, transform: carla.Transform):
+        self.transform = transform
+
+    def get_transform(self) -> carla.Transform:
+        return self.transform
+
+    def get_velocity(self) -> carla.Vector3D:
+        return carla.Vector3D()
+
+    def get_control(self) -> carla.VehicleControl:
+        return self.control
+
+    def apply_control(self, control):
+        self.control = control
+
+    def destroy(self):
+        self.is_alive = False
+        self.world.remove_actor(self)
+
+
+class StandInSensor(StandInActor):
+    def __init__(self, world, blueprint, transform):
+        super().__init__(world, blueprint, transform)
+        self.width = int(blueprint.attributes.get('image_size_x', 800))
+        self.height = int(blueprint.attributes.get('image_size_y', 600))
+        self.raw_data = np.full((self.height, self.width, 4), 128, dtype=np.uint8).tobytes()
+        self.callback = None
+
+    def listen(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+
+class StandInWorld:
+    """异步模式下以固定频率自行步进，同步模式下由 tick() 步进"""
+
+    def __init__(self):
+        self.settings = carla.WorldSettings()
+        self.actors = []
+        self.frame = 0
+        self.tick_callbacks = {}
+        self._lock = threading.Lock()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get_settings(self):
+        return self.settings
+
+    def apply_settings(self, settings):
+        self.settings = settings
+
+    def get_blueprint_library(self):
+        return StandInBlueprintLibrary()
+
+    def get_map(self):
+        return StandInMap()
+
+    def get_spectator(self):
+        return StandInActor(self, StandInBlueprint('spectator'), carla.Transform())
+
+    def spawn_actor(self, blueprint, transform, attach_to=None):
+        cls = StandInSensor if blueprint.id.startswith('sensor.') else StandInActor
+        actor = cls(self, blueprint, transform)
+        with self._lock:
+            self.actors.append(actor)
+        return actor
+
+    def on_tick(self, callback) -> int:
+        callback_id = len(self.tick_callbacks) + 1
+        self.tick_callbacks[callback_id] = callback
+        return callback_id
+
+    def remove_on_tick(self, callback_id: int):
+        self.tick_callbacks.pop(callback_id, None)
+
+    def remove_actor(self, actor):
+        with self._lock:
+            if actor in self.actors:
+                self.actors.remove(actor)
+
+    def tick(self):
+        self.frame += 1
+        timestamp = self.frame * SYNC_FIXED_DELTA_SECONDS
+        with self._lock:
+            actors = list(self.actors)
+        sensors = [actor for actor in actors if isinstance(actor, StandInSensor)]
+        snapshot = StandInSnapshot(self.frame, timestamp, actors)
+        for callback in list(self.tick_callbacks.values()):
+            callback(snapshot)
+        for sensor in sensors:
+            callback = sensor.callback
+            if callback is not None:
+                callback(StandInImage(sensor.raw_data, sensor.width, sensor.height, self.frame, timestamp))
+        return self.frame
+
+    def shutdown(self):
+        self._running = False
+
+    def _run(self):
+        while self._running:
+            time.sleep(SYNC_FIXED_DELTA_SECONDS)
+            if not self.settings.synchronous_mode:
+                self.tick()
+
+
+class StandInClient:
+    """与 carla.Client 接口相同的本地替身"""
+
+    load_delay = 0.0
+
+    def __init__(self, host: str, port: int):
+        self.worlds = []
+
+    def set_timeout(self, timeout: float):
+        pass
+
+    def get_server_version(self) -> str:
+        return 'stand-in'
+
+    def get_available_maps(self):
+        return ['/Game/Carla/Maps/StandIn']
+
+    def load_world(self, map_name: str):
+        time.sleep(self.load_delay)
+        for world in self.worlds:
+            world.shutdown()
+        world = StandInWorld()
+        self.worlds.append(world)
+        return world
+
+
+def create_manager(cache: MetadataCache) -> CarlaClientManager:
+    # 替身没有实现 carla.command 批量命令，逐个生成 / 销毁 actor
+    return CarlaClientManager(metadata_cache=cache, client_factory=StandInClient, batch_actor_commands=False)
+
+
+class GuiStallMonitor:
+    """记录 GUI 事件循环两次定时器回调之间的最大间隔"""
+
+    def __init__(self, interval_ms: int = 5):
+        self.max_gap_ms = 0.0
+        self._last = time.perf_counter()
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._on_timeout)
+        self._timer.start(interval_ms)
+
+    def reset(self):
+        self.max_gap_ms = 0.0
+        self._last = time.perf_counter()
+
+    def _on_timeout(self):
+        now = time.perf_counter()
+        self.max_gap_ms = max(self.max_gap_ms, (now - self._last) * 1000.0)
+        self._last = now
+
+
+def wait_until(app, condition, timeout: float = 30.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def run_once(app, monitor: GuiStallMonitor, cache: MetadataCache) -> dict:
+    manager = create_manager(cache)
+    worker = LifecycleWorker()
+    results = []
+    worker.finished.connect(lambda operation, success: results.append((operation, success)))
+
+    monitor.reset()
+    started = time.perf_counter()
+    worker.connect_to_server(manager)
+    wait_until(app, lambda: results)
+    connect_ms = (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+    worker.start_simulation(manager)
+    wait_until(app, lambda: len(results) == 2)
+    start_ms = (time.perf_counter() - started) * 1000.0
+    got_frame = wait_until(app, lambda: manager.sensor_manager.frame_mailbox.take_all(), timeout=5.0)
+    first_frame_ms = (time.perf_counter() - started) * 1000.0
+
+    ok = all(success for _, success in results) and got_frame
+    gui_stall_ms = monitor.max_gap_ms
+    manager.disconnect()
+    return {
+        'ok': ok,
+        'connect_ms': connect_ms,
+        'start_ms': start_ms,
+        'first_frame_ms': first_frame_ms,
+        'gui_stall_ms': gui_stall_ms,
+    }
+
+
+def run_cancel(app, cache: MetadataCache) -> bool:
+    """load_world 期间取消启动，返回是否正确取消并清理"""
+    manager = create_manager(cache)
+    worker = LifecycleWorker()
+    events = []
+    worker.finished.connect(lambda operation, success: events.append(('finished', operation)))
+    worker.cancelled.connect(lambda operation: events.append(('cancelled', operation)))
+
+    worker.connect_to_server(manager)
+    wait_until(app, lambda: events)
+    worker.start_simulation(manager)
+    time.sleep(StandInClient.load_delay / 2)
+    worker.cancel()
+    wait_until(app, lambda: len(events) == 2)
+
+    clean = manager.vehicle is None and not manager.sensor_manager.sensors and not manager.is_running
+    manager.disconnect()
+    return events[-1] == ('cancelled', 'start') and clean
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-frame benchmark with a stand-in CARLA client")
+    parser.add_argument('--load-delay', type=float, default=2.0, help="Simulated load_world duration (s)")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    StandInClient.load_delay = args.load_delay
+    cache = MetadataCache(cache_dir=None)
+    monitor = GuiStallMonitor()
+
+    print("=" * 60)
+    print(f"  启动到首帧基准: 替身 load_world {args.load_delay:.1f} s, {args.runs} 次")
+    print("=" * 60)
+
+    passed = True
+    for index in range(args.runs):
+        result = run_once(app, monitor, cache)
+        ok = result['ok'] and result['gui_stall_ms'] <= MAX_GUI_STALL_MS
+        passed &= ok
+        status = "✅" if ok else "❌"
+        print(f"  {status} run {index + 1}: connect {result['connect_ms']:6.1f} ms  "
+              f"start {result['start_ms']:7.1f} ms  first frame {result['first_frame_ms']:7.1f} ms  "
+              f"GUI 最大卡顿 {result['gui_stall_ms']:5.1f} ms")
+
+    if args.load_delay > 0:
+        cancelled = run_cancel(app, cache)
+        passed &= cancelled
+        print(f"  {'✅' if cancelled else '❌'} load_world 期间取消启动并清理")
+
+    print(f"  元数据缓存: {cache.get_stats()}")
+    print("-" * 60)
+    print("  全部通过" if passed else "  未通过")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+NPC 交通批量生成 / 清理基准测试（需要运行中的 CARLA 服务器）
+
+通过 CarlaClientManager 启动仿真并生成 NPC 车辆和行人（TrafficPopulation，carla.command 批量命令），
+测量:
+    - 生成: NPC 数量（车辆 + 行人 + 行人控制器）、耗时、RPC 往返次数、吞吐量 (actors/s)
+    - 清理: 停止仿真时销毁全部 NPC 的耗时
+NPC 总数少于 --min-actors 时判为未通过。
+
+使用方法:
+    python test/traffic_spawn_benchmark.py [--host localhost] [--port 2000] [--map Town10HD_Opt]
+        [--vehicle-density 0.9] [--walker-density 1.5] [--seed 42] [--runs 3] [--sync]
+"""
+import argparse
+import os
+import sys
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QCoreApplication
+
+from carla_bike_sim.carla.carla_client_manager import CarlaClientManager
+from carla_bike_sim.carla.metadata_cache import MetadataCache
+from carla_bike_sim.carla.rig import DEFAULT_CAMERA_RIG
+
+
+def run_once(manager: CarlaClientManager, args) -> dict:
+    if not manager.start_simulation(
+        map_name=args.map,
+        synchronous=args.sync,
+        rig=DEFAULT_CAMERA_RIG[:1],
+        traffic=True,
+        traffic_vehicle_density=args.vehicle_density,
+        traffic_walker_density=args.walker_density,
+        traffic_seed=args.seed,
+    ):
+        return {}
+    manager.stop_simulation()
+    return manager.get_traffic_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched NPC traffic spawn / cleanup benchmark")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=2000)
+    parser.add_argument('--map', default=None, help="Map name, default: first available map")
+    parser.add_argument('--vehicle-density', type=float, default=0.9)
+    parser.add_argument('--walker-density', type=float, default=1.5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--sync', action='store_true', help="Run the world in synchronous mode")
+    parser.add_argument('--min-actors', type=int, default=500)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    manager = CarlaClientManager(host=args.host, port=args.port, timeout=30.0,
+                                 metadata_cache=MetadataCache(cache_dir=None))
+    manager.simulation_error.connect(lambda message: print(f"  ❌ {message}"))
+    if not manager.connect():
+        print(f"无法连接 CARLA 服务器 {args.host}:{args.port}")
+        sys.exit(1)
+
+    print("=" * 72)
+    print(f"  NPC 交通批量生成基准: 车辆密度 {args.vehicle_density}, 行人密度 {args.walker_density}, "
+          f"seed {args.seed}, {'同步' if args.sync else '异步'}模式")
+    print("=" * 72)
+
+    passed = True
+    for index in range(args.runs):
+        stats = run_once(manager, args)
+        if not stats:
+            passed = False
+            print(f"  ❌ run {index + 1}: 启动仿真失败")
+            continue
+        actors = stats.get('destroyed', 0)
+        ok = actors >= args.min_actors
+        passed &= ok
+        print(f"  {'✅' if ok else '❌'} run {index + 1}: {stats['vehicles']} 车辆 + {stats['walkers']} 行人 "
+              f"({actors} actors, 失败 {stats['failed']})")
+        print(f"      生成 {stats['spawn_ms']:8.1f} ms  {stats['spawn_round_trips']} 次往返  "
+              f"{stats['actors_per_s']:8.0f} actors/s")
+        if actors:
+            print(f"      清理 {stats['destroy_ms']:8.1f} ms  {stats['destroy_round_trips']} 次往返")
+
+    manager.disconnect()
+    print("-" * 72)
+    print("  全部通过" if passed else "  未通过")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()